@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""Performance benchmarks of pyPodcastParser
+
+feeds generates synthetic feeds and run times each phase of parsing them,
+writing the timings as JSON so releases and engines can be compared:
+
+    python -m benchmarks.run --help
+
+The bench_* modules time single parts of the parser, and run as scripts.
+"""
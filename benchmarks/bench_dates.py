@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Times pubDate parsing over a million date strings
+
+Compares the two email.utils passes Item used to make per date with
+parse_published_date, both on distinct dates, which never hit its cache,
+and on dates repeating the way they do across the items of many feeds.
+
+    python benchmarks/bench_dates.py [count]
+"""
+from datetime import datetime, timezone
+import email.utils
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from pyPodcastParser.dates import parse_published_date
+
+FORMATS = [
+    "%a, %d %b %Y %H:%M:%S -0400",
+    "%a, %d %b %Y %H:%M:%S GMT",
+    "%a, %d %b %Y %H:%M:%S EDT",
+    "%d %b %Y %H:%M:%S +0000",
+    "%a, %d %b %y %H:%M %Z",
+    "%a %d %b %Y %H:%M:%S CET",
+]
+
+
+def make_dates(count, distinct):
+    """Returns count date strings drawn from distinct different dates"""
+    generator = random.Random(822)
+    start = 1104537600
+    values = []
+    for number in range(distinct):
+        moment = datetime.fromtimestamp(start + generator.randrange(500000000), timezone.utc)
+        values.append(moment.strftime(FORMATS[number % len(FORMATS)]))
+    return [values[generator.randrange(distinct)] for number in range(count)]
+
+
+def email_utils_twice(published_date):
+    time_tuple = email.utils.parsedate_tz(published_date)
+    try:
+        time_published = email.utils.mktime_tz(time_tuple)
+    except TypeError:
+        time_published = None
+    time_tuple = email.utils.parsedate(published_date)
+    try:
+        date_time = datetime(time_tuple[0], time_tuple[1], time_tuple[2])
+    except TypeError:
+        date_time = None
+    return time_published, date_time
+
+
+def run(function, dates):
+    start = time.perf_counter()
+    for published_date in dates:
+        function(published_date)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    distinct_dates = make_dates(count, count)
+    repeated_dates = make_dates(count, 2000)
+    uncached = parse_published_date.__wrapped__
+    for name, dates in (("distinct", distinct_dates), ("repeated", repeated_dates)):
+        parse_published_date.cache_clear()
+        baseline = run(email_utils_twice, dates)
+        fresh = run(uncached, dates)
+        cached = run(parse_published_date, dates)
+        print("%-9s email.utils x2 %6.2f s  parse %6.2f s (%4.1fx)  cached %6.2f s (%4.1fx)" % (
+            name, baseline, fresh, baseline / fresh, cached, baseline / cached))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Times Item parsing with one walk per item against one scan per setter
+
+Items carry a large content:encoded body, either as a single CDATA string
+or as inline markup with many tags, which is where per setter scans hurt.
+
+    python benchmarks/bench_item_dispatch.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from pyPodcastParser.engines import get_engine
+from pyPodcastParser.Item import Item
+
+FEED = u"""<rss xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"
+  xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><item>
+<title>Episode</title><link>http://example.com/1</link>
+<guid>guid-1</guid><pubDate>Fri, 21 Mar 2008 09:51:00 EDT</pubDate>
+<enclosure url="http://example.com/1.mp3" length="123456" type="audio/mpeg"/>
+<content:encoded>%s</content:encoded>
+<itunes:duration>1:05</itunes:duration>
+</item></channel></rss>"""
+
+PARAGRAPH = u"<p>Show notes with <a href='http://example.com'>a link</a> and <b>bold</b> text.</p>"
+
+
+class ScanningItem(Item):
+    """Item that looks every tag up with its own scan of the item"""
+
+    def set_tags(self):
+        self._tags = {}
+
+    def _find(self, name):
+        return self.engine.find(self.soup, name)
+
+    def _find_all(self, name):
+        return self.engine.find_all(self.soup, name)
+
+
+def bench(engine_name, body, number):
+    engine = get_engine(engine_name)
+    tree = engine.parse(FEED % body)
+    node = engine.items(tree)[0]
+    results = {}
+    for item_class in (ScanningItem, Item):
+        seconds = min(timeit.repeat(lambda: item_class(node, engine),
+                                    number=number, repeat=3))
+        results[item_class.__name__] = seconds / number
+    return results
+
+
+def main():
+    paragraphs = 500
+    bodies = [
+        ("cdata", u"<![CDATA[%s]]>" % (PARAGRAPH * paragraphs)),
+        ("inline markup", PARAGRAPH * paragraphs),
+    ]
+    for engine_name in ("bs4", "lxml"):
+        for body_name, body in bodies:
+            results = bench(engine_name, body, number=20)
+            print("%-5s %-14s scan per setter %8.3f ms  one walk %8.3f ms  %5.1fx" % (
+                engine_name, body_name,
+                results["ScanningItem"] * 1000, results["Item"] * 1000,
+                results["ScanningItem"] / results["Item"]))
+
+
+if __name__ == '__main__':
+    main()
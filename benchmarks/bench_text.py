@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Times the *_text extractors on typical titles and descriptions
+
+    python benchmarks/bench_text.py
+"""
+import os
+import sys
+import timeit
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from pyPodcastParser.text import TEXT_EXTRACTORS
+
+SAMPLES = [
+    ("plain title", u"Episode 42: The Answer"),
+    ("title with entity", u"Q&amp;A with the hosts"),
+    ("html subtitle", u'<a href="https://example.com">Subtitle with html</a>'),
+    ("html description", u"<p>Show notes with <a href='https://example.com'>"
+                         u"a link</a>, <b>bold</b> text &amp; more.</p>" * 20),
+]
+
+
+def main():
+    warnings.simplefilter("ignore")
+    number = 2000
+    for sample_name, markup in SAMPLES:
+        timings = {}
+        for extractor_name, extractor in sorted(TEXT_EXTRACTORS.items()):
+            seconds = min(timeit.repeat(lambda: extractor(markup),
+                                        number=number, repeat=3))
+            timings[extractor_name] = seconds / number
+        assert TEXT_EXTRACTORS["bs4"](markup) == TEXT_EXTRACTORS["fast"](markup)
+        print("%-18s bs4 %8.1f us  fast %6.1f us  %5.1fx" % (
+            sample_name, timings["bs4"] * 1e6, timings["fast"] * 1e6,
+            timings["bs4"] / timings["fast"]))
+
+
+if __name__ == '__main__':
+    main()
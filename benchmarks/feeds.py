@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Generates synthetic podcast feeds shaped like the ones found in the wild
+
+Feeds are built from a seeded random generator, so the same arguments
+always give the same feed.
+"""
+from datetime import datetime, timedelta, timezone
+import random
+
+#: Namespace prefixes generate_feed can declare and use, with their urls
+NAMESPACES = {
+    'itunes': 'http://www.itunes.com/dtds/podcast-1.0.dtd',
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+    'atom': 'http://www.w3.org/2005/Atom',
+    'media': 'http://search.yahoo.com/mrss/',
+    'creativeCommons': 'http://backend.userland.com/creativeCommonsRssModule',
+}
+
+WORDS = (
+    "podcast episode show guest interview news music science history "
+    "story week today talk about with from this that their great new "
+    "conversation listener question answer season special live").split()
+
+ZONES = ('-0400', '+0000', 'GMT', 'EDT', 'PST', '+0200')
+
+
+def _sentence(generator, length):
+    words = [generator.choice(WORDS) for number in range(length)]
+    return " ".join(words).capitalize() + "."
+
+
+def _html(generator, size, html_density):
+    """Returns about size characters of text, html_density of its paragraphs marked up"""
+    paragraphs = []
+    written = 0
+    while written < size:
+        text = _sentence(generator, generator.randint(8, 20))
+        if generator.random() < html_density:
+            words = text.split(" ")
+            position = generator.randrange(len(words))
+            words[position] = '<a href="https://example.com/%s">%s</a>' % (
+                words[position], words[position])
+            words[0] = '<b>%s</b>' % words[0]
+            text = "<p>%s &amp; more</p>" % " ".join(words)
+        paragraphs.append(text)
+        written += len(text)
+    return "".join(paragraphs)
+
+
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _date(moment, generator):
+    zone = generator.choice(ZONES)
+    return moment.strftime("%a, %d %b %Y %H:%M:%S ") + zone
+
+
+def generate_feed(item_count=100, description_size=1000, namespaces=tuple(NAMESPACES),
+                  html_density=0.5, seed=0):
+    """Returns the xml of a synthetic podcast feed
+
+    Args:
+        item_count (int): Number of items
+        description_size (int): Rough number of characters in each item description
+        namespaces (iterable): Prefixes of NAMESPACES to declare and use
+        html_density (float): Fraction of description paragraphs holding markup, from 0 to 1
+        seed (int): Seed of the random generator
+
+    Returns:
+        str: The feed
+    """
+    generator = random.Random(seed)
+    namespaces = [prefix for prefix in NAMESPACES if prefix in set(namespaces)]
+    declarations = "".join(' xmlns:%s="%s"' % (prefix, NAMESPACES[prefix])
+                           for prefix in namespaces)
+    moment = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"%s>\n<channel>\n' % declarations]
+    parts.append(
+        "<title>Synthetic podcast %d</title>\n"
+        "<link>https://example.com/</link>\n"
+        "<description>%s</description>\n"
+        "<language>en-us</language>\n"
+        "<copyright>Copyright example</copyright>\n"
+        "<pubDate>%s</pubDate>\n"
+        "<lastBuildDate>%s</lastBuildDate>\n"
+        "<ttl>60</ttl>\n"
+        "<category>Technology</category>\n"
+        "<image><url>https://example.com/image.png</url><title>Synthetic</title>"
+        "<link>https://example.com/</link><width>144</width><height>144</height></image>\n" % (
+            seed, _escape(_html(generator, description_size, html_density)),
+            _date(moment, generator), _date(moment, generator)))
+    if 'itunes' in namespaces:
+        parts.append(
+            "<itunes:author>Example author</itunes:author>\n"
+            "<itunes:subtitle>%s</itunes:subtitle>\n"
+            "<itunes:summary>%s</itunes:summary>\n"
+            "<itunes:owner><itunes:name>Owner</itunes:name>"
+            "<itunes:email>owner@example.com</itunes:email></itunes:owner>\n"
+            "<itunes:image href=\"https://example.com/itunes.png\"/>\n"
+            "<itunes:category text=\"Technology\"><itunes:category text=\"Podcasting\"/></itunes:category>\n"
+            "<itunes:explicit>no</itunes:explicit>\n"
+            "<itunes:keywords>podcast, synthetic, benchmark</itunes:keywords>\n"
+            "<itunes:type>episodic</itunes:type>\n" % (
+                _sentence(generator, 8), _sentence(generator, 30)))
+    if 'atom' in namespaces:
+        parts.append('<atom:link href="https://example.com/feed.xml" rel="self" type="application/rss+xml"/>\n'
+                     '<atom:link href="https://pubsubhubbub.appspot.com/" rel="hub"/>\n')
+    if 'creativeCommons' in namespaces:
+        parts.append("<creativeCommons:license>https://creativecommons.org/licenses/by/4.0/</creativeCommons:license>\n")
+    for number in range(item_count, 0, -1):
+        moment -= timedelta(hours=generator.randint(1, 200))
+        description = _html(generator, description_size, html_density)
+        parts.append(
+            "<item>\n<title>Episode %d: %s</title>\n"
+            "<link>https://example.com/episodes/%d</link>\n"
+            "<guid isPermaLink=\"false\">episode-%d-%d</guid>\n"
+            "<pubDate>%s</pubDate>\n"
+            "<author>host@example.com (Host)</author>\n"
+            "<comments>https://example.com/episodes/%d#comments</comments>\n"
+            "<category>Episodes</category>\n"
+            "<enclosure url=\"https://example.com/audio/%d.mp3\" length=\"%d\" type=\"audio/mpeg\"/>\n"
+            "<description>%s</description>\n" % (
+                number, _sentence(generator, 5), number, seed, number,
+                _date(moment, generator), number, number,
+                generator.randint(10 ** 6, 10 ** 8), _escape(description)))
+        if 'content' in namespaces:
+            parts.append("<content:encoded><![CDATA[%s]]></content:encoded>\n" % description)
+        if 'itunes' in namespaces:
+            parts.append(
+                "<itunes:title>%s</itunes:title>\n"
+                "<itunes:subtitle>%s</itunes:subtitle>\n"
+                "<itunes:summary>%s</itunes:summary>\n"
+                "<itunes:duration>%d:%02d:%02d</itunes:duration>\n"
+                "<itunes:episode>%d</itunes:episode>\n"
+                "<itunes:season>%d</itunes:season>\n"
+                "<itunes:episodeType>full</itunes:episodeType>\n"
+                "<itunes:explicit>no</itunes:explicit>\n"
+                "<itunes:image href=\"https://example.com/episodes/%d.png\"/>\n"
+                "<itunes:keywords>episode, synthetic</itunes:keywords>\n" % (
+                    _sentence(generator, 5), _sentence(generator, 10),
+                    _escape(_html(generator, description_size // 4, html_density)),
+                    generator.randint(0, 2), generator.randint(0, 59),
+                    generator.randint(0, 59), number, number // 50 + 1, number))
+        if 'media' in namespaces:
+            parts.append('<media:content url="https://example.com/video/%d.mp4" medium="video"/>\n' % number)
+        parts.append("</item>\n")
+    parts.append("</channel>\n</rss>\n")
+    return "".join(parts)
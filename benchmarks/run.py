@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Times each phase of parsing synthetic feeds and writes the timings as JSON
+
+    python -m benchmarks.run --items 10 1000 100000 --engines bs4 lxml --output results.json
+
+Every phase is run --repeat times and its fastest run is kept. The phases
+are Podcast construction as a whole, then each of the steps it is made of
+run again on the built Podcast, get_items with pre_set_items=False and
+to_dict.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from benchmarks.feeds import NAMESPACES, generate_feed
+from pyPodcastParser.Podcast import Podcast
+
+#: Steps of Podcast.__init__, in order, timed one by one on a built Podcast
+PHASES = (
+    ('set_tree', ('set_tree',)),
+    ('set_channel_tags', ('set_channel_tags',)),
+    ('set_items', ('set_items',)),
+    ('set_extended_elements', ('set_extended_elements',)),
+    ('set_itunes', ('set_itunes',)),
+    ('set_optional_elements', ('set_optional_elements',)),
+    ('set_required_elements', ('set_required_elements',)),
+    ('set_validity', ('set_validity',)),
+    ('set_dates', ('set_time_published', 'set_dates_published')),
+)
+
+
+def best_time(function, repeat, setup=None):
+    """Returns the fastest of repeat runs of function, in seconds"""
+    best = None
+    for number in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        if setup is None:
+            function()
+        else:
+            function(argument)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best:
+            best = seconds
+    return best
+
+
+def bench_feed(feed, repeat, **podcast_options):
+    """Returns the timing of every phase of parsing feed, by phase name"""
+    timings = {}
+    timings['Podcast'] = best_time(lambda: Podcast(feed, **podcast_options), repeat)
+    podcast = Podcast(feed, **podcast_options)
+    for phase, methods in PHASES:
+        setters = [getattr(podcast, method) for method in methods]
+        timings[phase] = best_time(lambda: [setter() for setter in setters], repeat)
+    timings['get_items'] = best_time(
+        lambda lazy_podcast: list(lazy_podcast.get_items()), repeat,
+        setup=lambda: Podcast(feed, pre_set_items=False, **podcast_options))
+    timings['to_dict'] = best_time(podcast.to_dict, repeat)
+    return timings
+
+
+def run(item_counts, engines, description_size=1000, html_density=0.5,
+        namespaces=tuple(NAMESPACES), text_extractor="bs4", repeat=3, seed=0):
+    """Benchmarks every engine on a feed of every item count
+
+    Returns:
+        dict: The environment and a result per feed and engine, ready for json.dump
+    """
+    results = []
+    for item_count in item_counts:
+        feed = generate_feed(item_count, description_size, namespaces, html_density, seed)
+        feed_bytes = len(feed.encode('utf-8'))
+        for engine in engines:
+            timings = bench_feed(feed, repeat, engine=engine, text_extractor=text_extractor)
+            results.append({
+                'engine': engine,
+                'text_extractor': text_extractor,
+                'items': item_count,
+                'feed_bytes': feed_bytes,
+                'timings': timings,
+            })
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'settings': {
+            'description_size': description_size,
+            'html_density': html_density,
+            'namespaces': list(namespaces),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--items', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--engines', nargs='+', default=['bs4', 'lxml'])
+    parser.add_argument('--description-size', type=int, default=1000)
+    parser.add_argument('--html-density', type=float, default=0.5)
+    parser.add_argument('--namespaces', nargs='*', default=list(NAMESPACES),
+                        choices=sorted(NAMESPACES))
+    parser.add_argument('--text-extractor', default="bs4")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="File to write the JSON to, stdout by default")
+    arguments = parser.parse_args(argv)
+    report = run(arguments.items, arguments.engines, arguments.description_size,
+                 arguments.html_density, arguments.namespaces, arguments.text_extractor,
+                 arguments.repeat, arguments.seed)
+    if arguments.output is None:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+    else:
+        with open(arguments.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from operator import attrgetter
+
+from pyPodcastParser.Item import Item
+from pyPodcastParser.projection import projected_keys
+
+
+class CompactItem(object):
+    """The values of a parsed Item without its parse tree
+
+    An Item keeps its tag, and through the tag's parent links the whole
+    tree of its feed, alive for as long as it is referenced. A CompactItem
+    only holds the extracted values in slots, so keeping many of them
+    around costs no more than the values themselves. Build one with
+    Item.compact() or CompactItem.from_item(). Pickling an Item pickles
+    its CompactItem.
+
+    Attributes:
+        fields (frozenset): The fields of a projected Item, None for all of them
+        The public attributes of Item, with the same values
+    """
+
+    #: Every public attribute of Item
+    FIELDS = tuple(sorted(Item.ATTRIBUTE_SETTERS))
+
+    __slots__ = FIELDS + ('fields',)
+
+    _get_values = attrgetter(*FIELDS)
+
+    def __init__(self, fields=None, **values):
+        for name in self.FIELDS:
+            setattr(self, name, values.get(name))
+        self.fields = None if fields is None else frozenset(fields)
+
+    @classmethod
+    def from_item(cls, item):
+        """Copies the public attributes of item into a new CompactItem"""
+        compact = cls.__new__(cls)
+        for name in cls.FIELDS:
+            setattr(compact, name, getattr(item, name))
+        compact.fields = item.fields
+        return compact
+
+    def freeze(self):
+        """Returns this CompactItem, which is already a snapshot"""
+        return self
+
+    @classmethod
+    def from_state(cls, state):
+        """Returns a new CompactItem of a state from __getstate__"""
+        compact = cls.__new__(cls)
+        compact.__setstate__(state)
+        return compact
+
+    def __reduce__(self):
+        return self.from_state, (self.__getstate__(),)
+
+    def __getstate__(self):
+        return self._get_values(self) + (self.fields,)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.FIELDS, state):
+            setattr(self, name, value)
+        self.fields = state[len(self.FIELDS)]
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactItem):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<%s guid=%r title=%r>" % (type(self).__name__, self.guid, self.title)
+
+    def to_dict(self):
+        item = {}
+        for key in projected_keys(Item.DICT_KEYS, self.fields):
+            item[key] = getattr(self, key)
+        return item
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+from operator import attrgetter
+
+from pyPodcastParser.CompactItem import CompactItem
+from pyPodcastParser.Podcast import Podcast
+
+
+class CompactPodcast(object):
+    """The values of a parsed Podcast without its parse tree or soups
+
+    It holds the channel values in slots and its items as CompactItems, so
+    it is small, quick to pickle and never needs BeautifulSoup again. It
+    reads like a Podcast and to_dict() gives the same dict. Build one with
+    Podcast.freeze() or CompactPodcast.from_podcast(). Pickling a Podcast
+    pickles its CompactPodcast.
+
+    Attributes:
+        items (list): CompactItem objects
+        fields (frozenset): The fields of a projected Podcast, None for all of them
+        The other public attributes of Podcast, with the same values
+    """
+
+    #: Every public attribute of Podcast holding a value of the feed, items aside
+    FIELDS = tuple(sorted(Podcast.ATTRIBUTE_SETTERS))
+
+    __slots__ = FIELDS + ('items', 'fields', '_item_indexes')
+
+    _get_values = attrgetter(*FIELDS)
+
+    def __init__(self, items=None, fields=None, **values):
+        for name in self.FIELDS:
+            setattr(self, name, values.get(name))
+        self.items = [] if items is None else list(items)
+        self.fields = None if fields is None else frozenset(fields)
+        self._item_indexes = None
+
+    @classmethod
+    def from_podcast(cls, podcast):
+        """Copies the values of podcast and compacts its items"""
+        compact = cls.__new__(cls)
+        for name in cls.FIELDS:
+            setattr(compact, name, getattr(podcast, name))
+        compact.items = [
+            item if isinstance(item, CompactItem) else item.compact()
+            for item in podcast.items]
+        compact.fields = podcast.fields
+        compact._item_indexes = None
+        return compact
+
+    def freeze(self):
+        """Returns this CompactPodcast, which is already a snapshot"""
+        return self
+
+    @classmethod
+    def from_state(cls, state):
+        """Returns a new CompactPodcast of a state from __getstate__"""
+        compact = cls.__new__(cls)
+        compact.__setstate__(state)
+        return compact
+
+    def __reduce__(self):
+        return self.from_state, (self.__getstate__(),)
+
+    def __getstate__(self):
+        # Items go in as plain state tuples, which pickle much faster than objects
+        return (self._get_values(self), [item.__getstate__() for item in self.items],
+                self.fields)
+
+    def __setstate__(self, state):
+        values, item_states, self.fields = state
+        for name, value in zip(self.FIELDS, values):
+            setattr(self, name, value)
+        self.items = [CompactItem.from_state(item_state) for item_state in item_states]
+        self._item_indexes = None
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactPodcast):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<%s title=%r items=%d>" % (type(self).__name__, self.title, len(self.items))
+
+    def get_items(self):
+        for item in self.items:
+            yield item
+
+    to_dict = Podcast.to_dict
+
+    channel_dict = Podcast.channel_dict
+
+    write_json = Podcast.write_json
+
+    write_ndjson = Podcast.write_ndjson
+
+    to_columns = Podcast.to_columns
+
+    diff = Podcast.diff
+
+    _indexes = Podcast._indexes
+
+    _item_index = Podcast._item_index
+
+    _check_item_fields = Podcast._check_item_fields
+
+    _time_index = Podcast._time_index
+
+    get_item = Podcast.get_item
+
+    get_by_enclosure = Podcast.get_by_enclosure
+
+    get_episode = Podcast.get_episode
+
+    items_between = Podcast.items_between
+
+    newest = Podcast.newest
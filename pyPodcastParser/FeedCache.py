@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import zlib
+
+from pyPodcastParser.CompactItem import CompactItem
+from pyPodcastParser.CompactPodcast import CompactPodcast
+from pyPodcastParser.engines import get_engine
+from pyPodcastParser.Podcast import Podcast
+from pyPodcastParser.text import TEXT_EXTRACTORS
+
+#: Options that change how a feed is parsed but not what it parses into
+_UNKEYED_OPTIONS = frozenset(['stats'])
+
+
+def _schema():
+    """Returns a digest of the layout of the pickled snapshots
+
+    Snapshots unpickle their values by position over FIELDS, so entries
+    written with other FIELDS must never be read back.
+    """
+    layout = repr((FeedCache.VERSION, CompactPodcast.FIELDS, CompactItem.FIELDS))
+    return hashlib.sha256(layout.encode('utf-8')).hexdigest()[:16]
+
+
+def _callable_name(value, option):
+    """Returns the import path of a module level function, the same in every process"""
+    name = "%s.%s" % (getattr(value, '__module__', None), getattr(value, '__qualname__', None))
+    if name.startswith('None.') or name.endswith('.None') or '<' in name:
+        raise ValueError("%s can't be keyed across processes, pass a name or a module level "
+                         "function rather than %r" % (option, value))
+    return name
+
+
+def _option_value(name, value):
+    """Returns value as plain data that keys the same in every process
+
+    Raises:
+        ValueError: When value has no stable form, such as a lambda or an arbitrary object
+    """
+    if name == 'engine':
+        return get_engine(value).name
+    if name == 'text_extractor' and callable(value):
+        for extractor_name, extractor in TEXT_EXTRACTORS.items():
+            if extractor is value:
+                return extractor_name
+        return _callable_name(value, name)
+    if callable(value):
+        return _callable_name(value, name)
+    if isinstance(value, (set, frozenset)):
+        return sorted(_option_value(name, element) for element in value)
+    if isinstance(value, (list, tuple)):
+        return [_option_value(name, element) for element in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise ValueError("%s can't be keyed across processes, got %r" % (name, value))
+
+
+class FeedCache(object):
+    """Caches parsed feeds on disk, keyed by a hash of their content
+
+    A feed returning the same bytes as last time is not parsed again: its
+    CompactPodcast is read back from a zlib compressed pickle instead. The
+    entries are evicted least recently used first, by modification time,
+    once the directory grows past max_size bytes. Only point it at a
+    directory you trust, since entries are unpickled.
+
+    Keys cover the podcast_options and the layout of the snapshots, so a
+    cache shared between processes or kept across upgrades only returns
+    entries parsed the same way into the same fields. Options are keyed by
+    value: engines and text extractors by name, other functions, such as a
+    stop_at_guids callable, by import path. stats is left out.
+
+    Args:
+        directory (str): Where entries are kept, created when missing
+        max_size (int): Most bytes the entries may take up
+        **podcast_options: Keyword arguments for each Podcast, such as engine or text_extractor
+
+    Attributes:
+        directory (str): Where entries are kept
+        max_size (int): Most bytes the entries may take up
+        podcast_options (dict): Keyword arguments for each Podcast
+        hits (int): Number of feeds read from the cache
+        misses (int): Number of feeds that had to be parsed
+        evictions (int): Number of entries removed to stay under max_size
+
+    Raises:
+        ValueError: When an option can't be keyed the same in every process, such as a lambda
+    """
+
+    SUFFIX = ".feed"
+
+    #: Version of the entry format, part of every key
+    VERSION = 1
+
+    def __init__(self, directory, max_size=256 * 1024 * 1024, **podcast_options):
+        self.directory = directory
+        self.max_size = max_size
+        self.podcast_options = podcast_options
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = None
+        options = dict((name, _option_value(name, value))
+                       for name, value in podcast_options.items()
+                       if name not in _UNKEYED_OPTIONS)
+        self._key_suffix = (_schema() + json.dumps(options, sort_keys=True)).encode('utf-8')
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, feed_content):
+        """Returns the hex digest feed_content and podcast_options are cached under"""
+        if isinstance(feed_content, str):
+            feed_content = feed_content.encode('utf-8', 'surrogatepass')
+        digest = hashlib.sha256(feed_content)
+        digest.update(self._key_suffix)
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, feed_content):
+        """Returns the cached CompactPodcast of feed_content or None"""
+        path = self.path(self.key(feed_content))
+        try:
+            with open(path, 'rb') as entry:
+                data = entry.read()
+            compact_podcast = pickle.loads(zlib.decompress(data))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            self.misses += 1
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return compact_podcast
+
+    def put(self, feed_content, compact_podcast):
+        """Stores compact_podcast as the result of parsing feed_content"""
+        data = zlib.compress(pickle.dumps(compact_podcast, pickle.HIGHEST_PROTOCOL))
+        path = self.path(self.key(feed_content))
+        try:
+            replaced_size = os.path.getsize(path)
+        except OSError:
+            replaced_size = 0
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, 'wb') as entry:
+                entry.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            self._remove(temp_path)
+            raise
+        if self._size is not None:
+            self._size += len(data) - replaced_size
+        if self._size is None or self._size > self.max_size:
+            self.evict()
+
+    def parse(self, feed_content):
+        """Returns the CompactPodcast of feed_content, parsing it on a miss"""
+        compact_podcast = self.get(feed_content)
+        if compact_podcast is None:
+            compact_podcast = Podcast(feed_content, **self.podcast_options).freeze()
+            self.put(feed_content, compact_podcast)
+        return compact_podcast
+
+    def _entries(self):
+        """Returns (mtime, size, path) of every entry, oldest first"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """Removes the least recently used entries until they fit in max_size"""
+        entries = self._entries()
+        size = sum(entry[1] for entry in entries)
+        for mtime, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            if self._remove(path):
+                self.evictions += 1
+            size -= entry_size
+        self._size = size
+
+    def clear(self):
+        """Removes every entry"""
+        for mtime, entry_size, path in self._entries():
+            self._remove(path)
+        self._size = 0
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
@@ -1,7 +1,9 @@
-from bs4 import BeautifulSoup
-from datetime import datetime
-import email.utils
-from time import mktime
+from copy import deepcopy
+
+from pyPodcastParser.dates import parse_published_date
+from pyPodcastParser.engines import get_engine
+from pyPodcastParser.projection import projected_keys, resolve_fields
+from pyPodcastParser.text import get_text_extractor
 
 class Item(object):
     """Parses an xml rss feed
@@ -10,7 +12,14 @@ class Item(object):
     iTunes Podcast Specs http://www.apple.com/itunes/podcasts/specs.html
 
     Args:
-        soup (bs4.BeautifulSoup): BeautifulSoup object representing a rss item
+        soup (bs4.BeautifulSoup): BeautifulSoup object representing a rss item, or an lxml element when engine is "lxml"
+        engine (str): Parsing engine that built soup, "bs4" (the default) or "lxml"
+        text_extractor (str): How *_text fields strip html, "bs4" (the default) or "fast"
+        lazy (bool): Compute each attribute on first access instead of up front
+        stats (ParseStats): Records the time of each set_* phase, as "Item.set_..."
+        fields: Names of the only attributes to parse, see projection. The others are None
+        extra_fields: Names of attributes parsed on top of fields for the caller's own use.
+            They are left out of the fields attribute and of to_dict
 
     Note:
         All attributes with empty or nonexistent element will have a value of None
@@ -46,77 +55,203 @@ class Item(object):
         published_date (str): Date item was published
         title (str): The title of item.
         title_text (str): The title of item without html tags.
-        date_time (datetime): When published
+        date_time (datetime): Date published, at midnight
+        published_datetime (datetime): When published, timezone aware
+        time_published (int): When published, as a POSIX timestamp
+        lazy (bool): Are attributes computed on first access
+        stats (ParseStats): Where set_* phases are timed, or None
+        fields (frozenset): The attributes parsed and the keys of to_dict, None for all of them
     """
 
-    def __init__(self, soup):
+    #: Every tag name the setters look up. set_tags gathers them all in one walk
+    TAG_NAMES = frozenset([
+        'author', 'category', 'comments', 'description', 'encoded',
+        'enclosure', 'guid', 'license', 'link', 'pubDate', 'title',
+        'itunes:author', 'itunes:block', 'itunes:duration', 'itunes:episode',
+        'itunes:episodeType', 'itunes:explicit', 'itunes:image',
+        'itunes:isClosedCaptioned', 'itunes:keywords', 'itunes:order',
+        'itunes:season', 'itunes:subtitle', 'itunes:summary', 'itunes:title',
+    ])
+
+    #: Keys of to_dict, in order
+    DICT_KEYS = (
+        'author', 'comments', 'creative_commons', 'enclosure_url',
+        'enclosure_type', 'enclosure_length', 'guid', 'itunes_title',
+        'itunes_title_text', 'itunes_author_name', 'itunes_block',
+        'itunes_closed_captioned', 'itunes_duration', 'itunes_explicit',
+        'itunes_episode', 'itunes_season', 'itunes_episode_type',
+        'itune_image', 'itunes_order', 'itunes_subtitle',
+        'itunes_subtitle_text', 'itunes_summary', 'itunes_summary_text',
+        'itunes_keywords', 'content_encoded', 'description',
+        'description_text', 'link', 'published_date', 'title', 'title_text',
+    )
+
+    #: The setter of every public attribute. Lazy Items call them on first access
+    ATTRIBUTE_SETTERS = {
+        'author': 'set_author',
+        'categories': 'set_categories',
+        'comments': 'set_comments',
+        'content_encoded': 'set_content_encoded',
+        'creative_commons': 'set_creative_commons',
+        'date_time': 'set_dates_published',
+        'description': 'set_description',
+        'description_text': 'set_description_text',
+        'enclosure_length': 'set_enclosure',
+        'enclosure_type': 'set_enclosure',
+        'enclosure_url': 'set_enclosure',
+        'guid': 'set_guid',
+        'itune_image': 'set_itune_image',
+        'itunes_author_name': 'set_itunes_author_name',
+        'itunes_block': 'set_itunes_block',
+        'itunes_closed_captioned': 'set_itunes_closed_captioned',
+        'itunes_duration': 'set_itunes_duration',
+        'itunes_episode': 'set_itunes_episode',
+        'itunes_episode_type': 'set_itunes_episode_type',
+        'itunes_explicit': 'set_itunes_explicit',
+        'itunes_keywords': 'set_itunes_keywords',
+        'itunes_order': 'set_itunes_order',
+        'itunes_season': 'set_itunes_season',
+        'itunes_subtitle': 'set_itunes_subtitle',
+        'itunes_subtitle_text': 'set_itunes_subtitle_text',
+        'itunes_summary': 'set_itunes_summary',
+        'itunes_summary_text': 'set_itunes_summary_text',
+        'itunes_title': 'set_itunes_title',
+        'itunes_title_text': 'set_itunes_title_text',
+        'link': 'set_link',
+        'published_date': 'set_published_date',
+        'published_datetime': 'set_dates_published',
+        'time_published': 'set_time_published',
+        'title': 'set_title',
+        'title_text': 'set_title_text',
+    }
+
+    #: The attributes each attribute's setter reads
+    ATTRIBUTE_DEPENDENCIES = {
+        'date_time': ('published_date',),
+        'description_text': ('description',),
+        'itunes_subtitle_text': ('itunes_subtitle',),
+        'itunes_summary_text': ('itunes_summary',),
+        'itunes_title_text': ('itunes_title',),
+        'published_datetime': ('published_date',),
+        'time_published': ('published_date',),
+        'title_text': ('title',),
+    }
+
+    def __init__(self, soup, engine="bs4", text_extractor="bs4", lazy=False, stats=None,
+                 fields=None, extra_fields=None):
         #super(Item, self).__init__()
 
         self.soup = soup
-        self.set_rss_element()
-        self.set_itunes_element()
+        self.engine = get_engine(engine)
+        self.text_extractor = get_text_extractor(text_extractor)
+        self.lazy = lazy
+        self.stats = stats
+        if stats is not None:
+            stats.item_count += 1
+        self.fields = None if fields is None else frozenset(fields)
+        self.run_setter('set_tags')
+        if self.fields is not None:
+            parsed_fields = self.fields
+            if extra_fields is not None:
+                parsed_fields = parsed_fields.union(extra_fields)
+            setters, left_out = resolve_fields(type(self), parsed_fields)
+            self.__dict__.update(dict.fromkeys(left_out))
+            if lazy:
+                return
+            for setter in setters:
+                self.run_setter(setter)
+            return
+        if lazy:
+            return
+        self.run_setter('set_rss_element')
+        self.run_setter('set_itunes_element')
+        self.run_setter('set_text_elements')
 
-        self.set_time_published()
-        self.set_dates_published()
+        self.run_setter('set_time_published')
+        self.run_setter('set_dates_published')
+
+    def run_setter(self, setter):
+        """Calls the setter method named setter, timing it into stats if set"""
+        if self.stats is None:
+            getattr(self, setter)()
+        else:
+            self.stats.run('Item.' + setter, getattr(self, setter))
+
+    def __getattr__(self, name):
+        """Computes a missing attribute of a lazy Item from its setter"""
+        setter = self.ATTRIBUTE_SETTERS.get(name)
+        if setter is None or not self.__dict__.get('lazy'):
+            raise AttributeError("%r object has no attribute %r" % (
+                type(self).__name__, name))
+        self.run_setter(setter)
+        return self.__dict__[name]
 
     def set_time_published(self):
-        if self.published_date is None:
-            self.time_published = None
-            return
-        time_tuple = email.utils.parsedate_tz(self.published_date)
-        try:
-            self.time_published = email.utils.mktime_tz(time_tuple)
-        except TypeError:
-            self.time_published = None
+        self.time_published = parse_published_date(self.published_date).time_published
 
     def set_dates_published(self):
-        if self.published_date is None:
-            self.date_time = None
-            return
-        time_tuple = email.utils.parsedate(self.published_date)
-        try:
-            temp_datetime = datetime(time_tuple[0], time_tuple[1], time_tuple[2])
-        except TypeError:
-            self.date_time = None
-            return
-        self.date_time = temp_datetime
+        published = parse_published_date(self.published_date)
+        self.date_time = published.date_time
+        self.published_datetime = published.datetime
 
     def to_dict(self):
         item = {}
-        item['author'] = self.author
-        item['comments'] = self.comments
-        item['creative_commons'] = self.creative_commons
-        item['enclosure_url'] = self.enclosure_url
-        item['enclosure_type'] = self.enclosure_type
-        item['enclosure_length'] = self.enclosure_length
-        item['enclosure_type'] = self.enclosure_type
-        item['guid'] = self.guid
-        item['itunes_title'] = self.itunes_title
-        item['itunes_title_text'] = self.itunes_title_text
-        item['itunes_author_name'] = self.itunes_author_name
-        item['itunes_block'] = self.itunes_block
-        item['itunes_closed_captioned'] = self.itunes_closed_captioned
-        item['itunes_duration'] = self.itunes_duration
-        item['itunes_explicit'] = self.itunes_explicit
-        item['itunes_episode'] = self.itunes_episode
-        item['itunes_season'] = self.itunes_season
-        item['itunes_episode_type'] = self.itunes_episode_type
-        item['itune_image'] = self.itune_image
-        item['itunes_order'] = self.itunes_order
-        item['itunes_subtitle'] = self.itunes_subtitle
-        item['itunes_subtitle_text'] = self.itunes_subtitle_text
-        item['itunes_summary'] = self.itunes_summary
-        item['itunes_summary_text'] = self.itunes_summary_text
-        item['itunes_keywords'] = self.itunes_keywords
-        item['content_encoded'] = self.content_encoded
-        item['description'] = self.description
-        item['description_text'] = self.description_text
-        item['link'] = self.link
-        item['published_date'] = self.published_date
-        item['title'] = self.title
-        item['title_text'] = self.title_text
+        for key in projected_keys(self.DICT_KEYS, self.fields):
+            item[key] = getattr(self, key)
         return item
 
+    def compact(self):
+        """Returns a CompactItem of these values, free of the parse tree"""
+        from pyPodcastParser.CompactItem import CompactItem
+        return CompactItem.from_item(self)
+
+    def freeze(self):
+        """Returns a snapshot of these values, the same CompactItem as compact()"""
+        return self.compact()
+
+    def __reduce__(self):
+        """Pickles freeze(), so an Item unpickles as a CompactItem without its soup"""
+        return self.freeze().__reduce__()
+
+    def __copy__(self):
+        """Returns an Item sharing the attributes of this one, as __reduce__ only serves pickle"""
+        copied = type(self).__new__(type(self))
+        copied.__dict__.update(self.__dict__)
+        return copied
+
+    def __deepcopy__(self, memo):
+        """Returns an Item with copies of the attributes of this one, its soup included"""
+        copied = type(self).__new__(type(self))
+        memo[id(self)] = copied
+        copied.__dict__.update(deepcopy(self.__dict__, memo))
+        return copied
+
+    def set_tags(self):
+        """Walks the item once and groups its tags by the names in TAG_NAMES"""
+        self._tags = self.engine.collect(self.soup, self.TAG_NAMES)
+
+    def _find(self, name):
+        """Returns the first tag called name in this item or None"""
+        if name not in self.TAG_NAMES:
+            return self.engine.find(self.soup, name)
+        tags = self._tags.get(name)
+        if tags is None:
+            return None
+        return tags[0]
+
+    def _find_all(self, name):
+        """Returns all the tags called name in this item"""
+        if name not in self.TAG_NAMES:
+            return self.engine.find_all(self.soup, name)
+        return self._tags.get(name, [])
+
+    def _find_string(self, name):
+        """Returns the string of the first tag called name or None"""
+        tag = self._find(name)
+        if tag is None:
+            return None
+        return self.engine.string(tag)
+
     def set_rss_element(self):
         """Set each of the basic rss elements."""
         self.set_author()
@@ -134,102 +269,132 @@ class Item(object):
     def set_author(self):
         """Parses author and set value."""
         try:
-            self.author = self.soup.find('author').string.strip()
+            self.author = self._find_string('author').strip()
         except AttributeError:
             self.author = None
 
     def set_categories(self):
         """Parses and set categories"""
         self.categories = []
-        temp_categories = self.soup.findAll('category')
+        temp_categories = self._find_all('category')
         for category in temp_categories:
-            category_text = category.string.strip()
+            category_text = self.engine.string(category).strip()
             self.categories.append(category_text)
 
     def set_comments(self):
         """Parses comments and set value."""
         try:
-            self.comments = self.soup.find('comments').string.strip()
+            self.comments = self._find_string('comments').strip()
         except AttributeError:
             self.comments = None
 
     def set_creative_commons(self):
         """Parses creative commons for item and sets value"""
         try:
-            self.creative_commons = self.soup.find('license').string.strip()
+            self.creative_commons = self._find_string('license').strip()
         except AttributeError:
             self.creative_commons = None
 
     def set_description(self):
         """Parses description and set value."""
         try:
-            description = self.soup.find('description')
-            self.description = description.string.strip()
+            self.description = self._find_string('description').strip()
         except AttributeError:
             self.description = None
-        try:
-            description_soup = BeautifulSoup(self.description, "html.parser")
-            self.description_text = description_soup.get_text(" ", strip=True)
-        except:
-            self.description_text = None
 
     def set_content_encoded(self):
         """Parses content_encoded and set value."""
         try:
-            self.content_encoded = self.soup.find('encoded').string.strip()
+            self.content_encoded = self._find_string('encoded').strip()
         except AttributeError:
             self.content_encoded = None
 
     def set_enclosure(self):
         """Parses enclosure_url, enclosure_type then set values."""
-        try:
-            self.enclosure_url = self.soup.find('enclosure')['url']
-        except:
+        enclosure = self._find('enclosure')
+        if enclosure is None:
             self.enclosure_url = None
-        try:
-            self.enclosure_type = self.soup.find('enclosure')['type']
-        except:
             self.enclosure_type = None
+            self.enclosure_length = None
+            return
+        self.enclosure_url = self.engine.get(enclosure, 'url')
+        self.enclosure_type = self.engine.get(enclosure, 'type')
         try:
-            self.enclosure_length = self.soup.find('enclosure')['length']
-            self.enclosure_length = int(self.enclosure_length)
-        except:
+            self.enclosure_length = int(self.engine.get(enclosure, 'length'))
+        except (TypeError, ValueError):
             self.enclosure_length = None
 
     def set_guid(self):
         """Parses guid and set value"""
         try:
-            self.guid = self.soup.find('guid').string.strip()
+            self.guid = self._find_string('guid').strip()
         except AttributeError:
             self.guid = None
 
     def set_link(self):
         """Parses link and set value."""
         try:
-            self.link = self.soup.find('link').string.strip()
+            self.link = self._find_string('link').strip()
         except AttributeError:
             self.link = None
 
     def set_published_date(self):
         """Parses published date and set value."""
         try:
-            self.published_date = self.soup.find('pubDate').string.strip()
+            self.published_date = self._find_string('pubDate').strip()
         except AttributeError:
             self.published_date = None
 
     def set_title(self):
         """Parses title and set value."""
         try:
-            title = self.soup.find('title')
-            self.title = title.string.strip()
+            self.title = self._find_string('title').strip()
         except AttributeError:
             self.title = None
+
+    def set_text_elements(self):
+        """Set each of the *_text elements, html stripped from their twins."""
+        self.set_description_text()
+        self.set_title_text()
+        self.set_itunes_title_text()
+        self.set_itunes_subtitle_text()
+        self.set_itunes_summary_text()
+
+    def set_description_text(self):
+        """Strips html from description and sets value"""
         try:
-            title_soup = BeautifulSoup(self.title, "html.parser")
-            self.title_text = title_soup.get_text(" ", strip=True)
+            self.description_text = self.text_extractor(self.description)
+        except:
+            self.description_text = None
+
+    def set_title_text(self):
+        """Strips html from title and sets value"""
+        try:
+            self.title_text = self.text_extractor(self.title)
         except:
             self.title_text = None
 
+    def set_itunes_title_text(self):
+        """Strips html from itunes title and sets value"""
+        try:
+            self.itunes_title_text = self.text_extractor(self.itunes_title)
+        except:
+            self.itunes_title_text = None
+
+    def set_itunes_subtitle_text(self):
+        """Strips html from itunes subtitle and sets value"""
+        try:
+            self.itunes_subtitle_text = self.text_extractor(self.itunes_subtitle)
+        except:
+            self.itunes_subtitle_text = None
+
+    def set_itunes_summary_text(self):
+        """Strips html from itunes summary and sets value"""
+        try:
+            self.itunes_summary_text = self.text_extractor(self.itunes_summary)
+        except:
+            self.itunes_summary_text = None
+
     def set_itunes_element(self):
         """Set each of the itunes elements."""
         self.set_itunes_title()
@@ -250,48 +415,42 @@ class Item(object):
     def set_itunes_title(self):
         """Parses title from itunes tags and sets value"""
         try:
-            title = self.soup.find('itunes:title')
-            self.itunes_title = title.string.strip()
+            self.itunes_title = self._find_string('itunes:title').strip()
         except AttributeError:
             self.itunes_title = None
-        try:
-            title_soup = BeautifulSoup(self.itunes_title, "html.parser")
-            self.itunes_title_text = title_soup.get_text(" ", strip=True)
-        except:
-            self.itunes_title_text = None
 
     def set_itunes_author_name(self):
         """Parses author name from itunes tags and sets value"""
         try:
-            self.itunes_author_name = self.soup.find('itunes:author').string.strip()
+            self.itunes_author_name = self._find_string('itunes:author').strip()
         except AttributeError:
             self.itunes_author_name = None
 
     def set_itunes_episode(self):
         """Parses the episode number and sets value"""
         try:
-            self.itunes_episode = int(self.soup.find('itunes:episode').string)
+            self.itunes_episode = int(self._find_string('itunes:episode'))
         except:
             self.itunes_episode = None
 
     def set_itunes_season(self):
         """Parses the episode season and sets value"""
         try:
-            self.itunes_season = int(self.soup.find('itunes:season').string)
+            self.itunes_season = int(self._find_string('itunes:season'))
         except:
             self.itunes_season = None
 
     def set_itunes_episode_type(self):
         """Parses the episode type and sets value"""
         try:
-            self.itunes_episode_type = self.soup.find('itunes:episodeType').string.strip()
+            self.itunes_episode_type = self._find_string('itunes:episodeType').strip()
         except AttributeError:
             self.itunes_episode_type = None
 
     def set_itunes_block(self):
         """Check and see if item is blocked from iTunes and sets value"""
         try:
-            block = self.soup.find('itunes:block').string.lower()
+            block = self._find_string('itunes:block').lower()
         except AttributeError:
             block = ""
         if block == "yes":
@@ -302,8 +461,7 @@ class Item(object):
     def set_itunes_closed_captioned(self):
         """Parses isClosedCaptioned from itunes tags and sets value"""
         try:
-            self.itunes_closed_captioned = self.soup.find(
-                'itunes:isClosedCaptioned').string.strip()
+            self.itunes_closed_captioned = self._find_string('itunes:isClosedCaptioned').strip()
             self.itunes_closed_captioned = self.itunes_closed_captioned.lower()
         except AttributeError:
             self.itunes_closed_captioned = None
@@ -311,14 +469,14 @@ class Item(object):
     def set_itunes_duration(self):
         """Parses duration from itunes tags and sets value"""
         try:
-            self.itunes_duration = self.soup.find('itunes:duration').string.strip()
+            self.itunes_duration = self._find_string('itunes:duration').strip()
         except AttributeError:
             self.itunes_duration = None
 
     def set_itunes_explicit(self):
         """Parses explicit from itunes item tags and sets value"""
         try:
-            self.itunes_explicit = self.soup.find('itunes:explicit').string.strip()
+            self.itunes_explicit = self._find_string('itunes:explicit').strip()
             self.itunes_explicit = self.itunes_explicit.lower()
         except AttributeError:
             self.itunes_explicit = None
@@ -326,14 +484,14 @@ class Item(object):
     def set_itune_image(self):
         """Parses itunes item images and set url as value"""
         try:
-            self.itune_image = self.soup.find('itunes:image').get('href')
+            self.itune_image = self.engine.get(self._find('itunes:image'), 'href')
         except AttributeError:
             self.itune_image = None
 
     def set_itunes_order(self):
         """Parses episode order and set url as value"""
         try:
-            self.itunes_order = self.soup.find('itunes:order').string.strip()
+            self.itunes_order = self._find_string('itunes:order').strip()
             self.itunes_order = self.itunes_order.lower()
         except AttributeError:
             self.itunes_order = None
@@ -341,33 +499,21 @@ class Item(object):
     def set_itunes_subtitle(self):
         """Parses subtitle from itunes tags and sets value"""
         try:
-            subtitle = self.soup.find('itunes:subtitle')
-            self.itunes_subtitle = subtitle.string.strip()
+            self.itunes_subtitle = self._find_string('itunes:subtitle').strip()
         except AttributeError:
             self.itunes_subtitle = None
-        try:
-            subtitle_soup = BeautifulSoup(self.itunes_subtitle, "html.parser")
-            self.itunes_subtitle_text = subtitle_soup.get_text(" ", strip=True)
-        except:
-            self.itunes_subtitle_text = None
 
     def set_itunes_summary(self):
         """Parses summary from itunes tags and sets value"""
         try:
-            summary = self.soup.find('itunes:summary')
-            self.itunes_summary = summary.string.strip()
+            self.itunes_summary = self._find_string('itunes:summary').strip()
         except AttributeError:
             self.itunes_summary = None
-        try:
-            summary_soup = BeautifulSoup(self.itunes_summary, "html.parser")
-            self.itunes_summary_text = summary_soup.get_text(" ", strip=True)
-        except:
-            self.itunes_summary_text = None
 
     def set_itunes_keywords(self):
         """ Parse keywrods from itunes tags and set value"""
         try:
-            words = self.soup.find('itunes:keywords').string
+            words = self._find_string('itunes:keywords')
             self.itunes_keywords = [keyword.strip() for keyword in words.split(",")]
         except AttributeError:
             self.itunes_keywords = None
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+import json
+import mmap
+import os
+import tempfile
+
+from pyPodcastParser.engines import get_engine
+from pyPodcastParser.Item import Item
+from pyPodcastParser import scanner
+
+
+class ItemIndex(object):
+    """Byte offsets of the items of a feed file, to parse any one of them alone
+
+    The offsets, guid and pubDate of every item are found in a single scan
+    of the file, see scanner.scan_items, without parsing it. read_item()
+    then reads one item's bytes and parses them wrapped in the start tags of
+    the elements items sit in, such as rss and channel, so the namespaces
+    declared on any of them still apply. An
+    index can be saved next to its feed and loaded back as long as the
+    feed's size and modification time haven't changed.
+
+    Args:
+        entries (list): (start, end, guid, published_date) of every item, in feed order
+        start_tags (bytes): Start tags of the elements items sit in, see scanner.item_ancestors
+        end_tags (bytes): End tags of those elements
+        encoding (str): Encoding of the feed
+        feed_size (int): Size of the feed file in bytes
+        feed_mtime_ns (int): Modification time of the feed file in nanoseconds
+
+    Attributes:
+        entries (list): (start, end, guid, published_date) of every item, in feed order
+        start_tags (bytes): Start tags of the elements items sit in
+        end_tags (bytes): End tags of those elements
+        encoding (str): Encoding of the feed
+        feed_size (int): Size of the feed file in bytes
+        feed_mtime_ns (int): Modification time of the feed file in nanoseconds
+    """
+
+    #: Appended to the path of a feed to name its saved index
+    SUFFIX = ".items.json"
+
+    #: Version of the saved format, indexes of other versions are built again
+    VERSION = 2
+
+    def __init__(self, entries, start_tags=b"<rss><channel>", end_tags=b"</channel></rss>",
+                 encoding="utf-8", feed_size=None, feed_mtime_ns=None):
+        self.entries = entries
+        self.start_tags = start_tags
+        self.end_tags = end_tags
+        self.encoding = encoding
+        self.feed_size = feed_size
+        self.feed_mtime_ns = feed_mtime_ns
+        self._numbers = None
+
+    @classmethod
+    def build(cls, path):
+        """Scans the feed file at path through a read only mmap"""
+        with open(path, 'rb') as feed_file:
+            status = os.fstat(feed_file.fileno())
+            if status.st_size == 0:
+                return cls([], feed_size=0, feed_mtime_ns=status.st_mtime_ns)
+            with mmap.mmap(feed_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                encoding = scanner.xml_encoding(data)
+                entries = list(scanner.scan_items(data, encoding))
+                first_item = entries[0][0] if entries else len(data)
+                start_tags, end_tags = scanner.item_ancestors(data, first_item)
+        return cls(entries, start_tags, end_tags, encoding, status.st_size, status.st_mtime_ns)
+
+    @classmethod
+    def for_path(cls, path, save=True):
+        """Returns the saved index of the feed at path, building it when missing or stale
+
+        Args:
+            path (str): Path of the feed file
+            save (bool): Save a newly built index next to the feed. A feed in a
+                read only directory is indexed all the same
+        """
+        index = cls.load(path)
+        if index is None:
+            index = cls.build(path)
+            if save:
+                try:
+                    index.save(path)
+                except OSError:
+                    pass
+        return index
+
+    @classmethod
+    def index_path(cls, path):
+        return path + cls.SUFFIX
+
+    @classmethod
+    def load(cls, path):
+        """Returns the index saved next to the feed at path, or None when missing or stale"""
+        try:
+            with open(cls.index_path(path), 'r') as index_file:
+                saved = json.load(index_file)
+            status = os.stat(path)
+        except (OSError, ValueError):
+            return None
+        if (saved.get('version') != cls.VERSION or saved.get('feed_size') != status.st_size
+                or saved.get('feed_mtime_ns') != status.st_mtime_ns):
+            return None
+        return cls([tuple(entry) for entry in saved['items']],
+                   saved['start_tags'].encode('latin-1'), saved['end_tags'].encode('latin-1'),
+                   saved['encoding'],
+                   saved['feed_size'], saved['feed_mtime_ns'])
+
+    def save(self, path):
+        """Writes the index next to the feed at path, replacing it atomically"""
+        saved = {
+            'version': self.VERSION,
+            'feed_size': self.feed_size,
+            'feed_mtime_ns': self.feed_mtime_ns,
+            'encoding': self.encoding,
+            'start_tags': self.start_tags.decode('latin-1'),
+            'end_tags': self.end_tags.decode('latin-1'),
+            'items': self.entries,
+        }
+        index_path = self.index_path(path)
+        handle, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(index_path)), suffix=".tmp")
+        try:
+            with os.fdopen(handle, 'w') as index_file:
+                json.dump(saved, index_file, separators=(',', ':'))
+            os.replace(temp_path, index_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def __len__(self):
+        return len(self.entries)
+
+    def find(self, guid):
+        """Returns the number of the first item with guid, or None"""
+        if self._numbers is None:
+            numbers = {}
+            for number, entry in enumerate(self.entries):
+                if entry[2] is not None and entry[2] not in numbers:
+                    numbers[entry[2]] = number
+            self._numbers = numbers
+        return self._numbers.get(guid)
+
+    def item_bytes(self, feed_file, number):
+        """Returns the bytes of item number read from the binary file feed_file"""
+        start, end = self.entries[number][:2]
+        feed_file.seek(start)
+        return feed_file.read(end - start)
+
+    def wrap(self, item_bytes):
+        """Returns item_bytes as a feed of its own, in the elements items sit in"""
+        return scanner.wrap_items(item_bytes, self.start_tags, self.end_tags, self.encoding)
+
+    def read_item(self, path, number, engine="bs4", **item_options):
+        """Parses item number of the feed at path on its own
+
+        Args:
+            path (str): Path of the feed file
+            number (int): Position of the item in the feed, negative ones counting from the end
+            engine (str): Parsing engine, "bs4" (the default) or "lxml"
+            **item_options: Other keyword arguments of Item, such as text_extractor or lazy
+
+        Returns:
+            Item
+        """
+        with open(path, 'rb') as feed_file:
+            item_bytes = self.item_bytes(feed_file, number)
+        engine = get_engine(engine)
+        tree = engine.parse(self.wrap(item_bytes))
+        return Item(engine.items(tree)[0], engine=engine, **item_options)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+from collections.abc import Sequence
+
+from pyPodcastParser.polling import take_new_items
+
+
+class ItemSequence(Sequence):
+    """The Items of a feed, each built the first time it is needed
+
+    Podcast uses it for items when pre_set_items is False. Indexing,
+    slicing, len() and iteration only build the Items they reach, and
+    each Item is built at most once, so iterating again costs nothing.
+
+    Args:
+        nodes (list): The item nodes of the parse tree, in document order
+        build_item (callable): Builds the Item of a node
+
+    Attributes:
+        built_count (int): Number of Items built so far
+    """
+
+    def __init__(self, nodes, build_item):
+        self._nodes = nodes
+        self._items = [None] * len(nodes)
+        self._build_item = build_item
+        self.built_count = 0
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self._build_item(self._nodes[index])
+            self.built_count += 1
+        return item
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self):
+        return "<%s of %d items, %d built>" % (
+            type(self).__name__, len(self), self.built_count)
+
+
+class NewItemSequence(Sequence):
+    """The Items of a feed that aren't known yet, built as they are reached
+
+    Podcast uses it for items when pre_set_items is False and stop_at_guids
+    is given. Which items are new is only found out by reading them in
+    order, so indexing reads up to the index asked for, and len() or a
+    negative index reads up to the first known item. Each Item is still
+    built at most once.
+
+    Args:
+        nodes (list): The item nodes of the parse tree, in document order
+        build_item (callable): Builds the Item of a node
+        is_known (callable): Tells whether an Item is already known, see polling.known_item_test
+        scan_past_known (int): Number of items to look at past the first known one
+
+    Attributes:
+        built_count (int): Number of Items built so far, known ones included
+    """
+
+    def __init__(self, nodes, build_item, is_known, scan_past_known=0):
+        self._items = []
+        self._new_items = take_new_items(
+            self._build_items(nodes, build_item), is_known, scan_past_known)
+        self.built_count = 0
+
+    def _build_items(self, nodes, build_item):
+        for node in nodes:
+            self.built_count += 1
+            yield build_item(node)
+
+    def _read_to(self, index):
+        """Builds Items until there are more than index new ones, or none are left"""
+        while self._new_items is not None and (index < 0 or len(self._items) <= index):
+            for item in self._new_items:
+                self._items.append(item)
+                break
+            else:
+                self._new_items = None
+
+    def __len__(self):
+        self._read_to(-1)
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._read_to(-1)
+        elif index < 0:
+            self._read_to(-1)
+        else:
+            self._read_to(index)
+        return self._items[index]
+
+    def __iter__(self):
+        index = 0
+        while True:
+            self._read_to(index)
+            if index >= len(self._items):
+                return
+            yield self._items[index]
+            index += 1
+
+    def __repr__(self):
+        return "<%s of %d new items read, %d built>" % (
+            type(self).__name__, len(self._items), self.built_count)
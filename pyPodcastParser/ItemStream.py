@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+from copy import deepcopy
+
+from pyPodcastParser.engines import get_engine
+from pyPodcastParser.Item import Item
+from pyPodcastParser.polling import known_item_test, take_new_items
+
+
+class ItemStream(object):
+    """Parses a feed incrementally and yields its Items one at a time
+
+    The feed is read with lxml's iterparse. Every item element is detached
+    from the tree as soon as its Item has been yielded, so only the
+    channel elements and the current item are ever held in memory. The
+    channel elements are read in the same pass and exposed through
+    podcast. A stream can only be iterated once.
+
+    Args:
+        source: A path or a binary file object
+        stop_at_guids: Known guids and enclosure urls, or a callable telling whether an Item is known.
+            Parsing stops at the first known item, which isn't yielded, see polling
+        scan_past_known (int): Number of items to look at past the first known one
+        **item_options: Keyword arguments for each Item, such as text_extractor or lazy
+
+    Attributes:
+        source: The path or file object being parsed
+        item_count (int): Number of items parsed so far, known ones included
+        is_valid_podcast (bool): Has an item with an audio/mpeg enclosure been seen
+        podcast (Podcast): The channel elements read before the current item. Complete once
+            exhausted, unless it stopped at a known item. Its items are empty and no Item
+            is built for it
+    """
+
+    def __init__(self, source, stop_at_guids=None, scan_past_known=0, **item_options):
+        self.source = source
+        self.is_known = None
+        if stop_at_guids is not None:
+            self.is_known = known_item_test(stop_at_guids)
+        self.scan_past_known = scan_past_known
+        self.engine = get_engine("lxml")
+        self.item_options = dict(item_options, engine=self.engine)
+        self.item_count = 0
+        self.is_valid_podcast = False
+        self._root = None
+        self._current = None
+        self._podcast = None
+        self._started = False
+
+    def __iter__(self):
+        if self._started:
+            raise ValueError("An ItemStream can only be iterated once, make a new one to read "
+                             "its source again")
+        self._started = True
+        return self._iter_items()
+
+    def _iter_items(self):
+        items = self._parse_items()
+        if self.is_known is not None:
+            items = take_new_items(items, self.is_known, self.scan_past_known)
+        for item in items:
+            yield item
+        self._podcast = self.build_podcast()
+
+    def _parse_items(self):
+        for event, element in self.engine.iterparse(self.source):
+            if self._root is None:
+                self._root = element.getroottree().getroot()
+            if self.engine.local_name(element) != 'item':
+                continue
+            self._current = element
+            item = Item(element, **self.item_options)
+            self.item_count += 1
+            self.set_is_valid_podcast(item)
+            yield item
+            parent = element.getparent()
+            if parent is not None:
+                parent.remove(element)
+
+    def set_is_valid_podcast(self, item):
+        if item.enclosure_type:
+            if item.enclosure_type.lower() == "audio/mpeg":
+                self.is_valid_podcast = True
+
+    def build_podcast(self):
+        """Builds a Podcast from the channel elements read before the current item"""
+        from pyPodcastParser.Podcast import Podcast
+        podcast = Podcast(None, engine=self.engine, tree=self._channel_tree(), channel_only=True)
+        podcast.is_valid_podcast = self.is_valid_podcast
+        return podcast
+
+    def _channel_tree(self):
+        """Returns a copy of the tree without its items and what comes after the current one
+
+        lxml reads ahead of the item being yielded, so the tree can already
+        hold later items and channel elements, which are left out.
+        """
+        if self._root is None:
+            return self.engine.parse("")
+        # The path of the current item from the root, if it is still in the tree
+        path = []
+        element = self._current
+        while element is not None and element is not self._root:
+            parent = element.getparent()
+            if parent is None:
+                path = []
+                break
+            path.append(parent.index(element))
+            element = parent
+        root = deepcopy(self._root)
+        if path:
+            element = root
+            for position in reversed(path):
+                element = element[position]
+            # The current item goes, and so does everything after it and its ancestors
+            parent = element.getparent()
+            del parent[parent.index(element):]
+            while parent is not root:
+                element = parent
+                parent = element.getparent()
+                del parent[parent.index(element) + 1:]
+        for item in list(self.engine.items(root.getroottree())):
+            item.getparent().remove(item)
+        return root.getroottree()
+
+    @property
+    def podcast(self):
+        if self._podcast is not None:
+            return self._podcast
+        return self.build_podcast()
@@ -1,10 +1,50 @@
 # -*- coding: utf-8 -*-
-from bs4 import BeautifulSoup
+from bisect import bisect_left
+import calendar
+from copy import deepcopy
 from datetime import datetime
-import email.utils
-from time import mktime
+import heapq
+import mmap
+import os
+
+from bs4 import BeautifulSoup
 
+from pyPodcastParser.columns import items_to_columns
+from pyPodcastParser.dates import parse_published_date
+from pyPodcastParser.engines import get_engine
 from pyPodcastParser.Item import Item
+from pyPodcastParser.ItemSequence import ItemSequence, NewItemSequence
+from pyPodcastParser.ParseStats import ParseStats
+from pyPodcastParser.polling import known_item_test, take_new_items
+from pyPodcastParser.projection import resolve_fields
+from pyPodcastParser.scanner import channel_head
+from pyPodcastParser.text import get_text_extractor
+from pyPodcastParser import writers
+
+
+def _guid(item):
+    return item.guid
+
+
+def _enclosure_url(item):
+    return item.enclosure_url
+
+
+def _time_published(item):
+    return item.time_published
+
+
+def _timestamp(moment):
+    """Returns moment as a POSIX timestamp, reading naive datetimes as UTC"""
+    if isinstance(moment, datetime):
+        return calendar.timegm(moment.utctimetuple())
+    return moment
+
+
+def _episode(item):
+    if item.itunes_episode is None:
+        return None
+    return item.itunes_season, item.itunes_episode
 
 
 class Podcast():
@@ -20,7 +60,23 @@ class Podcast():
     The cloud element aka RSS Cloud is not supported as it has been superseded by the superior PubSubHubbub protocal
 
     Args:
-        feed_content (str): An rss string
+        feed_content (str or bytes): An rss string, or its bytes. See also from_bytes and from_path
+        pre_set_items (bool): Parse every item up front instead of on demand. When False items is an ItemSequence
+        engine (str): Parsing engine, "bs4" (the default) or "lxml"
+        tree: An already parsed tree from engine to use instead of feed_content
+        text_extractor (str): How item *_text fields strip html, "bs4" (the default) or "fast"
+        lazy_items (bool): Items compute each attribute on first access
+        compact_items (bool): Keep CompactItems, which hold no parse tree, instead of Items
+        channel_only (bool): Only parse the feed up to its first item and leave items empty.
+            Channel elements placed after the items are missed
+        stop_at_guids: Known guids and enclosure urls, or a callable telling whether an Item is known.
+            Items stop at the first known one and only hold new ones, see polling
+        scan_past_known (int): Number of items to look at past the first known one
+        stats: A ParseStats to record the time of each set_* phase into, or a callable
+            called with a new ParseStats once the Podcast is parsed
+        fields: Names of the only channel attributes to parse, see projection. The others are None
+        item_fields: Names of the only Item attributes to parse. enclosure_type is parsed
+            too when is_valid_podcast is, as it needs it, but isn't one of the Item fields
 
     Note:
         All attributes with empty or nonexistent element will have a value of None
@@ -28,14 +84,26 @@ class Podcast():
         Attributes are generally strings or lists of strings, because we want to record the literal value of elements.
 
     Attributes:
-        feed_content (str): The actual xml of the feed
-        soup (bs4.BeautifulSoup): A soup of the xml with items and image removed
+        feed_content (str or bytes): The actual xml of the feed. None when parsed with from_bytes
+            or from_path without keep_content
+        engine: The engine that built tree, see pyPodcastParser.engines
+        item_options (dict): Keyword arguments every Item is built with
+        compact_items (bool): Are items CompactItems
+        channel_only (bool): Were only the channel elements parsed
+        is_known (callable): Tells whether an Item is known, None without stop_at_guids
+        scan_past_known (int): Number of items looked at past the first known one
+        stats (ParseStats): Time of each set_* phase of the Podcast and its Items, None unless asked for
+        fields (frozenset): The channel attributes parsed and the keys of to_dict besides items,
+            None for all of them
+        tree (bs4.BeautifulSoup or lxml.etree._ElementTree): The single parse tree of the feed
+        channel_tags (list): Channel level tags of tree, without items and image
+        soup (bs4.BeautifulSoup): A soup of the xml with items and image removed. Built on first access
         image_soup (bs4.BeautifulSoup): soup of image
-        full_soup (bs4.BeautifulSoup): A soup of the xml with items
+        full_soup (bs4.BeautifulSoup): A soup of the xml with items. Same as tree for the bs4 engine
         categories (list): List for strings representing the feed categories
         copyright (str): The feed's copyright
         creative_commons (str): The feed's creative commons license
-        items (item): Item objects
+        items (list): Item objects, or an ItemSequence of them when pre_set_items is False
         description (str): The feed's description
         generator (str): The feed's generator
         image_title (str): Feed image title
@@ -64,48 +132,159 @@ class Podcast():
         ttl (str): The time to live or number of minutes to cache feed
         web_master (str): The feed's webmaster
         is_valid_rss (bool): Is this a valid RSS Feed
-        is_valid_podcast (bool): Is this a valid Podcast
-        date_time (datetime): When published
+        is_valid_podcast (bool): Is this a valid Podcast. None when channel_only. Only new items count with stop_at_guids
+        date_time (datetime): Date published, at midnight
+        published_datetime (datetime): When published, timezone aware
+        time_published (int): When published, as a POSIX timestamp
     """
 
-    def __init__(self, feed_content, pre_set_items = True):
+    #: Every channel tag name the setters look up, gathered in one walk
+    TAG_NAMES = frozenset([
+        'category', 'copyright', 'creativecommons:license', 'description',
+        'generator', 'language', 'lastBuildDate', 'link', 'managingEditor',
+        'pubDate', 'title', 'ttl', 'webMaster',
+        'itunes:author', 'itunes:block', 'itunes:category', 'itunes:complete',
+        'itunes:explicit', 'itunes:image', 'itunes:keywords',
+        'itunes:new-feed-url', 'itunes:owner', 'itunes:subtitle',
+        'itunes:summary', 'itunes:type',
+    ])
+
+    #: The setter of every public attribute holding a value of the channel
+    ATTRIBUTE_SETTERS = {
+        'categories': 'set_categories',
+        'copyright': 'set_copyright',
+        'creative_commons': 'set_creative_commons',
+        'date_time': 'set_dates_published',
+        'description': 'set_description',
+        'generator': 'set_generator',
+        'image_height': 'set_image',
+        'image_link': 'set_image',
+        'image_title': 'set_image',
+        'image_url': 'set_image',
+        'image_width': 'set_image',
+        'is_valid_podcast': 'set_is_valid_podcast',
+        'is_valid_rss': 'set_is_valid_rss',
+        'itune_image': 'set_itune_image',
+        'itunes_author_name': 'set_itunes_author_name',
+        'itunes_block': 'set_itunes_block',
+        'itunes_categories': 'set_itunes_categories',
+        'itunes_complete': 'set_itunes_complete',
+        'itunes_explicit': 'set_itunes_explicit',
+        'itunes_keywords': 'set_itunes_keywords',
+        'itunes_new_feed_url': 'set_itunes_new_feed_url',
+        'itunes_type': 'set_itunes_type',
+        'language': 'set_language',
+        'last_build_date': 'set_last_build_date',
+        'link': 'set_link',
+        'managing_editor': 'set_managing_editor',
+        'owner_email': 'set_owner',
+        'owner_name': 'set_owner',
+        'published_date': 'set_published_date',
+        'published_datetime': 'set_dates_published',
+        'pubsubhubbub': 'set_pubsubhubbub',
+        'subtitle': 'set_subtitle',
+        'summary': 'set_summary',
+        'time_published': 'set_time_published',
+        'title': 'set_title',
+        'ttl': 'set_ttl',
+        'web_master': 'set_web_master',
+    }
+
+    #: The attributes each attribute's setter reads
+    ATTRIBUTE_DEPENDENCIES = {
+        'date_time': ('published_date',),
+        'is_valid_rss': ('title', 'link', 'description'),
+        'published_datetime': ('published_date',),
+        'time_published': ('published_date',),
+    }
+
+    def __init__(self, feed_content, pre_set_items = True, engine="bs4",
+                 tree=None, text_extractor="bs4", lazy_items=False,
+                 compact_items=False, channel_only=False, stop_at_guids=None,
+                 scan_past_known=0, stats=None, fields=None, item_fields=None):
         #super(Podcast, self).__init__()
         self.pre_set_items = pre_set_items
         self.feed_content = feed_content
-        self.set_soup()
-        self.set_full_soup()
-        if pre_set_items:
-            self.set_items()
+        self.engine = get_engine(engine)
+        stats_callback = None
+        if stats is not None and not isinstance(stats, ParseStats):
+            stats_callback = stats
+            stats = ParseStats()
+        self.stats = stats
+        if stats is not None:
+            stats.feed_count += 1
+            if feed_content is not None:
+                stats.bytes_in += len(feed_content)
+        self.fields = None if fields is None else frozenset(fields)
+        extra_item_fields = None
+        if item_fields is not None:
+            item_fields = frozenset(item_fields)
+            if self.fields is None or 'is_valid_podcast' in self.fields:
+                extra_item_fields = frozenset(['enclosure_type'])
+        self.item_options = {
+            'engine': self.engine,
+            'text_extractor': get_text_extractor(text_extractor),
+            'lazy': lazy_items,
+            'stats': stats,
+            'fields': item_fields,
+            'extra_fields': extra_item_fields,
+        }
+        self.compact_items = compact_items
+        self.channel_only = channel_only
+        self.is_known = None
+        if stop_at_guids is not None:
+            self.is_known = known_item_test(stop_at_guids)
+        self.scan_past_known = scan_past_known
+        self._soup = None
+        self._full_soup = None
+        self._item_indexes = None
+        if tree is None:
+            self.run_setter('set_tree')
+        else:
+            self.tree = tree
+        self.run_setter('set_channel_tags')
+        if channel_only:
+            self.items = []
+        elif pre_set_items:
+            self.run_setter('set_items')
+        else:
+            self.run_setter('set_item_sequence')
 
-        self.set_extended_elements()
-        self.set_itunes()
-        self.set_optional_elements()
-        self.set_required_elements()
+        if self.fields is not None:
+            self.set_projected_elements()
+        else:
+            self.run_setter('set_extended_elements')
+            self.run_setter('set_itunes')
+            self.run_setter('set_optional_elements')
+            self.run_setter('set_required_elements')
+
+            self.run_setter('set_validity')
+            self.run_setter('set_time_published')
+            self.run_setter('set_dates_published')
+        if stats_callback is not None:
+            stats_callback(stats)
+
+    def run_setter(self, setter):
+        """Calls the setter method named setter, timing it into stats if set"""
+        if self.stats is None:
+            getattr(self, setter)()
+        else:
+            self.stats.run(setter, getattr(self, setter))
 
-        self.set_validity()
-        self.set_time_published()
-        self.set_dates_published()
+    def set_projected_elements(self):
+        """Runs only the setters of fields and leaves the other attributes None"""
+        setters, left_out = resolve_fields(type(self), self.fields)
+        self.__dict__.update(dict.fromkeys(left_out))
+        for setter in setters:
+            self.run_setter(setter)
 
     def set_time_published(self):
-        if self.published_date is None:
-            self.time_published = None
-            return
-        time_tuple = email.utils.parsedate_tz(self.published_date)
-        if time_tuple is None:
-            self.time_published = None
-            return
-        self.time_published = email.utils.mktime_tz(time_tuple)
+        self.time_published = parse_published_date(self.published_date).time_published
 
     def set_dates_published(self):
-        if self.published_date is None:
-            self.date_time = None
-        else:
-            time_tuple = email.utils.parsedate(self.published_date)
-            if time_tuple is None:
-                self.date_time = None
-                return
-            temp_datetime = datetime(time_tuple[0], time_tuple[1], time_tuple[2])
-            self.date_time = temp_datetime
+        published = parse_published_date(self.published_date)
+        self.date_time = published.date_time
+        self.published_datetime = published.datetime
 
     def set_validity(self):
         self.set_is_valid_rss()
@@ -119,6 +298,9 @@ class Podcast():
             self.is_valid_rss = False
 
     def set_is_valid_podcast(self):
+        if self.channel_only:
+            self.is_valid_podcast = None
+            return
         for item in self.get_items():
             if item.enclosure_type:
                 if item.enclosure_type.lower() == "audio/mpeg":
@@ -127,6 +309,14 @@ class Podcast():
         self.is_valid_podcast =  False
 
     def to_dict(self):
+        podcast_dict = self.channel_dict()
+        for item in self.items:
+            item_dict = item.to_dict()
+            podcast_dict['items'].append(item_dict)
+        return podcast_dict
+
+    def channel_dict(self):
+        """Returns to_dict() with its items left empty"""
         podcast_dict = {}
         podcast_dict['categories'] = self.categories
         podcast_dict['copyright'] = self.copyright
@@ -139,9 +329,6 @@ class Podcast():
         podcast_dict['image_width'] = self.image_width
         podcast_dict['image_height'] = self.image_height
         podcast_dict['items'] = []
-        for item in self.items:
-            item_dict = item.to_dict()
-            podcast_dict['items'].append(item_dict)
         podcast_dict['itunes_author_name'] = self.itunes_author_name
         podcast_dict['itunes_block'] = self.itunes_block
         podcast_dict['itunes_categories'] = self.itunes_categories
@@ -165,8 +352,66 @@ class Podcast():
         podcast_dict['title'] = self.title
         podcast_dict['ttl'] = self.ttl
         podcast_dict['web_master'] = self.web_master
+        if self.fields is not None:
+            podcast_dict = dict((key, value) for key, value in podcast_dict.items()
+                                if key == 'items' or key in self.fields)
         return podcast_dict
 
+    def freeze(self):
+        """Returns a snapshot of the values of the feed and its items
+
+        The snapshot is a CompactPodcast. It holds no tree, soup or
+        feed_content, so it pickles small and fast.
+        """
+        from pyPodcastParser.CompactPodcast import CompactPodcast
+        return CompactPodcast.from_podcast(self)
+
+    def diff(self, previous):
+        """Returns what changed since previous, an earlier Podcast or snapshot of the feed
+
+        Items are matched by guid, or enclosure_url without one, so both
+        versions must have parsed those two. See diffing.diff_podcasts
+
+        Returns:
+            diffing.FeedDiff: The changed channel fields and the added, removed and modified items
+        """
+        from pyPodcastParser.diffing import diff_podcasts
+        return diff_podcasts(self, previous)
+
+    def __reduce__(self):
+        """Pickles freeze(), so a Podcast unpickles as a CompactPodcast"""
+        return self.freeze().__reduce__()
+
+    def __copy__(self):
+        """Returns a Podcast sharing the attributes of this one, as __reduce__ only serves pickle"""
+        copied = type(self).__new__(type(self))
+        copied.__dict__.update(self.__dict__)
+        return copied
+
+    def __deepcopy__(self, memo):
+        """Returns a Podcast with copies of the attributes of this one, tree and Items included"""
+        copied = type(self).__new__(type(self))
+        memo[id(self)] = copied
+        copied.__dict__.update(deepcopy(self.__dict__, memo))
+        return copied
+
+    def write_json(self, fp):
+        """Writes to_dict() to the text file fp as JSON, one item at a time"""
+        writers.write_json(self, fp)
+
+    def write_ndjson(self, fp, feed=None):
+        """Writes the channel and then each item to the text file fp as NDJSON
+
+        Args:
+            fp: A text file
+            feed: Identifies the feed in every record, see writers.NDJSONSink
+        """
+        writers.write_ndjson(self, fp, feed)
+
+    def to_columns(self, fields=None):
+        """Returns the values of items as one column per field, see columns.items_to_columns"""
+        return items_to_columns(self.get_items(), fields)
+
     def set_extended_elements(self):
         """Parses and sets non required elements"""
         self.set_creative_commons()
@@ -206,9 +451,95 @@ class Podcast():
         self.set_link()
         self.set_description()
 
+    def set_tree(self):
+        """Parses feed_content once into the tree shared by channel and items
+
+        With channel_only, only the part before the first item is parsed.
+        """
+        if self.channel_only:
+            self.tree = self.engine.parse(channel_head(self.feed_content))
+        else:
+            self.tree = self.engine.parse(self.feed_content)
+
+    def set_channel_tags(self):
+        """Collects every tag of tree except the items and image subtrees
+
+        This is the same set of tags soup used to hold after stripping, so
+        the channel setters see exactly what they saw before. They are then
+        grouped by TAG_NAMES in the same single walk Item uses.
+        """
+        self.channel_tags = []
+        self._collect_channel_tags(self.tree)
+        self._tags = self.engine.collect(
+            self.tree, self.TAG_NAMES, self.channel_tags)
+
+    def _collect_channel_tags(self, parent):
+        engine = self.engine
+        for tag in engine.children(parent):
+            name = engine.local_name(tag)
+            if name == 'item':
+                continue
+            if name == 'image' and engine.has_contents(tag):
+                continue
+            self.channel_tags.append(tag)
+            self._collect_channel_tags(tag)
+
+    def _find(self, name, **attrs):
+        """Returns the first channel tag matching name and attrs or None"""
+        for tag in self._find_all(name, **attrs):
+            return tag
+        return None
+
+    def _find_all(self, name, **attrs):
+        """Returns all channel tags matching name and attrs"""
+        if name not in self.TAG_NAMES:
+            return [tag for tag in self.channel_tags
+                    if self.engine.matches(tag, name, attrs)]
+        tags = self._tags.get(name, [])
+        if not attrs:
+            return tags
+        return [tag for tag in tags
+                if all(self.engine.get(tag, key) == value
+                       for key, value in attrs.items())]
+
+    def _find_string(self, name):
+        """Returns the string of the first channel tag called name or None"""
+        tag = self._find(name)
+        if tag is None:
+            return None
+        return self.engine.string(tag)
+
+    def _string_in(self, parent, name):
+        """Returns the string of the first tag called name under parent"""
+        if parent is None:
+            return None
+        tag = self.engine.find(parent, name)
+        if tag is None:
+            return None
+        return self.engine.string(tag)
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            self.run_setter('set_soup')
+        return self._soup
+
+    @soup.setter
+    def soup(self, value):
+        self._soup = value
+
+    @property
+    def full_soup(self):
+        if self._full_soup is None:
+            self._full_soup = self.engine.to_soup(self.tree, self.feed_content)
+        return self._full_soup
+
     def set_soup(self):
         """Sets soup and strips items"""
-        self.soup = BeautifulSoup(self.feed_content, "xml")
+        feed_content = self.feed_content
+        if feed_content is None:
+            feed_content = self.engine.serialize(self.tree)
+        self.soup = BeautifulSoup(feed_content, "xml")
         for item in self.soup.findAll('item'):
             item.decompose()
         for image in self.soup.findAll('image'):
@@ -218,114 +549,315 @@ class Podcast():
 
     def set_full_soup(self):
         """Sets soup and keeps items"""
-        self.full_soup = BeautifulSoup(self.feed_content, "xml")
+        self.set_tree()
+
+    @classmethod
+    def parse_channel(cls, feed_content, **options):
+        """Parses only the channel elements of a feed, see channel_only
+
+        Args:
+            feed_content (str): An rss string
+            **options: Other keyword arguments of Podcast, such as engine
+
+        Returns:
+            Podcast: A Podcast with no items
+        """
+        return cls(feed_content, channel_only=True, **options)
+
+    @classmethod
+    def from_bytes(cls, data, keep_content=False, workers=None, **options):
+        """Parses the xml bytes of a feed, decoded the way its encoding declaration says
+
+        The bytes go to the parser as they are, without a round trip
+        through str, and are let go once parsed.
+
+        Args:
+            data (bytes): The feed, or any bytes like object such as a memoryview or mmap
+            keep_content (bool): Keep data as feed_content. Otherwise feed_content is None
+                and soup is rebuilt from the tree when asked for
+            workers (int): Parse the items in a pool of this many processes, see
+                parallel.parse_podcast. items are then CompactItems
+            **options: Other keyword arguments of Podcast, such as engine
+
+        Returns:
+            Podcast
+        """
+        if workers is None:
+            podcast = cls(data, **options)
+        else:
+            from pyPodcastParser.parallel import parse_podcast
+            podcast = parse_podcast(data, workers, **options)
+        if not keep_content:
+            podcast.feed_content = None
+        return podcast
+
+    @classmethod
+    def from_path(cls, path, keep_content=False, **options):
+        """Parses the feed in the file at path through a read only mmap
+
+        With the lxml engine the file is fed to the parser a chunk at a
+        time, so it is never held in memory as a whole. bs4 needs all of it
+        at once and gets a single bytes copy.
+
+        Args:
+            path (str): Path of the feed file
+            keep_content (bool): Keep the bytes of the file as feed_content
+            **options: Other keyword arguments of from_bytes, such as engine or workers
+
+        Returns:
+            Podcast
+        """
+        with open(path, 'rb') as feed_file:
+            if os.fstat(feed_file.fileno()).st_size == 0:
+                return cls.from_bytes(b"", keep_content, **options)
+            with mmap.mmap(feed_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                podcast = cls.from_bytes(data, **options)
+                if keep_content:
+                    podcast.feed_content = data[:]
+        return podcast
+
+    @staticmethod
+    def iter_items(source, **item_options):
+        """Parses a feed incrementally and yields its Items one at a time
+
+        Args:
+            source: A path or a binary file object
+            **item_options: Keyword arguments for each Item, such as text_extractor or lazy
+
+        Returns:
+            ItemStream: Iterable of Items, see ItemStream for channel metadata
+        """
+        from pyPodcastParser.ItemStream import ItemStream
+        return ItemStream(source, **item_options)
+
+    @staticmethod
+    def read_item(path, number=None, guid=None, index=None, **item_options):
+        """Parses a single item of the feed file at path from its bytes alone
+
+        The item is found through the ItemIndex of the file, which is built
+        in one scan the first time and saved next to the file, see
+        ItemIndex.for_path.
+
+        Args:
+            path (str): Path of the feed file
+            number (int): Position of the item in the feed
+            guid (str): guid of the item, instead of number
+            index (ItemIndex): Index of the file, to spare loading it again for every item
+            **item_options: Keyword arguments for the Item, such as engine or text_extractor
+
+        Returns:
+            Item: The item, or None when no item has guid
+        """
+        from pyPodcastParser.ItemIndex import ItemIndex
+        if index is None:
+            index = ItemIndex.for_path(path)
+        if guid is not None:
+            number = index.find(guid)
+            if number is None:
+                return None
+        return index.read_item(path, number, **item_options)
+
+    def build_item(self, node):
+        """Builds the Item of an item node, compacted if compact_items is set"""
+        item = Item(node, **self.item_options)
+        if self.compact_items:
+            return item.compact()
+        return item
 
     def get_items(self):
-        if self.pre_set_items:
+        for item in self.items:
+            yield item
+
+    def _indexes(self):
+        """Returns the indexes of items built so far, by name
+
+        Each index is built on first use, and all of them are dropped when
+        items is replaced, as set_items does, or changes length. Replacing
+        an item in place, as in items[0] = item, isn't noticed, assign a new
+        list to items instead.
+        """
+        items = self.items
+        indexes = self._item_indexes
+        if indexes is None or indexes[0] is not items or indexes[1] != len(items):
+            indexes = self._item_indexes = (items, len(items), {})
+        return indexes[2]
+
+    def _item_index(self, name, key, fields):
+        """Returns the items by key(item), the first item of a key winning
+
+        Items without a key are left out.
+
+        Raises:
+            ValueError: When items were parsed without one of fields, which key reads
+        """
+        indexes = self._indexes()
+        index = indexes.get(name)
+        if index is None:
+            self._check_item_fields(fields)
+            index = indexes[name] = {}
             for item in self.items:
-                yield item
-        else:
-            self.items = []
-            full_soup_items = self.full_soup.findAll('item')
-            for full_soup_item in full_soup_items:
-                item = Item(full_soup_item)
-                if item:
-                    self.items.append(item)
-                    yield item
+                item_key = key(item)
+                if item_key is not None and item_key not in index:
+                    index[item_key] = item
+        return index
+
+    def _time_index(self):
+        """Returns the time_published of the dated items in ascending order and the items in the same order"""
+        indexes = self._indexes()
+        index = indexes.get('time_published')
+        if index is None:
+            # Items of the same time go last in first, as feeds list the newest
+            # first, and so that newest() reads them in the order heapq.nlargest gives
+            dated = sorted((item.time_published, -position, item)
+                           for position, item in enumerate(self.items)
+                           if item.time_published is not None)
+            index = indexes['time_published'] = (
+                [time_published for time_published, position, item in dated],
+                [item for time_published, position, item in dated])
+        return index
+
+    def _check_item_fields(self, fields):
+        """Raises ValueError when items were parsed without one of fields, see item_fields"""
+        if len(self.items) == 0 or self.items[0].fields is None:
+            return
+        missing = [name for name in fields if name not in self.items[0].fields]
+        if missing:
+            raise ValueError("Items were parsed without %s, add them to item_fields to look "
+                             "items up by them" % " and ".join(missing))
+
+    def get_item(self, guid):
+        """Returns the first item with guid, or None
+
+        Raises:
+            ValueError: When item_fields left guid out
+        """
+        return self._item_index('guid', _guid, ('guid',)).get(guid)
+
+    def get_by_enclosure(self, url):
+        """Returns the first item with the enclosure url, or None
+
+        Raises:
+            ValueError: When item_fields left enclosure_url out
+        """
+        return self._item_index('enclosure_url', _enclosure_url, ('enclosure_url',)).get(url)
+
+    def get_episode(self, season, episode):
+        """Returns the first item with itunes_season season and itunes_episode episode, or None
+
+        season is None for items without a season.
+
+        Raises:
+            ValueError: When item_fields left itunes_season or itunes_episode out
+        """
+        return self._item_index(
+            'episode', _episode, ('itunes_season', 'itunes_episode')).get((season, episode))
+
+    def items_between(self, start=None, end=None):
+        """Returns the items published from start up to but not including end, oldest first
+
+        The items are sorted by time_published once, and each query then
+        bisects them. Items of the same time are taken to be listed newest
+        first, as feeds list them. Items without a publication date are
+        left out.
+
+        Args:
+            start: A datetime or POSIX timestamp, None for no lower bound. Naive datetimes are UTC
+            end: A datetime or POSIX timestamp, None for no upper bound
+
+        Returns:
+            list: The items
+        """
+        times, items = self._time_index()
+        low = 0 if start is None else bisect_left(times, _timestamp(start))
+        high = len(times) if end is None else bisect_left(times, _timestamp(end))
+        return items[low:high]
+
+    def newest(self, count):
+        """Returns the count most recently published items, newest first
+
+        Once items_between has sorted the items this is a slice of them,
+        before that a bounded heap keeps only count items while reading
+        the dates. Items without a publication date are left out.
+        """
+        indexes = self._indexes()
+        if 'time_published' in indexes:
+            times, items = indexes['time_published']
+            return items[:-count - 1:-1] if count > 0 else []
+        dated = (item for item in self.items if item.time_published is not None)
+        return heapq.nlargest(count, dated, key=_time_published)
 
     def set_items(self):
         self.items = []
-        full_soup_items = self.full_soup.findAll('item')
+        full_soup_items = self.engine.items(self.tree)
+        if self.is_known is not None:
+            items = (self.build_item(node) for node in full_soup_items)
+            self.items.extend(take_new_items(items, self.is_known, self.scan_past_known))
+            return
         for full_soup_item in full_soup_items:
-            item = Item(full_soup_item)
+            item = self.build_item(full_soup_item)
             if item:
                 self.items.append(item)
 
+    def set_item_sequence(self):
+        """Sets items to an ItemSequence that builds each Item on first use"""
+        nodes = self.engine.items(self.tree)
+        if self.is_known is not None:
+            self.items = NewItemSequence(
+                nodes, self.build_item, self.is_known, self.scan_past_known)
+        else:
+            self.items = ItemSequence(nodes, self.build_item)
+
     def set_categories(self):
         """Parses and set feed categories"""
         self.categories = []
-        temp_categories = self.soup.findAll('category')
+        temp_categories = self._find_all('category')
         for category in temp_categories:
-            category_text = category.string
+            category_text = self.engine.string(category)
             self.categories.append(category_text)
 
     def count_items(self):
         """Counts Items in full_soup and soup. For debugging"""
-        soup_items = self.soup.findAll('item')
-        full_soup_items = self.full_soup.findAll('item')
+        soup_items = self._find_all('item')
+        full_soup_items = self.engine.items(self.tree)
         return len(soup_items), len(full_soup_items)
 
     def set_copyright(self):
         """Parses copyright and set value"""
-        try:
-            self.copyright = self.soup.find('copyright').string
-        except AttributeError:
-            self.copyright = None
+        self.copyright = self._find_string('copyright')
 
     def set_creative_commons(self):
         """Parses creative commons for item and sets value"""
-        try:
-            self.creative_commons = self.soup.find(
-                'creativecommons:license').string
-        except AttributeError:
-            self.creative_commons = None
+        self.creative_commons = self._find_string('creativecommons:license')
 
     def set_description(self):
         """Parses description and sets value"""
-        try:
-            self.description = self.soup.find('description').string
-        except AttributeError:
-            self.description = None
+        self.description = self._find_string('description')
 
     def set_generator(self):
         """Parses feed generator and sets value"""
-        try:
-            self.generator = self.soup.find('generator').string
-        except AttributeError:
-            self.generator = None
+        self.generator = self._find_string('generator')
 
     def set_image(self):
         """Parses image element and set values"""
-        image = self.full_soup.find('image')
-        try:
-            self.image_title = image.find('title').string
-        except AttributeError:
-            self.image_title = None
-        try:
-            self.image_url = image.find('url').string
-        except AttributeError:
-            self.image_url = None
-        try:
-            self.image_link = image.find('link').string
-        except AttributeError:
-            self.image_link = None
-        try:
-            self.image_width = image.find('width').string
-        except AttributeError:
-            self.image_width = None
-        try:
-            self.image_height = image.find('height').string
-        except AttributeError:
-            self.image_height = None
+        image = self.engine.find(self.tree, 'image')
+        self.image_title = self._string_in(image, 'title')
+        self.image_url = self._string_in(image, 'url')
+        self.image_link = self._string_in(image, 'link')
+        self.image_width = self._string_in(image, 'width')
+        self.image_height = self._string_in(image, 'height')
 
     def set_itunes_author_name(self):
         """Parses author name from itunes tags and sets value"""
-        try:
-            self.itunes_author_name = self.soup.find('itunes:author').string
-        except AttributeError:
-            self.itunes_author_name = None
+        self.itunes_author_name = self._find_string('itunes:author')
 
     def set_itunes_type(self):
         """Parses the type of show and sets value"""
-        try:
-            self.itunes_type = self.soup.find('itunes:type').string
-        except AttributeError:
-            self.itunes_type = None
+        self.itunes_type = self._find_string('itunes:type')
 
     def set_itunes_block(self):
         """Check and see if podcast is blocked from iTunes and sets value"""
         try:
-            block = self.soup.find('itunes:block').string.lower()
+            block = self._find_string('itunes:block').lower()
         except AttributeError:
             block = ""
         if block == "yes":
@@ -336,40 +868,36 @@ class Podcast():
     def set_itunes_categories(self):
         """Parses and set itunes categories"""
         self.itunes_categories = []
-        temp_categories = self.soup.findAll('itunes:category')
+        temp_categories = self._find_all('itunes:category')
         for category in temp_categories:
-            category_text = category.get('text')
+            category_text = self.engine.get(category, 'text')
             self.itunes_categories.append(category_text)
 
     def set_itunes_complete(self):
         """Parses complete from itunes tags and sets value"""
         try:
-            self.itunes_complete = self.soup.find('itunes:complete').string
-            self.itunes_complete = self.itunes_complete.lower()
+            self.itunes_complete = self._find_string('itunes:complete').lower()
         except AttributeError:
             self.itunes_complete = None
 
     def set_itunes_explicit(self):
         """Parses explicit from itunes tags and sets value"""
         try:
-            self.itunes_explicit = self.soup.find('itunes:explicit').string
-            self.itunes_explicit = self.itunes_explicit.lower()
+            self.itunes_explicit = self._find_string('itunes:explicit').lower()
         except AttributeError:
             self.itunes_explicit = None
 
     def set_itune_image(self):
         """Parses itunes images and set url as value"""
-        try:
-            self.itune_image = self.soup.find('itunes:image')['href']
-        except (AttributeError, TypeError):
+        image = self._find('itunes:image')
+        if image is None:
             self.itune_image = None
+        else:
+            self.itune_image = self.engine.get(image, 'href')
 
     def set_itunes_keywords(self):
         """Parses itunes keywords and set value"""
-        try:
-            keywords = self.soup.find('itunes:keywords').string
-        except AttributeError:
-            keywords = None
+        keywords = self._find_string('itunes:keywords')
         try:
             self.itunes_keywords = [keyword.strip()
                                     for keyword in keywords.split(',')]
@@ -379,101 +907,63 @@ class Podcast():
 
     def set_itunes_new_feed_url(self):
         """Parses new feed url from itunes tags and sets value"""
-        try:
-            self.itunes_new_feed_url = self.soup.find(
-                'itunes:new-feed-url').string
-        except AttributeError:
-            self.itunes_new_feed_url = None
+        self.itunes_new_feed_url = self._find_string('itunes:new-feed-url')
 
     def set_language(self):
         """Parses feed language and set value"""
-        try:
-            self.language = self.soup.find('language').string
-        except AttributeError:
-            self.language = None
+        self.language = self._find_string('language')
 
     def set_last_build_date(self):
         """Parses last build date and set value"""
-        try:
-            self.last_build_date = self.soup.find('lastBuildDate').string
-        except AttributeError:
-            self.last_build_date = None
+        self.last_build_date = self._find_string('lastBuildDate')
 
     def set_link(self):
         """Parses link to homepage and set value"""
-        try:
-            for link in self.soup.find_all('link', rel=None):
-                if link is not None and link.string is not None:
-                    self.link = link.string
-                    return
-            self.link = None
-        except AttributeError:
-            self.link = None
+        for link in self._find_all('link', rel=None):
+            link_text = self.engine.string(link)
+            if link_text is not None:
+                self.link = link_text
+                return
+        self.link = None
 
     def set_managing_editor(self):
         """Parses managing editor and set value"""
-        try:
-            self.managing_editor = self.soup.find('managingEditor').string
-        except AttributeError:
-            self.managing_editor = None
+        self.managing_editor = self._find_string('managingEditor')
 
     def set_published_date(self):
         """Parses published date and set value"""
-        try:
-            self.published_date = self.soup.find('pubDate').string
-        except AttributeError:
-            self.published_date = None
+        self.published_date = self._find_string('pubDate')
 
     def set_pubsubhubbub(self):
         """Parses pubsubhubbub and email then sets value"""
-        try:
-            self.pubsubhubbub = self.soup.find('link', rel='hub')['href']
-        except (AttributeError, TypeError):
+        hub = self._find('link', rel='hub')
+        if hub is None:
             self.pubsubhubbub = None
+        else:
+            self.pubsubhubbub = self.engine.get(hub, 'href')
 
     def set_owner(self):
         """Parses owner name and email then sets value"""
-        owner = self.soup.find('itunes:owner')
-        try:
-            self.owner_name = owner.find('itunes:name').string
-        except AttributeError:
-            self.owner_name = None
-        try:
-            self.owner_email = owner.find('itunes:email').string
-        except AttributeError:
-            self.owner_email = None
+        owner = self._find('itunes:owner')
+        self.owner_name = self._string_in(owner, 'itunes:name')
+        self.owner_email = self._string_in(owner, 'itunes:email')
 
     def set_subtitle(self):
         """Parses subtitle and sets value"""
-        try:
-            self.subtitle = self.soup.find('itunes:subtitle').string
-        except AttributeError:
-            self.subtitle = None
+        self.subtitle = self._find_string('itunes:subtitle')
 
     def set_summary(self):
         """Parses summary and set value"""
-        try:
-            self.summary = self.soup.find('itunes:summary').string
-        except AttributeError:
-            self.summary = None
+        self.summary = self._find_string('itunes:summary')
 
     def set_title(self):
         """Parses title and set value"""
-        try:
-            self.title = self.soup.title.string
-        except AttributeError:
-            self.title = None
+        self.title = self._find_string('title')
 
     def set_ttl(self):
         """Parses summary and set value"""
-        try:
-            self.ttl = self.soup.find('ttl').string
-        except AttributeError:
-            self.ttl = None
+        self.ttl = self._find_string('ttl')
 
     def set_web_master(self):
         """Parses the feed's webmaster and sets value"""
-        try:
-            self.web_master = self.soup.find('webMaster').string
-        except AttributeError:
-            self.web_master = None
+        self.web_master = self._find_string('webMaster')
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Parses many feeds at once across a pool of processes
+
+Feeds are sent to the workers in chunks, and each worker sends back
+the CompactPodcast snapshot of every feed rather than a Podcast holding
+its parse tree.
+A feed that fails to parse only fails its own result.
+"""
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+import os
+
+from pyPodcastParser.Podcast import Podcast
+
+#: What parse_many yields for every feed. index is the position of the feed
+#: in sources, podcast is Podcast.freeze() of it, or None when error, the
+#: "ExceptionName: message" of what went wrong, is set. podcast used to be
+#: Podcast.to_dict(), podcast.to_dict() gives that same dict.
+BatchResult = namedtuple('BatchResult', ['index', 'podcast', 'error'])
+
+
+def parse_feed(index, feed_content, podcast_options):
+    """Parses a single feed into a BatchResult, catching any error"""
+    try:
+        podcast = Podcast(feed_content, **podcast_options)
+        return BatchResult(index, podcast.freeze(), None)
+    except Exception as error:
+        return BatchResult(index, None, "%s: %s" % (type(error).__name__, error))
+
+
+def parse_chunk(start, feed_contents, podcast_options):
+    """Parses consecutive feeds, the first being at index start"""
+    return [parse_feed(index, feed_content, podcast_options)
+            for index, feed_content in enumerate(feed_contents, start)]
+
+
+def parse_many(sources, workers=None, chunksize=16, **podcast_options):
+    """Parses feeds in a pool of processes, yielding results as they complete
+
+    Sources are read lazily, and only a couple of chunks per worker are
+    in flight at a time, so sources can be a generator over far more
+    feeds than fit in memory.
+
+    Args:
+        sources: Iterable of feed contents, as given to Podcast
+        workers (int): Number of processes, os.cpu_count() by default. With 1 feeds are parsed in this process
+        chunksize (int): Number of feeds sent to a worker at a time
+        **podcast_options: Keyword arguments for each Podcast, such as engine or text_extractor
+
+    Returns:
+        generator: A BatchResult per feed, in completion order
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1, got %r" % (chunksize,))
+    sources = iter(sources)
+    if workers <= 1:
+        for index, feed_content in enumerate(sources):
+            yield parse_feed(index, feed_content, podcast_options)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        start = 0
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < workers * 2:
+                chunk = list(islice(sources, chunksize))
+                if not chunk:
+                    exhausted = True
+                    break
+                future = executor.submit(parse_chunk, start, chunk, podcast_options)
+                pending[future] = (start, len(chunk))
+                start += len(chunk)
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_start, chunk_length = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    for result in future.result():
+                        yield result
+                    continue
+                message = "%s: %s" % (type(error).__name__, error)
+                for index in range(chunk_start, chunk_start + chunk_length):
+                    yield BatchResult(index, None, message)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Lays the values of items out as one column per field
+
+Numeric fields go into array('q') buffers, which numpy.frombuffer and
+most dataframe libraries take without copying, along with a mask of the
+missing values. Every other field is a plain list. Items are read one at
+a time, so the items of an ItemStream are never all held at once.
+"""
+from array import array
+from collections import namedtuple
+
+from pyPodcastParser.Item import Item
+
+#: Item fields that are whole numbers or None
+NUMERIC_FIELDS = ('enclosure_length', 'itunes_episode', 'itunes_season', 'time_published')
+
+#: Fields items_to_columns lays out by default: the keys of Item.to_dict and time_published
+COLUMN_FIELDS = Item.DICT_KEYS + ('time_published',)
+
+#: A numeric column. values is an array('q') holding 0 where a value is
+#: missing, and mask an array('B') holding 1 there and 0 elsewhere.
+NumericColumn = namedtuple('NumericColumn', ['values', 'mask'])
+
+
+def items_to_columns(items, fields=None):
+    """Reads items into one column per field
+
+    Args:
+        items: Iterable of Items or CompactItems, such as Podcast.items or an ItemStream
+        fields (iterable): Names of the fields to read, COLUMN_FIELDS by default
+
+    Returns:
+        dict: Each field mapped to a NumericColumn if it is in NUMERIC_FIELDS, or a list
+    """
+    if fields is None:
+        fields = COLUMN_FIELDS
+    columns = {}
+    numeric_columns = []
+    other_columns = []
+    for field in fields:
+        if field in NUMERIC_FIELDS:
+            column = columns[field] = NumericColumn(array('q'), array('B'))
+            numeric_columns.append((field, column.values, column.mask))
+        else:
+            column = columns[field] = []
+            other_columns.append((field, column))
+    for item in items:
+        for field, values, mask in numeric_columns:
+            value = getattr(item, field)
+            if value is not None:
+                try:
+                    values.append(value)
+                    mask.append(0)
+                    continue
+                except (OverflowError, TypeError):
+                    pass
+            values.append(0)
+            mask.append(1)
+        for field, column in other_columns:
+            column.append(getattr(item, field))
+    return columns
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Parses the RFC 822 dates of pubDate elements
+
+parse_published_date parses a date once into every value Podcast and
+Item keep of it, and remembers the most recent dates it has seen. Dates
+in the usual "Fri, 21 Mar 2008 09:51:00 -0400" shape are read with a
+single regex. Anything else goes through email.utils.parsedate_tz, which
+copes with a missing weekday, two digit years and the North American
+zone names. Both paths also understand the zone names and +hh:mm offsets
+listed in TIMEZONES, which email.utils would read as UTC. A date without
+a zone, or with one not listed, is taken as UTC like email.utils does.
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+import email.utils
+from functools import lru_cache
+import re
+
+#: Offset in seconds of every zone name understood, on top of email.utils's
+TIMEZONES = {
+    'UT': 0, 'UTC': 0, 'GMT': 0, 'Z': 0,
+    'AST': -4 * 3600, 'ADT': -3 * 3600,
+    'EST': -5 * 3600, 'EDT': -4 * 3600,
+    'CST': -6 * 3600, 'CDT': -5 * 3600,
+    'MST': -7 * 3600, 'MDT': -6 * 3600,
+    'PST': -8 * 3600, 'PDT': -7 * 3600,
+    'AKST': -9 * 3600, 'AKDT': -8 * 3600,
+    'HST': -10 * 3600,
+    'WET': 0, 'WEST': 3600,
+    'BST': 3600, 'CET': 3600, 'CEST': 2 * 3600,
+    'EET': 2 * 3600, 'EEST': 3 * 3600,
+    'MSK': 3 * 3600,
+    'JST': 9 * 3600,
+    'AEST': 10 * 3600, 'AEDT': 11 * 3600,
+    'NZST': 12 * 3600, 'NZDT': 13 * 3600,
+}
+
+#: Number of dates parse_published_date remembers
+CACHE_SIZE = 4096
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+_RFC_822 = re.compile(r"""
+    \s*(?:[A-Za-z]+,\s*)?                       # weekday
+    (?P<day>\d{1,2})\s+(?P<month>[A-Za-z]{3})\s+(?P<year>\d{4}|\d{2})\s+
+    (?P<hour>\d{1,2}):(?P<minute>\d{2})(?::(?P<second>\d{2}))?
+    (?:\s+(?:(?P<sign>[+-])(?P<hours>\d{2}):?(?P<minutes>\d{2})|(?P<zone>[A-Za-z]+)))?
+    \s*$
+""", re.VERBOSE)
+
+_ZONE = re.compile(r"(?<=\s)(?:([+-]\d{2}):(\d{2})|([A-Za-z]{3,4}))\s*$")
+
+#: What parse_published_date returns. date_time is the naive date at
+#: midnight, datetime the aware date and time, and time_published the
+#: POSIX timestamp.
+PublishedDate = namedtuple('PublishedDate', ['time_published', 'date_time', 'datetime'])
+
+_UNPARSED = PublishedDate(None, None, None)
+
+_TZINFOS = {}
+
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def _match_rfc_822(published_date):
+    """Reads a well formed date into a parsedate_tz tuple or returns None"""
+    match = _RFC_822.match(published_date)
+    if match is None:
+        return None
+    day, month, year, hour, minute, second, sign, hours, minutes, zone = match.groups()
+    month = MONTHS.get(month.lower())
+    if month is None:
+        return None
+    year = int(year)
+    if year < 100:
+        year += 1900 if year > 68 else 2000
+    if sign is not None:
+        offset = int(hours) * 3600 + int(minutes) * 60
+        if sign == '-':
+            offset = -offset
+    elif zone is not None:
+        offset = TIMEZONES.get(zone.upper(), 0)
+    else:
+        offset = 0
+    return (year, month, int(day), int(hour), int(minute),
+            int(second) if second else 0, 0, 1, -1, offset)
+
+
+def _timezone(offset):
+    """Returns the tzinfo of offset, shared by every date with that offset"""
+    tzinfo = _TZINFOS.get(offset)
+    if tzinfo is None:
+        tzinfo = timezone(timedelta(seconds=offset))
+        if len(_TZINFOS) < CACHE_SIZE:
+            _TZINFOS[offset] = tzinfo
+    return tzinfo
+
+
+def _parsedate_tz(published_date):
+    """Reads any date email.utils can into a parsedate_tz tuple or returns None
+
+    The zone is read here when it is one email.utils doesn't know.
+    """
+    parsed = _match_rfc_822(published_date)
+    if parsed is not None:
+        return parsed
+    offset = None
+    zone = _ZONE.search(published_date)
+    if zone is not None:
+        if zone.group(3) is None:
+            published_date = "%s %s%s" % (
+                published_date[:zone.start()], zone.group(1), zone.group(2))
+        else:
+            offset = TIMEZONES.get(zone.group(3).upper())
+    try:
+        parsed = email.utils.parsedate_tz(published_date)
+    except (IndexError, ValueError):
+        return None
+    if parsed is None:
+        return None
+    if offset is not None:
+        parsed = parsed[:9] + (offset,)
+    return parsed
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_published_date(published_date):
+    """Parses a pubDate into a PublishedDate
+
+    Args:
+        published_date (str): The date, or None
+
+    Returns:
+        PublishedDate: Its values, all None when it can't be parsed
+    """
+    if not published_date:
+        return _UNPARSED
+    parsed = _parsedate_tz(published_date)
+    if parsed is None:
+        return _UNPARSED
+    try:
+        date_time = datetime(parsed[0], parsed[1], parsed[2])
+    except (OverflowError, ValueError):
+        try:
+            time_published = email.utils.mktime_tz(parsed)
+        except (OverflowError, ValueError):
+            time_published = None
+        return PublishedDate(time_published, None, None)
+    time_published = ((date_time.toordinal() - _EPOCH_ORDINAL) * 86400 + parsed[3] * 3600
+                      + parsed[4] * 60 + parsed[5] - parsed[9])
+    try:
+        aware_datetime = datetime(*parsed[:6], tzinfo=_timezone(parsed[9]))
+    except ValueError:
+        # A time past its range, such as a leap second or 24:00, rolls over
+        # like time_published does. An offset of a day or more has no
+        # timezone, so only published_datetime is left out
+        try:
+            aware_datetime = datetime(*parsed[:3], tzinfo=_timezone(parsed[9])) + timedelta(
+                hours=parsed[3], minutes=parsed[4], seconds=parsed[5])
+        except (OverflowError, ValueError):
+            aware_datetime = None
+    return PublishedDate(time_published, date_time, aware_datetime)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""Compares two parsed versions of a feed
+
+Items are matched through a dict keyed by their guid, or by their
+enclosure_url when they have no guid, and each item is reduced to a
+single tuple of its values, so a diff costs O(n) in the number of items.
+Fields computed from other fields, like description_text or
+time_published, are not compared as they only change along with their
+source. Podcasts and CompactPodcasts, unpickled or cached ones included,
+can be compared with each other.
+"""
+from collections import namedtuple
+from operator import attrgetter
+
+from pyPodcastParser.Item import Item
+from pyPodcastParser.Podcast import Podcast
+
+#: Channel attributes compared, those not computed from other attributes
+CHANNEL_FIELDS = tuple(sorted(
+    name for name in Podcast.ATTRIBUTE_SETTERS if name not in Podcast.ATTRIBUTE_DEPENDENCIES))
+
+#: Item attributes compared, those not computed from other attributes
+ITEM_FIELDS = tuple(sorted(
+    name for name in Item.ATTRIBUTE_SETTERS if name not in Item.ATTRIBUTE_DEPENDENCIES))
+
+#: Item attributes items are matched by, which both versions must have parsed
+KEY_FIELDS = ('guid', 'enclosure_url')
+
+#: An item found in both versions with different values. key is its guid
+#: or enclosure_url, changes the (previous, current) values of each
+#: changed field by name.
+ItemChange = namedtuple('ItemChange', ['key', 'previous', 'current', 'changes'])
+
+
+def item_key(item):
+    """Returns the guid of item, or its enclosure_url when it has none, or None"""
+    if item.guid:
+        return item.guid
+    return item.enclosure_url or None
+
+
+def _compared_fields(all_fields, *projections):
+    """Returns the fields of all_fields parsed in every projection"""
+    return tuple(name for name in all_fields
+                 if all(fields is None or name in fields for fields in projections))
+
+
+def _values_getter(fields):
+    """Returns a function giving the tuple of the values of fields of an object"""
+    if len(fields) == 0:
+        return lambda parsed: ()
+    if len(fields) == 1:
+        name = fields[0]
+        return lambda parsed: (getattr(parsed, name),)
+    return attrgetter(*fields)
+
+
+def _changes(fields, previous_values, current_values):
+    return dict((name, (previous, current))
+                for name, previous, current in zip(fields, previous_values, current_values)
+                if previous != current)
+
+
+def _keyed_items(items, get_values):
+    """Returns each item with its values by (key, occurrence of the key)"""
+    keyed = {}
+    for item in items:
+        key = item_key(item)
+        occurrence = 0
+        while (key, occurrence) in keyed:
+            occurrence += 1
+        keyed[(key, occurrence)] = (item, get_values(item))
+    return keyed
+
+
+def _item_fields(items):
+    if not items:
+        return None
+    return items[0].fields
+
+
+def _check_key_fields(item_fields, version):
+    """Raises ValueError when item_fields leaves out a field items are matched by"""
+    if item_fields is None:
+        return
+    missing = [name for name in KEY_FIELDS if name not in item_fields]
+    if missing:
+        raise ValueError("Items of the %s version can't be matched without %s, "
+                         "add them to its item_fields" % (version, " and ".join(missing)))
+
+
+def diff_podcasts(current, previous):
+    """Returns what changed from the previous version of a feed to the current one
+
+    Only fields parsed in both versions are compared, see Podcast fields
+    and item_fields. Items left unmatched by their key are matched by
+    enclosure_url, and items with neither a guid nor an enclosure_url are
+    matched in the order they come in.
+
+    Args:
+        current: A Podcast or CompactPodcast
+        previous: A Podcast or CompactPodcast of an earlier version of the feed
+
+    Returns:
+        FeedDiff
+
+    Raises:
+        ValueError: When the item_fields of either version leave out guid or enclosure_url,
+            as items couldn't be told apart
+    """
+    channel_fields = _compared_fields(CHANNEL_FIELDS, current.fields, previous.fields)
+    get_channel_values = _values_getter(channel_fields)
+    channel = _changes(channel_fields, get_channel_values(previous), get_channel_values(current))
+
+    current_items = list(current.get_items())
+    previous_items = list(previous.get_items())
+    current_item_fields = _item_fields(current_items)
+    previous_item_fields = _item_fields(previous_items)
+    _check_key_fields(current_item_fields, "current")
+    _check_key_fields(previous_item_fields, "previous")
+    item_fields = _compared_fields(ITEM_FIELDS, current_item_fields, previous_item_fields)
+    get_item_values = _values_getter(item_fields)
+    previous_keyed = _keyed_items(previous_items, get_item_values)
+    current_keyed = _keyed_items(current_items, get_item_values)
+    leftover = dict((keys, entry) for keys, entry in previous_keyed.items()
+                    if keys not in current_keyed)
+    # An item that gained, lost or changed its guid is still found by its enclosure_url
+    by_enclosure = {}
+    for keys, (item, values) in leftover.items():
+        if item.enclosure_url:
+            by_enclosure.setdefault(item.enclosure_url, keys)
+    added = []
+    modified = []
+    for keys, (item, values) in current_keyed.items():
+        found = previous_keyed.get(keys)
+        if found is None:
+            previous_keys = None
+            if item.enclosure_url:
+                previous_keys = by_enclosure.pop(item.enclosure_url, None)
+            if previous_keys is None:
+                added.append(item)
+                continue
+            found = leftover.pop(previous_keys)
+        previous_item, previous_values = found
+        if values != previous_values:
+            modified.append(ItemChange(
+                keys[0], previous_item, item, _changes(item_fields, previous_values, values)))
+    removed = [item for item, values in leftover.values()]
+    return FeedDiff(channel, added, removed, modified)
+
+
+class FeedDiff(object):
+    """What changed between two versions of a feed, see diff_podcasts
+
+    A FeedDiff is true when anything changed.
+
+    Attributes:
+        channel (dict): The (previous, current) values of each changed channel field, by name
+        added (list): Items of the current version missing from the previous one, in feed order
+        removed (list): Items of the previous version missing from the current one, in feed order
+        modified (list): An ItemChange per item found in both versions with different values
+    """
+
+    def __init__(self, channel=None, added=None, removed=None, modified=None):
+        self.channel = {} if channel is None else channel
+        self.added = [] if added is None else added
+        self.removed = [] if removed is None else removed
+        self.modified = [] if modified is None else modified
+
+    def __bool__(self):
+        return bool(self.channel or self.added or self.removed or self.modified)
+
+    def __repr__(self):
+        return "<%s channel=%d added=%d removed=%d modified=%d>" % (
+            type(self).__name__, len(self.channel), len(self.added),
+            len(self.removed), len(self.modified))
+
+    def to_dict(self):
+        return {
+            'channel': dict((name, list(values)) for name, values in self.channel.items()),
+            'added': [item.to_dict() for item in self.added],
+            'removed': [item.to_dict() for item in self.removed],
+            'modified': [
+                {'key': change.key,
+                 'changes': dict((name, list(values)) for name, values in change.changes.items())}
+                for change in self.modified],
+        }
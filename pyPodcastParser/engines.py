@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""Parsing engines used by Podcast and Item
+
+An engine builds the parse tree of a feed and answers the handful of
+questions the setters ask about it: find a tag by name, read its string
+and read its attributes. Names are matched the way bs4's find() matches
+them, so 'title' matches any tag whose local name is title and
+'itunes:title' only matches the itunes one.
+
+Rather than scanning once per setter, Item and Podcast walk their tags
+once with collect(), which sends every tag to the names it matches in a
+table of the names their setters ask for.
+"""
+from bs4 import BeautifulSoup, Tag
+from lxml import etree
+
+
+class SoupEngine(object):
+    """Builds a bs4.BeautifulSoup tree with the lxml xml parser"""
+
+    name = "bs4"
+
+    def parse(self, content):
+        if isinstance(content, (bytearray, memoryview)):
+            content = bytes(content)
+        return BeautifulSoup(content, "xml")
+
+    def to_soup(self, tree, content):
+        return tree
+
+    def serialize(self, tree):
+        return str(tree)
+
+    def items(self, tree):
+        return tree.findAll('item')
+
+    def children(self, node):
+        return [child for child in node.children if isinstance(child, Tag)]
+
+    def local_name(self, node):
+        return node.name
+
+    def prefix(self, node):
+        return node.prefix
+
+    def has_contents(self, node):
+        return len(node.contents) > 0
+
+    def matches(self, node, name, attrs):
+        return _matches(self, node, name, attrs)
+
+    def collect(self, node, names, tags=None):
+        """Groups tags by the names they match, keeping document order
+
+        Args:
+            node: Node whose descendants are walked, and whose namespaces are in scope
+            names (frozenset): Names to collect, as given to find()
+            tags (list): Tags to walk instead of the descendants of node
+
+        Returns:
+            dict: Each matched name mapped to the list of its tags
+        """
+        if tags is None:
+            tags = node.descendants
+        found = {}
+        for tag in tags:
+            if not isinstance(tag, Tag):
+                continue
+            name = tag.name
+            if name in names:
+                found.setdefault(name, []).append(tag)
+            if tag.prefix:
+                qualified_name = "%s:%s" % (tag.prefix, name)
+                if qualified_name in names:
+                    found.setdefault(qualified_name, []).append(tag)
+        return found
+
+    def find(self, node, name):
+        return node.find(name)
+
+    def find_all(self, node, name):
+        return node.findAll(name)
+
+    def get(self, node, attribute):
+        return node.get(attribute)
+
+    def string(self, node):
+        string = node.string
+        if string is None:
+            return None
+        return str(string)
+
+
+class LxmlEngine(object):
+    """Builds an lxml.etree tree directly, skipping bs4 altogether
+
+    Lookups match names the way bs4 does: lxml finds the tags with the
+    local name in any namespace, and a prefixed name then only keeps the
+    tags written with that prefix, wherever it is declared. Tags with an
+    undeclared prefix are renamed to their local name after parsing, which
+    is how bs4 sees them.
+    """
+
+    name = "lxml"
+
+    #: Most distinct sets of names _search_tags keeps
+    MAX_SEARCH_TABLES = 256
+
+    #: Bytes fed to the parser at a time from a memoryview, mmap or other buffer
+    FEED_CHUNK_SIZE = 1 << 20
+
+    def __init__(self):
+        self._search_tables = {}
+
+    def parse(self, content):
+        parser = etree.XMLParser(recover=True)
+        try:
+            if isinstance(content, (str, bytes)):
+                parser.feed(content)
+            else:
+                self._feed_buffer(parser, content)
+            root = parser.close()
+        except etree.XMLSyntaxError:
+            root = None
+        if root is None:
+            return etree.ElementTree()
+        for element in root.iter(etree.Element):
+            self.normalize(element)
+        return root.getroottree()
+
+    def _feed_buffer(self, parser, content):
+        """Feeds a buffer to parser a chunk at a time instead of copying it whole"""
+        with memoryview(content) as view:
+            for start in range(0, len(view), self.FEED_CHUNK_SIZE):
+                parser.feed(view[start:start + self.FEED_CHUNK_SIZE].tobytes())
+
+    def iterparse(self, source, events=('end',)):
+        """Parses a path or binary file incrementally, see lxml.etree.iterparse
+
+        Every element is normalized by the time its end event is seen.
+        """
+        context = etree.iterparse(source, events=events, recover=True)
+        try:
+            for event, element in context:
+                if event == 'end':
+                    self.normalize(element)
+                yield event, element
+        except etree.XMLSyntaxError:
+            return
+
+    def normalize(self, element):
+        """Renames a tag with an undeclared prefix to its local name"""
+        tag = element.tag
+        if ':' in tag and tag[0] != '{':
+            element.tag = tag.split(':', 1)[1]
+
+    def to_soup(self, tree, content):
+        if content is None:
+            content = self.serialize(tree)
+        return BeautifulSoup(content, "xml")
+
+    def serialize(self, tree):
+        if tree.getroot() is None:
+            return b""
+        return etree.tostring(tree)
+
+    def items(self, tree):
+        if tree.getroot() is None:
+            return []
+        return list(tree.iter('{*}item'))
+
+    def children(self, node):
+        if isinstance(node, etree._ElementTree):
+            root = node.getroot()
+            return [] if root is None else [root]
+        return list(node.iterchildren(etree.Element))
+
+    def local_name(self, node):
+        tag = node.tag
+        if tag[0] == '{':
+            return tag[tag.index('}') + 1:]
+        return tag
+
+    def prefix(self, node):
+        return node.prefix
+
+    def has_contents(self, node):
+        return bool(node.text) or len(node) > 0
+
+    def matches(self, node, name, attrs):
+        return _matches(self, node, name, attrs)
+
+    def _search_tags(self, names):
+        """Returns the tags to hand lxml to find names among descendants
+
+        lxml filters by local name in any namespace, so a prefixed name is
+        found wherever its prefix is declared, and _named then checks the
+        prefix each tag is written with, as bs4 does.
+        """
+        search_tags = self._search_tables.get(names)
+        if search_tags is not None:
+            return search_tags
+        search_tags = sorted(set('{*}' + name.split(':', 1)[-1] for name in names))
+        if len(self._search_tables) >= self.MAX_SEARCH_TABLES:
+            self._search_tables.clear()
+        self._search_tables[names] = search_tags
+        return search_tags
+
+    def _named(self, element, names):
+        """Returns the names element matches, by local name and by prefix:local name"""
+        tag = element.tag
+        if tag[0] != '{':
+            return (tag,) if tag in names else ()
+        local_name = tag[tag.index('}') + 1:]
+        matched = (local_name,) if local_name in names else ()
+        prefix = element.prefix
+        if prefix:
+            qualified_name = "%s:%s" % (prefix, local_name)
+            if qualified_name in names:
+                matched += (qualified_name,)
+        return matched
+
+    def _descendants(self, node, tags):
+        if isinstance(node, etree._ElementTree):
+            if node.getroot() is None:
+                return iter(())
+            return node.iter(*tags)
+        return node.iterdescendants(*tags)
+
+    def collect(self, node, names, tags=None):
+        """Groups tags by the names they match, keeping document order
+
+        A prefixed name matches the tags written with that prefix, wherever
+        it is declared. When walking the descendants of node lxml filters
+        them by local name in C, so only the candidate tags ever reach Python.
+        """
+        if tags is None:
+            tags = self._descendants(node, self._search_tags(names))
+        found = {}
+        for element in tags:
+            for name in self._named(element, names):
+                found.setdefault(name, []).append(element)
+        return found
+
+    def find(self, node, name):
+        for element in self._iter_named(node, name):
+            return element
+        return None
+
+    def find_all(self, node, name):
+        return list(self._iter_named(node, name))
+
+    def _iter_named(self, node, name):
+        names = frozenset([name])
+        for element in self._descendants(node, self._search_tags(names)):
+            if self._named(element, names):
+                yield element
+
+    def get(self, node, attribute):
+        return node.get(attribute)
+
+    def string(self, node):
+        """Mirrors bs4's Tag.string: the only string inside node or None"""
+        if len(node) == 0:
+            return node.text
+        if len(node) == 1 and not node.text and not node[0].tail:
+            child = node[0]
+            if child.tag is etree.Comment:
+                return child.text
+            return self.string(child)
+        return None
+
+
+def _matches(engine, node, name, attrs):
+    """Matches a tag by name the way bs4's find() does, prefix included"""
+    local_name = engine.local_name(node)
+    if local_name != name:
+        prefix = engine.prefix(node)
+        if not prefix or "%s:%s" % (prefix, local_name) != name:
+            return False
+    for key, value in attrs.items():
+        if engine.get(node, key) != value:
+            return False
+    return True
+
+
+ENGINES = {
+    SoupEngine.name: SoupEngine(),
+    LxmlEngine.name: LxmlEngine(),
+}
+
+
+def get_engine(engine):
+    """Returns the engine registered under name, or engine itself"""
+    if not isinstance(engine, str):
+        return engine
+    try:
+        return ENGINES[engine]
+    except KeyError:
+        raise ValueError("Unknown engine %r, expected one of %s" % (
+            engine, ", ".join(sorted(ENGINES))))
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""Parses the items of a single large feed across a pool of processes
+
+The scanner finds the byte range of every item without parsing the feed.
+Consecutive items are cut into byte ranges, about four per worker so
+that they even out. Each worker parses a chunk on its own, wrapped in the
+start tags of the elements items sit in, such as rss and channel, so the
+namespaces declared on any of them still apply. Workers send back the
+state of a CompactItem per item rather than Items holding their parse
+tree. The channel is parsed in this process from the feed with
+its items cut out, and the items are put back in document order.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import os
+
+from pyPodcastParser.CompactItem import CompactItem
+from pyPodcastParser.engines import get_engine
+from pyPodcastParser.Item import Item
+from pyPodcastParser.ParseStats import ParseStats
+from pyPodcastParser.Podcast import Podcast
+from pyPodcastParser.polling import take_new_items
+from pyPodcastParser import scanner
+
+#: Number of chunks of items made per worker by default
+CHUNKS_PER_WORKER = 4
+
+#: Smallest size in bytes of the chunks made by default
+MIN_CHUNK_SIZE = 1 << 16
+
+
+def item_chunks(bounds, chunk_size):
+    """Groups consecutive items into byte ranges of about chunk_size bytes
+
+    Args:
+        bounds (list): (start, end) of every item in document order, see scanner.item_bounds
+        chunk_size (int): Size in bytes past which a chunk is closed
+
+    Returns:
+        list: (start, end) of every chunk, from the start of its first item
+            to the end of its last one
+    """
+    chunks = []
+    chunk_start = None
+    for start, end in bounds:
+        if chunk_start is None:
+            chunk_start = start
+        if end - chunk_start >= chunk_size:
+            chunks.append((chunk_start, end))
+            chunk_start = None
+    if chunk_start is not None:
+        chunks.append((chunk_start, bounds[-1][1]))
+    return chunks
+
+
+def parse_item_chunk(chunk, item_options, record_stats=False):
+    """Parses a wrapped chunk of items into the states of their CompactItems
+
+    Args:
+        chunk (bytes): Items in the elements they sit in in their feed, see scanner.wrap_items
+        item_options (dict): Keyword arguments for each Item
+        record_stats (bool): Time the Item phases into a ParseStats
+
+    Returns:
+        tuple: The list of states, see CompactItem.from_state, and the ParseStats or None
+    """
+    engine = get_engine(item_options.get('engine', "bs4"))
+    stats = ParseStats() if record_stats else None
+    tree = engine.parse(chunk)
+    states = [Item(node, stats=stats, **item_options).freeze().__getstate__()
+              for node in engine.items(tree)]
+    return states, stats
+
+
+def parse_podcast(data, workers=None, chunk_size=None, **options):
+    """Parses a feed with its items parsed in a pool of processes
+
+    items is a list of CompactItems, in document order, whatever
+    compact_items and lazy_items are. The parse tree only holds the channel.
+    With stats, the Item phases of all the workers are added up into it.
+
+    Args:
+        data (bytes): The feed, or any bytes like object such as an mmap
+        workers (int): Number of processes, os.cpu_count() by default. With 1 items are parsed in this process
+        chunk_size (int): Size in bytes of the chunks of items sent to a worker at a time.
+            By default the items are cut into CHUNKS_PER_WORKER chunks per worker
+        **options: Other keyword arguments of Podcast, such as engine, fields or stop_at_guids
+
+    Returns:
+        Podcast
+
+    Raises:
+        ValueError: For the options parallel parsing can't honor, tree and pre_set_items=False
+    """
+    if options.get('tree') is not None:
+        raise ValueError("tree can't be given to a parallel parse")
+    if not options.get('pre_set_items', True):
+        raise ValueError("pre_set_items=False can't be given to a parallel parse")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1, got %r" % (chunk_size,))
+    stats_callback = options.get('stats')
+    if stats_callback is not None and not isinstance(stats_callback, ParseStats):
+        options['stats'] = ParseStats()
+    else:
+        stats_callback = None
+
+    bounds = list(scanner.item_bounds(data))
+    channel = []
+    position = 0
+    for start, end in bounds:
+        channel.append(data[position:start])
+        position = end
+    channel.append(data[position:])
+    channel = b"".join(channel)
+    podcast = Podcast(channel, **options)
+    podcast.feed_content = data
+    if podcast.stats is not None:
+        podcast.stats.bytes_in += len(data) - len(channel)
+    if podcast.channel_only or not bounds:
+        if stats_callback is not None:
+            stats_callback(podcast.stats)
+        return podcast
+
+    if chunk_size is None:
+        chunk_size = max((bounds[-1][1] - bounds[0][0]) // (workers * CHUNKS_PER_WORKER),
+                         MIN_CHUNK_SIZE)
+    start_tags, end_tags = scanner.item_ancestors(data, bounds[0][0])
+    encoding = scanner.xml_encoding(data)
+    chunks = (scanner.wrap_items(data[start:end], start_tags, end_tags, encoding)
+              for start, end in item_chunks(bounds, chunk_size))
+    item_options = {
+        'engine': options.get('engine', "bs4"),
+        'text_extractor': options.get('text_extractor', "bs4"),
+        'fields': podcast.item_options['fields'],
+        'extra_fields': podcast.item_options['extra_fields'],
+    }
+    record_stats = podcast.stats is not None
+    if workers <= 1:
+        podcast.items = _collect_items(
+            podcast, (parse_item_chunk(chunk, item_options, record_stats) for chunk in chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(parse_item_chunk, chunks,
+                                   repeat(item_options), repeat(record_stats))
+            podcast.items = _collect_items(podcast, results)
+    if podcast.fields is None or 'is_valid_podcast' in podcast.fields:
+        podcast.run_setter('set_is_valid_podcast')
+    if stats_callback is not None:
+        stats_callback(podcast.stats)
+    return podcast
+
+
+def _collect_items(podcast, results):
+    """Returns the CompactItems of the results of the chunks, in order"""
+    items = _items(podcast, results)
+    if podcast.is_known is not None:
+        items = take_new_items(items, podcast.is_known, podcast.scan_past_known)
+    return list(items)
+
+
+def _items(podcast, results):
+    for states, stats in results:
+        if stats is not None:
+            podcast.stats.merge(stats)
+        for state in states:
+            yield CompactItem.from_state(state)
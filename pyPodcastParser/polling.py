@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Stops reading a feed's items once it reaches the ones already seen
+
+Feeds list their newest items first, so when polling one again only the
+items before the first known one are new. A few more items can be looked
+at past it for feeds that are slightly out of order.
+"""
+
+
+def known_item_test(stop_at_guids):
+    """Returns a function telling whether an item is already known
+
+    Args:
+        stop_at_guids: A container of known guids and enclosure urls, or a
+            callable taking an item and returning True when it is known
+
+    Returns:
+        callable: Takes an item and returns a bool
+    """
+    if callable(stop_at_guids):
+        return stop_at_guids
+
+    def is_known(item):
+        if item.guid is not None and item.guid in stop_at_guids:
+            return True
+        return item.enclosure_url is not None and item.enclosure_url in stop_at_guids
+    return is_known
+
+
+def take_new_items(items, is_known, scan_past_known=0):
+    """Yields the items that aren't known, stopping at the first known one
+
+    Args:
+        items: Iterable of items, newest first. Only the ones needed are taken from it
+        is_known (callable): Tells whether an item is already known, see known_item_test
+        scan_past_known (int): Number of items to look at past the first known one.
+            Known ones among them are skipped and new ones yielded
+    """
+    remaining = None
+    for item in items:
+        if remaining is not None:
+            remaining -= 1
+        if is_known(item):
+            if remaining is None:
+                remaining = scan_past_known
+        else:
+            yield item
+        if remaining is not None and remaining <= 0:
+            return
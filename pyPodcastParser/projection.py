@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Works out what to run for a projection, the set of fields a caller wants
+
+Podcast and Item both map each public attribute to the set_* method that
+sets it in ATTRIBUTE_SETTERS, and to the attributes that setter reads in
+ATTRIBUTE_DEPENDENCIES, like description for description_text. Only the
+setters of the wanted fields and of what they read are run, the other
+attributes are left None.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def resolve_fields(owner, fields):
+    """Returns the setters to run for fields of owner and the attributes left out
+
+    Args:
+        owner: Podcast or Item
+        fields (frozenset): Names of public attributes of owner
+
+    Returns:
+        tuple: The setter names in the order to run them, dependencies first,
+            and the names of the attributes none of them sets
+
+    Raises:
+        ValueError: When a field is not a public attribute of owner
+    """
+    unknown = sorted(fields.difference(owner.ATTRIBUTE_SETTERS))
+    if unknown:
+        raise ValueError("Unknown %s fields: %s" % (owner.__name__, ", ".join(unknown)))
+    setters = []
+
+    def add(name):
+        for dependency in owner.ATTRIBUTE_DEPENDENCIES.get(name, ()):
+            add(dependency)
+        setter = owner.ATTRIBUTE_SETTERS[name]
+        if setter not in setters:
+            setters.append(setter)
+
+    for name in sorted(fields):
+        add(name)
+    left_out = tuple(sorted(name for name, setter in owner.ATTRIBUTE_SETTERS.items()
+                            if setter not in setters))
+    return tuple(setters), left_out
+
+
+def projected_keys(keys, fields):
+    """Returns the keys of a to_dict in fields, all of them when fields is None"""
+    if fields is None:
+        return keys
+    return _projected_keys(keys, fields)
+
+
+@lru_cache(maxsize=256)
+def _projected_keys(keys, fields):
+    return tuple(key for key in keys if key in fields)
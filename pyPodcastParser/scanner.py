@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""Finds item tags in the raw text of a feed without parsing it
+
+The scanner skips comments, CDATA sections and processing instructions,
+so an <item> that only appears inside one of them is not mistaken for a
+real one. Tags are matched on their local name like bs4 does, so
+<item> and <rss:item> are both items. Feeds can be str or bytes in any
+ASCII compatible encoding.
+"""
+from html import unescape
+import re
+
+_ITEM_START = r"""
+    <!--.*?(?:-->|\Z)                       # comment
+  | <!\[CDATA\[.*?(?:\]\]>|\Z)              # cdata
+  | <\?.*?(?:\?>|\Z)                        # processing instruction
+  | (?P<item><(?:[A-Za-z_][\w.-]*:)?item(?=[\s/>]))
+"""
+
+_TEXT_ITEM_START = re.compile(_ITEM_START, re.DOTALL | re.VERBOSE)
+_BYTES_ITEM_START = re.compile(_ITEM_START.encode('ascii'), re.DOTALL | re.VERBOSE)
+
+
+# Every alternative starts with <, which is left out front so that the
+# regex engine can skip to the next < quickly
+_ITEM_BOUNDS = r"""
+    <(?:
+        !--.*?(?:-->|\Z)                     # comment
+      | !\[CDATA\[.*?(?:\]\]>|\Z)            # cdata
+      | \?.*?(?:\?>|\Z)                      # processing instruction
+      | (?P<start>(?:[A-Za-z_][\w.-]*:)?item(?:[\s/][^>]*)?>)
+      | (?P<end>/(?:[A-Za-z_][\w.-]*:)?item\s*>)
+    )
+"""
+
+_ITEM_FIELDS = r"""
+    <(?:
+        !--.*?(?:-->|\Z)                     # comment
+      | !\[CDATA\[.*?(?:\]\]>|\Z)            # cdata
+      | (?:[A-Za-z_][\w.-]*:)?(?P<tag>guid|pubDate)(?:\s[^>]*)?>
+        (?P<value>(?:<!\[CDATA\[.*?\]\]>|[^<])*)
+    )
+"""
+
+_ROOT_START = r"""
+    <!--.*?(?:-->|\Z)                       # comment
+  | <\?.*?(?:\?>|\Z)                        # processing instruction
+  | <!DOCTYPE(?:[^>[]|\[.*?\])*>             # doctype
+  | (?P<root><(?P<name>[A-Za-z_][\w.:-]*)(?:\s[^>]*)?>)
+"""
+
+# Attribute values are matched whole, so a > quoted in one doesn't end the tag
+_TAGS = r"""
+    <(?:
+        !--.*?(?:-->|\Z)                     # comment
+      | !\[CDATA\[.*?(?:\]\]>|\Z)            # cdata
+      | \?.*?(?:\?>|\Z)                      # processing instruction
+      | !DOCTYPE(?:[^>[]|\[.*?\])*>          # doctype
+      | /(?P<end>[A-Za-z_][\w.:-]*)\s*>
+      | (?P<start>[A-Za-z_][\w.:-]*)(?:\s(?:"[^"]*"|'[^']*'|[^>"'/]|/(?!>))*)?(?P<empty>/)?>
+    )
+"""
+
+_ENCODING = r"""^\s*<\?xml[^>]*?encoding\s*=\s*["']([A-Za-z0-9._-]+)["']"""
+
+_CDATA = r"<!\[CDATA\[(.*?)\]\]>"
+
+
+def _compile(pattern, flags=re.DOTALL | re.VERBOSE):
+    return re.compile(pattern, flags), re.compile(pattern.encode('ascii'), flags)
+
+
+_ITEM_START_PATTERNS = (_TEXT_ITEM_START, _BYTES_ITEM_START)
+_ITEM_BOUNDS_PATTERNS = _compile(_ITEM_BOUNDS)
+_ITEM_FIELDS_PATTERNS = _compile(_ITEM_FIELDS)
+_ROOT_START_PATTERNS = _compile(_ROOT_START)
+_TAGS_PATTERNS = _compile(_TAGS)
+_ENCODING_PATTERNS = _compile(_ENCODING, 0)
+_CDATA_PATTERNS = _compile(_CDATA, re.DOTALL)
+
+
+def _pattern(feed_content, patterns=_ITEM_START_PATTERNS):
+    """Returns the str pattern of patterns for a str feed_content, its bytes pattern otherwise"""
+    if isinstance(feed_content, str):
+        return patterns[0]
+    return patterns[1]
+
+
+def find_item_start(feed_content, position=0):
+    """Returns the offset of the first item start tag at or after position
+
+    Args:
+        feed_content (str or bytes): The xml of a feed, or any bytes like object
+        position (int): Offset to start scanning from
+
+    Returns:
+        int: Offset of the < of the tag, or -1 when there is none
+    """
+    for match in _pattern(feed_content).finditer(feed_content, position):
+        if match.group('item') is not None:
+            return match.start()
+    return -1
+
+
+def channel_head(feed_content):
+    """Returns feed_content up to its first item, or all of it when it has none
+
+    Parsers recovering from the cut close the open channel and rss tags.
+    """
+    if feed_content is None:
+        return None
+    item_start = find_item_start(feed_content)
+    if item_start < 0:
+        return feed_content
+    return feed_content[:item_start]
+
+
+def xml_encoding(feed_content):
+    """Returns the encoding named by the xml declaration, "utf-8" without one"""
+    match = _pattern(feed_content, _ENCODING_PATTERNS).match(feed_content[:200])
+    if match is None:
+        return "utf-8"
+    encoding = match.group(1)
+    if not isinstance(encoding, str):
+        encoding = encoding.decode('ascii')
+    return encoding.lower()
+
+
+def root_start_tag(feed_content):
+    """Returns the offsets of the start tag of the root element and its name
+
+    Args:
+        feed_content (str or bytes): The xml of a feed, or any bytes like object
+
+    Returns:
+        tuple: (start, end, name) with name as found in feed_content, or None without a root element
+    """
+    for match in _pattern(feed_content, _ROOT_START_PATTERNS).finditer(feed_content):
+        if match.group('root') is not None:
+            return match.start(), match.end(), match.group('name')
+    return None
+
+
+def open_elements(feed_content, position):
+    """Returns the offsets and names of the start tags of the elements open at position
+
+    Args:
+        feed_content (bytes): The xml of a feed, or any bytes like object
+        position (int): Offset in feed_content, such as the start of an item
+
+    Returns:
+        list: (start, end, name) of every open element, outermost first
+    """
+    elements = []
+    for match in _pattern(feed_content, _TAGS_PATTERNS).finditer(feed_content, 0, position):
+        name = match.group('start')
+        if name is not None:
+            if match.group('empty') is None:
+                elements.append((match.start(), match.end(), name))
+            continue
+        name = match.group('end')
+        if name is None:
+            continue
+        # A stray end tag closes the innermost element of its name, if any
+        for depth in range(len(elements) - 1, -1, -1):
+            if elements[depth][2] == name:
+                del elements[depth:]
+                break
+    return elements
+
+
+def item_ancestors(feed_content, position):
+    """Returns the start tags of the elements an item sits in and their end tags
+
+    The start tags are copied as they are, with every namespace they
+    declare, so that items wrapped in them mean the same as in the feed,
+    see wrap_items.
+
+    Args:
+        feed_content (bytes): The xml of a feed, or any bytes like object
+        position (int): Offset of the start tag of the item
+
+    Returns:
+        tuple: (start_tags, end_tags) as bytes, b"<rss><channel>" and
+            b"</channel></rss>" when the item is in no element
+    """
+    elements = open_elements(feed_content, position)
+    if not elements:
+        return b"<rss><channel>", b"</channel></rss>"
+    start_tags = b"".join(bytes(feed_content[start:end]) for start, end, name in elements)
+    end_tags = b"".join(b"</" + bytes(name) + b">" for start, end, name in reversed(elements))
+    return start_tags, end_tags
+
+
+def wrap_items(items_bytes, start_tags, end_tags, encoding):
+    """Returns the bytes of items as a feed of their own, in the elements they sit in
+
+    Args:
+        items_bytes (bytes): Consecutive items cut out of a feed
+        start_tags (bytes): Start tags of the elements the items sit in, see item_ancestors
+        end_tags (bytes): End tags of those elements
+        encoding (str): Encoding of the feed
+
+    Returns:
+        bytes
+    """
+    declaration = ('<?xml version="1.0" encoding="%s"?>' % encoding).encode('ascii')
+    return b"".join([declaration, start_tags, items_bytes, end_tags])
+
+
+def _text(value, encoding):
+    """Returns the text of the raw content of a tag, like the string the parsers give"""
+    if not isinstance(value, str):
+        value = value.decode(encoding, 'replace')
+    parts = []
+    position = 0
+    for match in _CDATA_PATTERNS[0].finditer(value):
+        parts.append(unescape(value[position:match.start()]))
+        parts.append(match.group(1))
+        position = match.end()
+    parts.append(unescape(value[position:]))
+    return "".join(parts).strip() or None
+
+
+def item_bounds(feed_content):
+    """Yields the offsets of every item in a single pass
+
+    Args:
+        feed_content (str or bytes): The xml of a feed, or any bytes like object
+
+    Yields:
+        tuple: (start, end) with start the offset of the < of the item start
+            tag and end the offset just past its end tag
+    """
+    start = None
+    for match in _pattern(feed_content, _ITEM_BOUNDS_PATTERNS).finditer(feed_content):
+        if match.group('start') is not None:
+            if start is not None:
+                # An unclosed item ends where the next one starts
+                yield start, match.start()
+            start = match.start()
+            start_tag = match.group('start')
+            if start_tag.endswith('/>' if isinstance(start_tag, str) else b'/>'):
+                yield start, match.end()
+                start = None
+        elif match.group('end') is not None and start is not None:
+            yield start, match.end()
+            start = None
+    if start is not None:
+        yield start, len(feed_content)
+
+
+def scan_items(feed_content, encoding=None):
+    """Yields the offsets, guid and pubDate of every item in a single pass
+
+    Args:
+        feed_content (str or bytes): The xml of a feed, or any bytes like object
+        encoding (str): Encoding of the text of bytes, the declared one by default
+
+    Yields:
+        tuple: (start, end, guid, published_date) with start and end as
+            item_bounds gives them. guid and published_date are stripped
+            str, or None when missing
+    """
+    if encoding is None and not isinstance(feed_content, str):
+        encoding = xml_encoding(feed_content)
+    fields_pattern = _pattern(feed_content, _ITEM_FIELDS_PATTERNS)
+    for start, end in item_bounds(feed_content):
+        yield _item_entry(feed_content, fields_pattern, start, end, encoding)
+
+
+def _item_entry(feed_content, fields_pattern, start, end, encoding):
+    values = {}
+    for match in fields_pattern.finditer(feed_content, start, end):
+        tag = match.group('tag')
+        if tag is None:
+            continue
+        if not isinstance(tag, str):
+            tag = tag.decode('ascii')
+        if tag not in values:
+            values[tag] = _text(match.group('value'), encoding)
+            if len(values) == 2:
+                break
+    return start, end, values.get('guid'), values.get('pubDate')
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""Extractors turning the html of a field into the text of its *_text twin
+
+Each extractor takes the markup of a field and returns its text the way
+BeautifulSoup(markup, "html.parser").get_text(" ", strip=True) does: every
+string between tags is stripped, empty ones are dropped and the rest are
+joined with a single space.
+"""
+import html
+import re
+
+from bs4 import BeautifulSoup
+from bs4.dammit import EntitySubstitution
+
+# Markup as html.parser finds it. A start tag is matched the way
+# html.parser locates one, and taken whole so that the regex can't
+# backtrack into a shorter one. The leading lookahead lets re skip to the
+# next < instead of trying every alternative at every character
+_MARKUP = re.compile(r"""
+  (?=<)(?:
+    <!--.*?--\s*>                                   # comment
+  | (?P<cdata_section><!\[CDATA\[(?P<cdata>.*?)\]\s*\]\s*>)
+                                                    # cdata, its text is kept
+  | (?P<empty></>)                                  # empty end tag, dropped without a break
+  | </[^>]*>                                        # end tag
+  | (?P<plain><(?P<plain_tag>[a-zA-Z][a-zA-Z0-9]*)
+    (?:[ \t\n\r\f]+[a-zA-Z_:][-a-zA-Z0-9_:.]*(?:[ \t\n\r\f]*=[ \t\n\r\f]*(?:"[^"]*"|'[^']*'))?)*
+    [ \t\n\r\f]*(?P<plain_tag_end>/?>))             # start tag with only quoted values
+  | (?P<start><(?=(?P<start_tag>
+        (?P<tag>[a-zA-Z][^\t\n\r\f\ />\x00]*)
+        (?:[\s/]*
+          (?:(?<=['"\s/])[^\s/>][^\s/=>]*
+            (?:\s*=+\s*(?:'[^']*'|"[^"]*"|(?!['"])[^>\s]*)\s*)?
+            (?:\s|/(?!>))*
+          )*
+        )?
+        \s*
+    ))(?P=start_tag)
+    (?:(?P<tag_end>/?>)                              # any other start tag
+      | (?=[^a-zA-Z=/>])))                           # broken start tag, kept as text
+  | <!(?!--|\[CDATA\[)[^>]*>                        # declaration
+  | <\?[^>]*>                                       # processing instruction
+  | (?P<unclosed><(?:!--|!\[CDATA\[|[a-zA-Z/!?]|\Z)) # any of the above left unclosed
+  )
+""", re.DOTALL | re.IGNORECASE | re.VERBOSE)
+
+# What follows the name of a tag ended by /> that html.parser takes as empty
+_EMPTY_TAG = re.compile(r"[\s/]*/\Z")
+
+# Content of script and style, up to their end tag, dropped
+_RAW_TEXT = {
+    'script': re.compile(r"</\s*script\s*>", re.IGNORECASE),
+    'style': re.compile(r"</\s*style\s*>", re.IGNORECASE),
+}
+
+_LETTERS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+# A character reference by number as html.parser needs it, with the
+# character that ends it
+_NUMBER = re.compile(r"&#(?:[0-9]+|[xX][0-9a-fA-F]+)[^0-9a-fA-F]")
+
+
+# References as html.parser reads them: a name or number ended by ; or by
+# any other character that can't continue it. _LAST_REFERENCE is for the
+# end of the markup, where html.parser needs the ; to tell the reference is over
+_REFERENCE = r"""
+    &(?:
+        \#(?P<number>[0-9]+(?:;|(?=[^0-9a-fA-F]%(end)s))|[xX][0-9a-fA-F]+(?:;|(?=[^0-9a-fA-F]%(end)s)))
+      | (?P<name>[a-zA-Z][-.a-zA-Z0-9]*)(?:;|(?=[^a-zA-Z0-9]%(end)s))
+    )
+"""
+
+_INNER_REFERENCE = re.compile(_REFERENCE % {'end': r"|\Z"}, re.VERBOSE)
+_LAST_REFERENCE = re.compile(_REFERENCE % {'end': ""}, re.VERBOSE)
+
+
+def _decode_reference(match):
+    name = match.group('name')
+    if name is None:
+        reference = match.group(0)
+        # html.unescape drops the control characters bs4 keeps
+        return (html.unescape(reference if reference[-1] == ';' else reference + ';')
+                or chr(int(reference.strip('&#xX;'), 16 if reference[2] in 'xX' else 10)))
+    character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+    if character is None:
+        return "&" + name
+    return character
+
+
+def _unescape(string, reference=_INNER_REFERENCE):
+    """Decodes the character references of string the way bs4's html.parser tree builder does
+
+    Named references are looked up in the table of the installed bs4,
+    without a ; too, and an unknown one loses its ;.
+    """
+    if '&' not in string:
+        return string
+    return reference.sub(_decode_reference, string)
+
+
+def soup_text(markup):
+    """Extracts text by building an html.parser soup of markup"""
+    return BeautifulSoup(markup, "html.parser").get_text(" ", strip=True)
+
+
+def html_to_text(markup):
+    """Extracts text by stripping tags with a regex and decoding entities
+
+    Gives the same text as soup_text without building a tree, following
+    html.parser's recovery from broken markup too: an empty end tag </> is
+    dropped without breaking the text, anything it can't find the end of,
+    such as an unclosed comment or cdata section, is kept as text up to
+    the next >, and a &# that doesn't start a number keeps the rest of
+    markup as text once html.parser has stopped there. That recovery is
+    the one of Python 3.11's html.parser. Later Python releases changed
+    some of it, and there soup_text can differ on such broken markup.
+    """
+    if markup is None:
+        return None
+    strings = []
+    string = []
+    # Set once html.parser would have stopped and resumed, as it does at
+    # the end of the markup, after which a bad &# ends the parse
+    resumed = False
+    position = 0
+    length = len(markup)
+    while position < length:
+        match = _MARKUP.search(markup, position)
+        end = length if match is None else match.start()
+        number = markup.find('&#', position, end)
+        while number >= 0 and _NUMBER.match(markup, number):
+            number = markup.find('&#', number + 2, end)
+        if number >= 0:
+            string.append(_unescape(markup[position:number]))
+            if resumed or markup.find(';', number) < 0:
+                string.append(markup[number:])
+                break
+            string.append("&#")
+            resumed = True
+            position = number + 2
+            continue
+        if match is None:
+            string.append(_last_text(markup[position:]))
+            break
+        if end > position:
+            string.append(_unescape(markup[position:end]))
+        position = match.end()
+        kind = match.lastgroup
+        if kind == 'empty':
+            continue
+        if kind == 'start' and not match.group('tag_end'):
+            string.append(markup[end:position])
+            continue
+        if kind == 'unclosed':
+            position = markup.find('>', end + 1) + 1
+            if not position:
+                position = markup.find('<', end + 1)
+                if position < 0:
+                    position = end + 1
+            string.append(markup[end:position])
+            resumed = True
+            continue
+        if string:
+            text = "".join(string).strip()
+            if text:
+                strings.append(text)
+            string = []
+        if kind == 'cdata_section':
+            cdata = match.group('cdata').strip()
+            if cdata:
+                strings.append(cdata)
+        elif kind is not None and markup[end + 1] in 'sS':
+            raw_text = _raw_text(match, kind)
+            if raw_text is not None:
+                raw_end = raw_text.search(markup, position)
+                if raw_end is None:
+                    break
+                position = raw_end.start()
+    text = "".join(string).strip()
+    if text:
+        strings.append(text)
+    return " ".join(strings)
+
+
+def _raw_text(match, kind):
+    """Returns the end of the content html.parser skips after a script or style start tag, or None"""
+    if kind == 'plain':
+        tag, tag_end = match.group('plain_tag'), match.group('plain_tag_end')
+    else:
+        tag, tag_end = match.group('tag'), match.group('tag_end')
+        if _EMPTY_TAG.match(match.string, match.start('tag') + len(tag), match.end() - 1):
+            return None
+    if tag_end != ">":
+        return None
+    return _RAW_TEXT.get(tag.lower())
+
+
+def _last_text(string):
+    """Decodes the text ending markup, where html.parser drops the & of a lone &X"""
+    text = _unescape(string, _LAST_REFERENCE)
+    if string[-2:-1] == '&' and string[-1] in _LETTERS:
+        return text[:-2] + text[-1]
+    return text
+
+
+TEXT_EXTRACTORS = {
+    "bs4": soup_text,
+    "fast": html_to_text,
+}
+
+
+def get_text_extractor(text_extractor):
+    """Returns the extractor registered under name, or text_extractor itself"""
+    if callable(text_extractor):
+        return text_extractor
+    try:
+        return TEXT_EXTRACTORS[text_extractor]
+    except KeyError:
+        raise ValueError("Unknown text extractor %r, expected one of %s" % (
+            text_extractor, ", ".join(sorted(TEXT_EXTRACTORS))))
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Writes parsed feeds out as JSON or NDJSON, one item at a time
+
+Only a single item dict is built at any time, so writing a feed costs
+no more memory than the feed itself. A podcast here is a Podcast, a
+CompactPodcast or the dict their to_dict() returns.
+
+NDJSON records are envelopes, one per line:
+
+    {"type": "channel", "feed": feed, "data": channel}
+    {"type": "item", "feed": feed, "data": item}
+    {"type": "error", "feed": feed, "data": {"error": message}}
+
+where channel has the keys of Podcast.to_dict() but items, item those of
+Item.to_dict() and feed is whatever identifies the feed to the caller.
+"""
+import json
+
+_JSON = json.JSONEncoder()
+
+_NDJSON = json.JSONEncoder(separators=(',', ':'))
+
+
+def _records(podcast):
+    """Returns the channel dict of podcast, items left empty, and its item dicts"""
+    if isinstance(podcast, dict):
+        channel = dict(podcast, items=[])
+        return channel, iter(podcast['items'])
+    item_dicts = (item.to_dict() for item in podcast.get_items())
+    return podcast.channel_dict(), item_dicts
+
+
+def write_json(podcast, fp):
+    """Writes podcast to the text file fp as json.dumps(podcast.to_dict()) would"""
+    channel, item_dicts = _records(podcast)
+    fp.write('{')
+    for index, (key, value) in enumerate(channel.items()):
+        if index:
+            fp.write(', ')
+        fp.write(_JSON.encode(key))
+        fp.write(': ')
+        if key != 'items':
+            fp.write(_JSON.encode(value))
+            continue
+        fp.write('[')
+        for item_index, item_dict in enumerate(item_dicts):
+            if item_index:
+                fp.write(', ')
+            fp.write(_JSON.encode(item_dict))
+        fp.write(']')
+    fp.write('}')
+
+
+def write_ndjson(podcast, fp, feed=None):
+    """Writes the channel record and then an item record per item of podcast to fp"""
+    NDJSONSink(fp).write(podcast, feed)
+
+
+class NDJSONSink(object):
+    """Writes the records of many feeds to a single NDJSON text file
+
+    Args:
+        fp: A text file
+
+    Attributes:
+        fp: The text file written to
+        feed_count (int): Number of feeds written, errors included
+        record_count (int): Number of lines written
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.feed_count = 0
+        self.record_count = 0
+
+    def _write_record(self, record_type, feed, data):
+        self.fp.write(_NDJSON.encode({'type': record_type, 'feed': feed, 'data': data}))
+        self.fp.write('\n')
+        self.record_count += 1
+
+    def write(self, podcast, feed=None):
+        """Writes the channel record and then an item record per item of podcast"""
+        channel, item_dicts = _records(podcast)
+        del channel['items']
+        self._write_record('channel', feed, channel)
+        for item_dict in item_dicts:
+            self._write_record('item', feed, item_dict)
+        self.feed_count += 1
+
+    def write_error(self, feed, error):
+        """Writes an error record for a feed that couldn't be parsed"""
+        self._write_record('error', feed, {'error': error})
+        self.feed_count += 1
+
+    def write_results(self, results):
+        """Writes the BatchResults of batch.parse_many, keyed by their index"""
+        for result in results:
+            if result.error is None:
+                self.write(result.podcast, result.index)
+            else:
+                self.write_error(result.index, result.error)
@@ -1,9 +1,34 @@
 # -*- coding: utf-8 -*-
+import calendar
+import copy
 import datetime
+import email.utils
+import gc
+import io
+import json
 import os
+import pickle
+import tempfile
+import tracemalloc
 import unittest
 
+from benchmarks import feeds as benchmark_feeds
+from benchmarks import run as benchmark_run
+
 from pyPodcastParser import Podcast
+from pyPodcastParser import batch
+from pyPodcastParser import columns
+from pyPodcastParser import dates
+from pyPodcastParser import engines
+from pyPodcastParser.CompactItem import CompactItem
+from pyPodcastParser.CompactPodcast import CompactPodcast
+from pyPodcastParser.FeedCache import FeedCache
+from pyPodcastParser.ItemIndex import ItemIndex
+from pyPodcastParser.ParseStats import ParseStats
+from pyPodcastParser import parallel
+from pyPodcastParser import scanner
+from pyPodcastParser import text
+from pyPodcastParser import writers
 
 # py.test test_pyPodcastParser.py
 
@@ -668,5 +693,1344 @@ class Test_Invalid_Feed(unittest.TestCase):
     def test_time_published(self):
         self.assertEqual(self.podcast.published_date, 'Mon, 24 Mar 2008')
 
+class Test_Single_Tree(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+
+    def test_full_soup_is_tree(self):
+        self.assertIs(self.podcast.full_soup, self.podcast.tree)
+        self.assertEqual(len(self.podcast.full_soup.findAll('item')), 4)
+
+    def test_soup_built_on_access(self):
+        self.assertIsNone(self.podcast._soup)
+        self.assertEqual(len(self.podcast.soup.findAll('item')), 0)
+        self.assertEqual(self.podcast.soup.find('url'), None)
+        self.assertIsNotNone(self.podcast._soup)
+
+    def test_channel_tags_skip_items(self):
+        names = [tag.name for tag in self.podcast.channel_tags]
+        self.assertFalse('item' in names)
+        self.assertFalse('url' in names)
+        self.assertTrue('title' in names)
+
+class Test_Engine_Equivalence(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        self.test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+
+    def podcast_values(self, podcast):
+        podcast_dict = podcast.to_dict()
+        for name in ('summary', 'time_published', 'date_time',
+                     'is_valid_rss', 'is_valid_podcast', 'itunes_keywords'):
+            podcast_dict[name] = getattr(podcast, name)
+        for item_dict, item in zip(podcast_dict['items'], podcast.items):
+            for name in ('categories', 'time_published', 'date_time'):
+                item_dict[name] = getattr(item, name)
+        return podcast_dict
+
+    def test_lxml_matches_bs4(self):
+        for feed_name in sorted(os.listdir(self.test_feeds_dir)):
+            feed_path = os.path.join(self.test_feeds_dir, feed_name)
+            with open(feed_path, "r") as feed_file:
+                feed_content = feed_file.read()
+            bs4_podcast = Podcast.Podcast(feed_content)
+            lxml_podcast = Podcast.Podcast(feed_content, engine="lxml")
+            self.assertEqual(self.podcast_values(bs4_podcast),
+                             self.podcast_values(lxml_podcast), feed_name)
+
+    def test_namespaces_declared_below_root(self):
+        feed = ('<rss><channel xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">'
+                '<title>Scoped</title><itunes:author>Au</itunes:author><itunes:block>yes</itunes:block>'
+                '<itunes:category text="Technology"/><itunes:explicit>yes</itunes:explicit>'
+                '<itunes:image href="https://example.com/i.png"/><itunes:keywords>a, b</itunes:keywords>'
+                '<itunes:new-feed-url>https://example.com/new</itunes:new-feed-url>'
+                '<itunes:owner><itunes:name>Owner</itunes:name></itunes:owner>'
+                '<item><title>Episode</title><itunes:author>Item author</itunes:author>'
+                '<itunes:duration xmlns:itunes="http://example.com/other">1:00</itunes:duration>'
+                '<enclosure url="https://example.com/1.mp3" type="audio/mpeg"/></item>'
+                '</channel></rss>')
+        bs4_podcast = Podcast.Podcast(feed)
+        self.assertEqual(bs4_podcast.itunes_author_name, "Au")
+        self.assertEqual(bs4_podcast.owner_name, "Owner")
+        self.assertEqual(bs4_podcast.items[0].itunes_duration, "1:00")
+        expected = self.podcast_values(bs4_podcast)
+        self.assertEqual(self.podcast_values(Podcast.Podcast(feed, engine="lxml")), expected)
+        parallel_podcast = parallel.parse_podcast(feed.encode("utf-8"), 1, engine="lxml")
+        self.assertEqual(self.podcast_values(parallel_podcast)['itunes_author_name'], "Au")
+        self.assertEqual(parallel_podcast.items[0].itunes_duration, "1:00")
+        stream = Podcast.Podcast.iter_items(io.BytesIO(feed.encode("utf-8")))
+        self.assertEqual([item.itunes_author_name for item in stream], ["Item author"])
+        stream_values = self.podcast_values(stream.podcast)
+        stream_values.pop('items')
+        expected.pop('items')
+        self.assertEqual(stream_values, expected)
+
+    def test_lxml_tree(self):
+        feed_path = os.path.join(self.test_feeds_dir, 'basic_podcast.rss')
+        with open(feed_path, "r") as feed_file:
+            podcast = Podcast.Podcast(feed_file.read(), engine="lxml")
+        self.assertEqual(podcast.engine.name, "lxml")
+        self.assertEqual(len(podcast.full_soup.findAll('item')), 4)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            Podcast.Podcast("<rss/>", engine="html5lib")
+
+class Test_Item_Stream(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        self.basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(self.basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+
+    def test_items_match_podcast(self):
+        items = list(Podcast.Podcast.iter_items(self.basic_podcast_path))
+        self.assertEqual([item.to_dict() for item in items],
+                         [item.to_dict() for item in self.podcast.items])
+
+    def test_channel_from_same_pass(self):
+        stream = Podcast.Podcast.iter_items(io.BytesIO(self.basic_podcast.encode("utf-8")))
+        for item in stream:
+            self.assertEqual(stream.podcast.title, "basic title")
+        podcast_dict = stream.podcast.to_dict()
+        expected_dict = self.podcast.to_dict()
+        self.assertEqual(podcast_dict.pop('items'), [])
+        expected_dict.pop('items')
+        self.assertEqual(podcast_dict, expected_dict)
+        self.assertEqual(stream.item_count, 4)
+        self.assertEqual(stream.podcast.is_valid_podcast, True)
+
+    def test_items_released(self):
+        stream = Podcast.Podcast.iter_items(self.basic_podcast_path)
+        yielded = []
+        for item in stream:
+            for earlier_item in yielded:
+                self.assertIsNone(earlier_item.soup.getparent())
+            yielded.append(item)
+        self.assertEqual(len(stream.podcast.engine.items(stream.podcast.tree)), 0)
+
+    def make_feed(self, count):
+        items = "".join('<item><guid>guid-%d</guid><title>item %d</title></item>' % (number, number)
+                        for number in range(count))
+        feed = u'<rss><channel><title>title</title>%s<ttl>60</ttl></channel></rss>' % items
+        return io.BytesIO(feed.encode('utf-8'))
+
+    def test_channel_read_so_far(self):
+        stream = Podcast.Podcast.iter_items(self.make_feed(10))
+        for item in stream:
+            podcast = stream.podcast
+            self.assertEqual(podcast.items, [])
+            self.assertEqual(podcast.title, 'title')
+            self.assertEqual(podcast.ttl, None)
+        self.assertEqual(stream.podcast.ttl, '60')
+        self.assertEqual(stream.item_count, 10)
+
+    def test_channel_at_known_item(self):
+        stream = Podcast.Podcast.iter_items(self.make_feed(10), stop_at_guids={'guid-6'})
+        self.assertEqual([item.guid for item in stream], ['guid-%d' % number for number in range(6)])
+        self.assertEqual(stream.item_count, 7)
+        self.assertEqual(stream.podcast.items, [])
+        self.assertEqual(stream.podcast.title, 'title')
+        self.assertEqual(stream.podcast.ttl, None)
+
+    def test_iterate_once(self):
+        stream = Podcast.Podcast.iter_items(self.basic_podcast_path)
+        self.assertEqual(len(list(stream)), 4)
+        self.assertRaises(ValueError, iter, stream)
+        self.assertEqual(stream.item_count, 4)
+
+    def test_empty_source(self):
+        stream = Podcast.Podcast.iter_items(io.BytesIO(b""))
+        self.assertEqual(list(stream), [])
+        self.assertEqual(stream.podcast.title, None)
+        self.assertEqual(stream.podcast.is_valid_podcast, False)
+
+class Test_Tag_Dispatch(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+
+    def test_item_tags(self):
+        for engine in ("bs4", "lxml"):
+            podcast = Podcast.Podcast(self.basic_podcast, engine=engine)
+            item = podcast.items[0]
+            self.assertEqual(len(item._find_all('category')), 2)
+            self.assertEqual(len(item._find_all('title')), 2)
+            self.assertEqual(len(item._find_all('itunes:title')), 1)
+            self.assertEqual(item._find('itunes:block'), None)
+
+    def test_channel_tags(self):
+        for engine in ("bs4", "lxml"):
+            podcast = Podcast.Podcast(self.basic_podcast, engine=engine)
+            self.assertEqual(len(podcast._find_all('itunes:category')), 2)
+            self.assertEqual(len(podcast._find_all('link', rel='buh')), 2)
+            self.assertEqual(len(podcast._find_all('item')), 0)
+
+class Test_Text_Extractor(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+
+    def test_fast_matches_bs4(self):
+        markups = [
+            "plain", "  padded  ", "", "a &amp; b", "&#169; &#x41;",
+            "<h1>A title with html</h1>", "<b>foo</b>bar", "a<!-- c -->b",
+            "<script>var x = '<b>';</script>after", "<style>p{}</style>after",
+            "x<![CDATA[in cdata]]>y", "<!DOCTYPE html><p>doc</p>", "a < b",
+            '<a title="x>y">quoted</a>', "<br/>line<br>two", "<p>unclosed",
+            "text with\nnewline <i>and</i>\n\n more", "&lt;b&gt;escaped&lt;/b&gt;",
+            "<<b>x</b>", "&nbsp;x&nbsp;", "<script>never closed",
+            # Broken markup, recovered from the way html.parser does
+            "a</>b", "<![CDATA[&copy<br/>&#0; </p>", "a<!-- never closed", "a<!-- x > b",
+            "<p\n=\"x\">y", "<a title=\"x>y", "<i'?>b", "<script/>after", "<style x='>'>s</style>t",
+            "x &#; <b>y</b> &#; <i>z</i>", "<!x", "a<", "&#xb;x",
+        ]
+        for markup in markups:
+            self.assertEqual(text.html_to_text(markup), text.soup_text(markup), markup)
+
+    def test_entities_match_bs4(self):
+        references = ["a&b", "&amp", "&ampx", "&lt3", "&foo;", "&#39", "&#x27", "AT&T",
+                      "&copy", "&copyx", "&notit;", "&notin", "a&", "&#;", "&AMP", "&Amp",
+                      "&eacute", "&#65x", "&#128;", "&a-b.c;", "&#39a", "Q&A", "&A"]
+        for reference in references:
+            for markup in ("%s y", "x %s y", "<p>%s</p>", "<b>%s<i>q</i></b>", "%s<br/>"):
+                markup = markup % reference
+                self.assertEqual(text.html_to_text(markup), text.soup_text(markup), markup)
+
+    def test_none(self):
+        self.assertEqual(text.html_to_text(None), None)
+
+    def test_items_match(self):
+        podcast = Podcast.Podcast(self.basic_podcast)
+        fast_podcast = Podcast.Podcast(self.basic_podcast, text_extractor="fast")
+        self.assertEqual(podcast.to_dict(), fast_podcast.to_dict())
+        self.assertEqual(fast_podcast.items[3].itunes_summary_text, "Summary with html In a table")
+
+    def test_unknown_extractor(self):
+        with self.assertRaises(ValueError):
+            Podcast.Podcast(self.basic_podcast, text_extractor="regex")
+
+class Test_Lazy_Items(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+        self.lazy_podcast = Podcast.Podcast(self.basic_podcast, lazy_items=True)
+
+    def test_computed_on_access(self):
+        item = self.lazy_podcast.items[1]
+        self.assertFalse('guid' in item.__dict__)
+        self.assertEqual(item.guid, 'another basic item guid')
+        self.assertTrue('guid' in item.__dict__)
+        self.assertFalse('title' in item.__dict__)
+
+    def test_text_not_stripped_with_its_twin(self):
+        item = self.lazy_podcast.items[3]
+        self.assertEqual(item.description, 'this is <a href="https://foo.bar">another basic item description</a>')
+        self.assertFalse('description_text' in item.__dict__)
+        self.assertEqual(item.description_text, "this is another basic item description")
+
+    def test_dates(self):
+        self.assertEqual(self.lazy_podcast.items[0].time_published, 1206107460)
+        self.assertEqual(self.lazy_podcast.items[0].date_time, self.podcast.items[0].date_time)
+
+    def test_to_dict(self):
+        self.assertEqual(self.lazy_podcast.to_dict(), self.podcast.to_dict())
+        self.assertEqual(self.lazy_podcast.is_valid_podcast, True)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.lazy_podcast.items[0].not_an_attribute
+        with self.assertRaises(AttributeError):
+            self.podcast.items[0].not_an_attribute
+
+class Test_Compact_Items(unittest.TestCase):
+    ITEM = u"""<item><title>Episode %d</title><guid>guid-%d</guid>
+<pubDate>Fri, 21 Mar 2008 09:51:00 EDT</pubDate>
+<enclosure url="http://example.com/%d.mp3" length="123456" type="audio/mpeg"/>
+<description>&lt;p&gt;Show notes&lt;/p&gt;</description></item>"""
+
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+        self.compact_podcast = Podcast.Podcast(self.basic_podcast, compact_items=True)
+
+    def test_same_values(self):
+        for item, compact_item in zip(self.podcast.items, self.compact_podcast.items):
+            for name in compact_item.FIELDS:
+                self.assertEqual(getattr(compact_item, name), getattr(item, name))
+            self.assertEqual(compact_item, item.compact())
+        self.assertEqual(self.compact_podcast.to_dict(), self.podcast.to_dict())
+        self.assertEqual(self.compact_podcast.is_valid_podcast, True)
+
+    def test_no_tree(self):
+        compact_item = self.compact_podcast.items[0]
+        self.assertFalse(hasattr(compact_item, '__dict__'))
+        self.assertFalse(hasattr(compact_item, 'soup'))
+        with self.assertRaises(AttributeError):
+            compact_item.title = compact_item.soup
+
+    def test_pickle(self):
+        compact_item = self.compact_podcast.items[2]
+        self.assertEqual(pickle.loads(pickle.dumps(compact_item)), compact_item)
+
+    def bytes_per_item(self, feed, **options):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            items = Podcast.Podcast(feed, **options).items
+            gc.collect()
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        return size / len(items)
+
+    def test_releases_tree(self):
+        items = "".join(self.ITEM % (number, number, number) for number in range(100))
+        feed = u"<rss><channel><title>title</title>%s</channel></rss>" % items
+        item_bytes = self.bytes_per_item(feed)
+        compact_item_bytes = self.bytes_per_item(feed, compact_items=True)
+        self.assertLess(compact_item_bytes * 3, item_bytes)
+
+class Test_Item_Sequence(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+        self.lazy_podcast = Podcast.Podcast(self.basic_podcast, False)
+
+    def test_validity_builds_first_item_only(self):
+        self.assertEqual(self.lazy_podcast.is_valid_podcast, True)
+        self.assertEqual(self.lazy_podcast.items.built_count, 1)
+        self.assertEqual(len(self.lazy_podcast.items), 4)
+
+    def test_built_once(self):
+        items = self.lazy_podcast.items
+        third = items[2]
+        self.assertIs(items[2], third)
+        self.assertIs(items[-2], third)
+        self.assertEqual(items.built_count, 2)
+        first_pass = list(self.lazy_podcast.get_items())
+        second_pass = list(self.lazy_podcast.get_items())
+        self.assertEqual(items.built_count, 4)
+        for first, second in zip(first_pass, second_pass):
+            self.assertIs(first, second)
+        self.assertEqual(items[1:3], first_pass[1:3])
+        with self.assertRaises(IndexError):
+            items[4]
+
+    def test_same_items(self):
+        self.assertEqual(self.lazy_podcast.to_dict(), self.podcast.to_dict())
+
+class Test_Parse_Many(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        self.feeds = []
+        for name in sorted(os.listdir(test_feeds_dir)):
+            with open(os.path.join(test_feeds_dir, name), "r") as feed_file:
+                self.feeds.append(feed_file.read())
+        self.feeds.insert(1, 42)
+
+    def check_results(self, results):
+        results = sorted(results)
+        self.assertEqual([result.index for result in results], list(range(len(self.feeds))))
+        self.assertEqual(results[1].podcast, None)
+        self.assertTrue(results[1].error.startswith("TypeError"))
+        for result, feed in zip(results, self.feeds):
+            if result.index == 1:
+                continue
+            self.assertEqual(result.error, None)
+            self.assertEqual(result.podcast, Podcast.Podcast(feed).freeze())
+
+    def test_in_process(self):
+        self.check_results(batch.parse_many(self.feeds, workers=1))
+
+    def test_pool(self):
+        self.check_results(batch.parse_many(iter(self.feeds), workers=2, chunksize=2))
+
+    def test_options(self):
+        results = batch.parse_many(self.feeds[:1], workers=2, engine="lxml")
+        self.assertEqual(next(results).podcast.to_dict(), Podcast.Podcast(self.feeds[0]).to_dict())
+
+
+class Test_Channel_Only(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+        self.channel = Podcast.Podcast.parse_channel(self.basic_podcast)
+
+    def test_no_items(self):
+        self.assertEqual(self.channel.items, [])
+        self.assertEqual(self.channel.is_valid_podcast, None)
+        self.assertEqual(self.channel.is_valid_rss, True)
+        self.assertEqual(self.channel.engine.items(self.channel.tree), [])
+
+    def test_channel_values(self):
+        podcast_dict = self.podcast.to_dict()
+        channel_dict = self.channel.to_dict()
+        del podcast_dict['items'], channel_dict['items']
+        self.assertEqual(channel_dict, podcast_dict)
+        self.assertEqual(self.channel.time_published, self.podcast.time_published)
+
+    def test_lxml_bytes(self):
+        channel = Podcast.Podcast(self.basic_podcast.encode('utf-8'), engine="lxml", channel_only=True)
+        self.assertEqual(channel.title, self.podcast.title)
+        self.assertEqual(channel.items, [])
+
+    def test_find_item_start(self):
+        feed = u"<rss><!-- <item> --><![CDATA[<item>]]><items/><rss:item><item>"
+        self.assertEqual(scanner.find_item_start(feed), feed.index(u"<rss:item>"))
+        self.assertEqual(scanner.find_item_start(feed.encode('utf-8')), feed.index(u"<rss:item>"))
+        self.assertEqual(scanner.find_item_start(feed, feed.index(u"<item>")), feed.index(u"<item>"))
+        self.assertEqual(scanner.find_item_start(u"<rss><!-- <item>"), -1)
+        self.assertEqual(scanner.channel_head(u"<rss></rss>"), u"<rss></rss>")
+
+class Test_Published_Dates(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+
+    def test_item_published_datetime(self):
+        published_datetime = self.podcast.items[0].published_datetime
+        self.assertEqual(published_datetime.utcoffset(), datetime.timedelta(hours=-4))
+        self.assertEqual(published_datetime.timestamp(), self.podcast.items[0].time_published)
+        self.assertEqual(self.podcast.published_datetime.timestamp(), 1206401407)
+
+    def test_variants(self):
+        expected = dates.parse_published_date("Fri, 21 Mar 2008 13:51:00 GMT")
+        self.assertEqual(expected.time_published, 1206107460)
+        for published_date in ("21 Mar 2008 13:51:00 GMT", "Fri, 21 Mar 08 13:51:00 +0000",
+                               "Friday, 21 Mar 2008 09:51 EDT", "Fri 21 Mar 2008 14:51:00 CET",
+                               "Fri, 21 Mar 2008 19:21:00 +05:30", "21 March 2008 13:51:00",
+                               "  Fri,21 mar 2008 13:51:00 Z  "):
+            published = dates.parse_published_date(published_date)
+            self.assertEqual(published.time_published, expected.time_published, published_date)
+            self.assertEqual(published.date_time, datetime.datetime(2008, 3, 21))
+        self.assertEqual(dates.parse_published_date("1 Jan 68 00:00:00 GMT").date_time.year, 2068)
+        self.assertEqual(dates.parse_published_date("1 Jan 69 00:00:00 GMT").date_time.year, 1969)
+
+    def test_time_out_of_range(self):
+        for published_date in ("Fri, 21 Mar 2008 23:59:60 +0000", "Fri, 21 Mar 2008 24:00:00 GMT",
+                               "21 Mar 2008 24:00 -0100"):
+            published = dates.parse_published_date(published_date)
+            # The same values as email.utils
+            self.assertEqual(published.time_published,
+                             email.utils.mktime_tz(email.utils.parsedate_tz(published_date)))
+            self.assertEqual(published.date_time, datetime.datetime(2008, 3, 21))
+            self.assertEqual(calendar.timegm(published.datetime.utctimetuple()),
+                             published.time_published)
+
+    def test_offset_out_of_range(self):
+        for published_date in ("Fri, 21 Mar 2008 09:51:00 +2500", "Fri, 21 Mar 2008 09:51:00 +9999",
+                               "Fri, 21 Mar 2008 24:00:00 -2400"):
+            published = dates.parse_published_date(published_date)
+            self.assertEqual(published.time_published,
+                             email.utils.mktime_tz(email.utils.parsedate_tz(published_date)))
+            self.assertEqual(published.date_time, datetime.datetime(2008, 3, 21))
+            self.assertEqual(published.datetime, None)
+        podcast = Podcast.Podcast("<rss><channel><item><pubDate>Fri, 21 Mar 2008 09:51:00 +2500"
+                                  "</pubDate></item></channel></rss>")
+        self.assertEqual(podcast.items[0].time_published, 1206003060)
+        self.assertEqual(podcast.items[0].date_time, datetime.datetime(2008, 3, 21))
+        self.assertEqual(podcast.items[0].published_datetime, None)
+
+    def test_unparsed(self):
+        for published_date in (None, "", "not a date", "2008-03-21"):
+            self.assertEqual(dates.parse_published_date(published_date), (None, None, None))
+        published = dates.parse_published_date("Fri, 31 Feb 2008 09:51:00 GMT")
+        self.assertEqual(published.date_time, None)
+        self.assertEqual(published.datetime, None)
+
+class Test_Stop_At_Guids(unittest.TestCase):
+    ITEM = u"""<item><title>Episode %d</title><guid>guid-%d</guid>
+<enclosure url="http://example.com/%d.mp3" length="123456" type="audio/mpeg"/></item>"""
+
+    def setUp(self):
+        items = "".join(self.ITEM % (number, number, number) for number in range(9, -1, -1))
+        self.feed = u"<rss><channel><title>title</title>%s</channel></rss>" % items
+
+    def titles(self, items):
+        return [item.title for item in items]
+
+    def test_stops_at_known_guid(self):
+        podcast = Podcast.Podcast(self.feed, stop_at_guids={'guid-6', 'guid-5'})
+        self.assertEqual(self.titles(podcast.items), ['Episode 9', 'Episode 8', 'Episode 7'])
+        self.assertEqual(podcast.title, 'title')
+
+    def test_enclosure_url_and_callable(self):
+        podcast = Podcast.Podcast(self.feed, stop_at_guids={'http://example.com/8.mp3'})
+        self.assertEqual(self.titles(podcast.items), ['Episode 9'])
+        podcast = Podcast.Podcast(self.feed, stop_at_guids=lambda item: item.guid == 'guid-7')
+        self.assertEqual(self.titles(podcast.items), ['Episode 9', 'Episode 8'])
+
+    def test_scan_past_known(self):
+        known = {'guid-7', 'guid-5', 'guid-1'}
+        podcast = Podcast.Podcast(self.feed, stop_at_guids=known, scan_past_known=3)
+        self.assertEqual(self.titles(podcast.items), ['Episode 9', 'Episode 8', 'Episode 6', 'Episode 4'])
+        podcast = Podcast.Podcast(self.feed, stop_at_guids=set(), scan_past_known=3)
+        self.assertEqual(len(podcast.items), 10)
+
+    def test_item_sequence(self):
+        podcast = Podcast.Podcast(self.feed, False, stop_at_guids={'guid-6'})
+        self.assertEqual(podcast.items[0].title, 'Episode 9')
+        self.assertEqual(podcast.items.built_count, 1)
+        self.assertEqual(len(podcast.items), 3)
+        self.assertEqual(podcast.items.built_count, 4)
+        self.assertEqual(self.titles(podcast.get_items()), ['Episode 9', 'Episode 8', 'Episode 7'])
+        self.assertEqual(podcast.items[-1].title, 'Episode 7')
+        with self.assertRaises(IndexError):
+            podcast.items[3]
+        self.assertEqual(podcast.items.built_count, 4)
+
+    def test_item_stream(self):
+        stream = Podcast.Podcast.iter_items(io.BytesIO(self.feed.encode('utf-8')),
+                                            stop_at_guids={'guid-6'}, text_extractor="fast")
+        self.assertEqual(self.titles(stream), ['Episode 9', 'Episode 8', 'Episode 7'])
+        self.assertEqual(stream.item_count, 4)
+        self.assertEqual(stream.podcast.title, 'title')
+
+class Test_Feed_Cache(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = FeedCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_hit_and_miss(self):
+        first = self.cache.parse(self.basic_podcast)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+        second = self.cache.parse(self.basic_podcast)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertTrue(isinstance(second, CompactPodcast))
+        self.assertEqual(second, first)
+        self.assertEqual(second.to_dict(), self.podcast.to_dict())
+        self.assertEqual(second.items[0].date_time, self.podcast.items[0].date_time)
+        self.assertEqual(self.cache.get(self.basic_podcast.replace('basic', 'other')), None)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_options_in_key(self):
+        other_cache = FeedCache(self.directory.name, text_extractor="fast")
+        self.assertNotEqual(other_cache.key(self.basic_podcast), self.cache.key(self.basic_podcast))
+        self.assertEqual(self.cache.key(self.basic_podcast), self.cache.key(self.basic_podcast.encode('utf-8')))
+
+    def test_options_keyed_by_value(self):
+        directory = self.directory.name
+        self.assertEqual(FeedCache(directory, engine=engines.get_engine("lxml")).key(self.basic_podcast),
+                         FeedCache(directory, engine="lxml").key(self.basic_podcast))
+        self.assertEqual(FeedCache(directory, text_extractor=text.html_to_text).key(self.basic_podcast),
+                         FeedCache(directory, text_extractor="fast").key(self.basic_podcast))
+        self.assertEqual(FeedCache(directory, stop_at_guids=os.path.isfile).key(self.basic_podcast),
+                         FeedCache(directory, stop_at_guids=os.path.isfile).key(self.basic_podcast))
+        self.assertEqual(FeedCache(directory, stop_at_guids={'b', 'a'}).key(self.basic_podcast),
+                         FeedCache(directory, stop_at_guids=['a', 'b']).key(self.basic_podcast))
+        self.assertEqual(FeedCache(directory, stats=ParseStats()).key(self.basic_podcast),
+                         self.cache.key(self.basic_podcast))
+        self.assertRaises(ValueError, FeedCache, directory, stop_at_guids=lambda item: False)
+        self.assertRaises(ValueError, FeedCache, directory, text_extractor=lambda html: html)
+        self.assertRaises(ValueError, FeedCache, directory, tree=object())
+
+    def test_schema_in_key(self):
+        fields = CompactItem.FIELDS
+        CompactItem.FIELDS = fields + ('new_field',)
+        try:
+            other_cache = FeedCache(self.directory.name)
+        finally:
+            CompactItem.FIELDS = fields
+        self.assertNotEqual(other_cache.key(self.basic_podcast), self.cache.key(self.basic_podcast))
+
+    def test_size_on_overwrite(self):
+        compact_podcast = self.cache.parse(self.basic_podcast)
+        self.cache.put(self.basic_podcast, compact_podcast)
+        self.cache.put(self.basic_podcast, compact_podcast)
+        self.assertEqual(self.cache._size,
+                         os.path.getsize(self.cache.path(self.cache.key(self.basic_podcast))))
+
+    def test_eviction(self):
+        feeds = [self.basic_podcast.replace('basic title', 'title %d' % number)
+                 for number in range(4)]
+        self.cache.parse(feeds[0])
+        entry_size = os.path.getsize(self.cache.path(self.cache.key(feeds[0])))
+        self.cache.max_size = entry_size * 2 + entry_size // 2
+        for number, feed in enumerate(feeds[1:], 1):
+            os.utime(self.cache.path(self.cache.key(feeds[number - 1])), (number, number))
+            self.cache.parse(feed)
+        self.assertEqual(self.cache.evictions, 2)
+        self.assertEqual(self.cache.get(feeds[1]), None)
+        self.assertEqual(self.cache.get(feeds[3]).title, 'title 3')
+
+    def test_corrupt_entry(self):
+        self.cache.parse(self.basic_podcast)
+        with open(self.cache.path(self.cache.key(self.basic_podcast)), 'wb') as entry:
+            entry.write(b'not zlib')
+        self.assertEqual(self.cache.get(self.basic_podcast), None)
+        self.assertEqual(self.cache.parse(self.basic_podcast).title, self.podcast.title)
+        self.cache.clear()
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+class Test_Columns(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        self.basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(self.basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+
+    def test_columns_match_items(self):
+        podcast_columns = self.podcast.to_columns()
+        self.assertEqual(set(podcast_columns), set(columns.COLUMN_FIELDS))
+        self.assertEqual(podcast_columns['title'], [item.title for item in self.podcast.items])
+        self.assertEqual(podcast_columns['itunes_keywords'], [item.itunes_keywords for item in self.podcast.items])
+        for field in columns.NUMERIC_FIELDS:
+            values, mask = podcast_columns[field]
+            self.assertEqual(values.typecode, 'q')
+            self.assertEqual(len(values), 4)
+            for value, missing, item in zip(values, mask, self.podcast.items):
+                if getattr(item, field) is None:
+                    self.assertEqual((value, missing), (0, 1))
+                else:
+                    self.assertEqual((value, missing), (getattr(item, field), 0))
+        self.assertEqual(list(podcast_columns['time_published'].values[:3]), [1206107460, 1206107400, 1206107400])
+        self.assertEqual(memoryview(podcast_columns['enclosure_length'].values).itemsize, 8)
+
+    def test_fields_and_stream(self):
+        stream = Podcast.Podcast.iter_items(self.basic_podcast_path)
+        stream_columns = columns.items_to_columns(stream, ['guid', 'itunes_season'])
+        self.assertEqual(sorted(stream_columns), ['guid', 'itunes_season'])
+        self.assertEqual(stream_columns['guid'], self.podcast.to_columns(['guid'])['guid'])
+        compact_podcast = CompactPodcast.from_podcast(self.podcast)
+        self.assertEqual(compact_podcast.to_columns(), self.podcast.to_columns())
+
+    def test_out_of_range(self):
+        compact_item = self.podcast.items[0].compact()
+        compact_item.enclosure_length = 2 ** 70
+        values, mask = columns.items_to_columns([compact_item], ['enclosure_length'])['enclosure_length']
+        self.assertEqual((list(values), list(mask)), ([0], [1]))
+
+class Test_Writers(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+
+    def test_write_json(self):
+        for podcast in (self.podcast, CompactPodcast.from_podcast(self.podcast), self.podcast.to_dict()):
+            fp = io.StringIO()
+            if isinstance(podcast, dict):
+                writers.write_json(podcast, fp)
+            else:
+                podcast.write_json(fp)
+            self.assertEqual(fp.getvalue(), json.dumps(self.podcast.to_dict()))
+
+    def test_write_ndjson(self):
+        fp = io.StringIO()
+        self.podcast.write_ndjson(fp, feed="basic")
+        records = [json.loads(line) for line in fp.getvalue().splitlines()]
+        self.assertEqual(len(records), 5)
+        podcast_dict = self.podcast.to_dict()
+        item_dicts = podcast_dict.pop('items')
+        self.assertEqual(records[0], {'type': 'channel', 'feed': 'basic', 'data': podcast_dict})
+        for record, item_dict in zip(records[1:], item_dicts):
+            self.assertEqual(record, {'type': 'item', 'feed': 'basic', 'data': item_dict})
+
+    def test_sink(self):
+        fp = io.StringIO()
+        sink = writers.NDJSONSink(fp)
+        sink.write_results(batch.parse_many([self.basic_podcast, 42, self.basic_podcast], workers=1))
+        records = [json.loads(line) for line in fp.getvalue().splitlines()]
+        self.assertEqual((sink.feed_count, sink.record_count, len(records)), (3, 11, 11))
+        self.assertEqual([record['feed'] for record in records if record['type'] == 'channel'], [0, 2])
+        self.assertEqual(records[5]['type'], 'error')
+        self.assertEqual(records[5]['feed'], 1)
+        self.assertEqual(records[6]['data']['title'], self.podcast.title)
+
+class Test_Parse_Stats(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+
+    def test_disabled(self):
+        podcast = Podcast.Podcast(self.basic_podcast)
+        self.assertEqual(podcast.stats, None)
+        self.assertEqual(podcast.items[0].stats, None)
+
+    def test_stats_object(self):
+        stats = ParseStats()
+        podcast = Podcast.Podcast(self.basic_podcast, stats=stats)
+        Podcast.Podcast(self.basic_podcast, stats=stats)
+        self.assertIs(podcast.stats, stats)
+        self.assertEqual(stats.feed_count, 2)
+        self.assertEqual(stats.item_count, 8)
+        self.assertEqual(stats.bytes_in, 2 * len(self.basic_podcast))
+        for phase in ('set_tree', 'set_items', 'set_itunes', 'set_dates_published'):
+            self.assertEqual(stats.calls[phase], 2)
+            self.assertTrue(stats.seconds[phase] >= 0)
+        self.assertEqual(stats.calls['Item.set_text_elements'], 8)
+        self.assertFalse('set_soup' in stats.calls)
+        podcast.soup
+        self.assertEqual(stats.calls['set_soup'], 1)
+
+    def test_callback_and_lazy_items(self):
+        reports = []
+        podcast = Podcast.Podcast(self.basic_podcast, lazy_items=True, stats=reports.append)
+        self.assertEqual(len(reports), 1)
+        stats = reports[0]
+        self.assertIs(podcast.stats, stats)
+        self.assertEqual(stats.calls['Item.set_tags'], 4)
+        calls = stats.calls['Item.set_enclosure']
+        podcast.items[0].enclosure_url
+        self.assertEqual(stats.calls['Item.set_enclosure'], calls)
+        podcast.items[1].title
+        self.assertEqual(stats.calls['Item.set_title'], 1)
+
+    def test_merge(self):
+        first, second = ParseStats(), ParseStats()
+        Podcast.Podcast(self.basic_podcast, stats=first)
+        Podcast.Podcast(self.basic_podcast, False, stats=second)
+        first.merge(second)
+        self.assertEqual(first.to_dict()['feed_count'], 2)
+        self.assertEqual(first.to_dict()['phases']['set_tree']['calls'], 2)
+        self.assertEqual(first.calls['set_item_sequence'], 1)
+
+class Test_Field_Projection(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.full = Podcast.Podcast(self.basic_podcast)
+
+    def test_only_fields_are_set(self):
+        podcast = Podcast.Podcast(self.basic_podcast, fields=['title', 'time_published'],
+                                  item_fields=['guid', 'title_text'])
+        self.assertEqual(podcast.title, self.full.title)
+        self.assertEqual(podcast.published_date, self.full.published_date)
+        self.assertEqual(podcast.time_published, self.full.time_published)
+        self.assertEqual(podcast.description, None)
+        self.assertEqual(podcast.itunes_categories, None)
+        self.assertEqual(podcast.is_valid_podcast, None)
+        for item, full_item in zip(podcast.items, self.full.items):
+            self.assertEqual(item.guid, full_item.guid)
+            self.assertEqual(item.title_text, full_item.title_text)
+            self.assertEqual(item.title, full_item.title)
+            self.assertEqual(item.description, None)
+            self.assertEqual(item.description_text, None)
+            self.assertEqual(item.enclosure_type, None)
+
+    def test_skipped_text_is_not_extracted(self):
+        calls = []
+        def extractor(markup):
+            calls.append(markup)
+            return markup
+        Podcast.Podcast(self.basic_podcast, text_extractor=extractor,
+                        item_fields=['guid', 'description'])
+        self.assertEqual(calls, [])
+        Podcast.Podcast(self.basic_podcast, text_extractor=extractor,
+                        item_fields=['description_text'])
+        self.assertEqual(len(calls), len(self.full.items))
+
+    def test_to_dict(self):
+        podcast = Podcast.Podcast(self.basic_podcast, fields=['title', 'link'],
+                                  item_fields=['guid'])
+        podcast_dict = podcast.to_dict()
+        self.assertEqual(sorted(podcast_dict), ['items', 'link', 'title'])
+        self.assertEqual(podcast_dict['items'],
+                         [{'guid': item.guid} for item in self.full.items])
+        stream = io.StringIO()
+        podcast.write_json(stream)
+        self.assertEqual(json.loads(stream.getvalue()), podcast_dict)
+        self.assertEqual(podcast.to_dict(), CompactPodcast.from_podcast(podcast).to_dict())
+
+    def test_validity_dependencies(self):
+        podcast = Podcast.Podcast(self.basic_podcast, fields=['is_valid_rss', 'is_valid_podcast'],
+                                  item_fields=['guid'])
+        self.assertEqual(podcast.is_valid_rss, self.full.is_valid_rss)
+        self.assertEqual(podcast.is_valid_podcast, self.full.is_valid_podcast)
+        self.assertEqual(sorted(podcast.items[0].to_dict()), ['guid'])
+        self.assertEqual(podcast.items[0].fields, frozenset(['guid']))
+        podcast = Podcast.Podcast(self.basic_podcast, item_fields=['guid'], compact_items=True)
+        self.assertEqual(podcast.is_valid_podcast, self.full.is_valid_podcast)
+        self.assertEqual(podcast.items[0].to_dict(), {'guid': self.full.items[0].guid})
+        for item in Podcast.Podcast(self.basic_podcast, item_fields=['guid'], lazy_items=True).items:
+            self.assertEqual(item.to_dict(), {'guid': item.guid})
+
+    def test_lazy_and_compact_items(self):
+        podcast = Podcast.Podcast(self.basic_podcast, lazy_items=True, item_fields=['title_text'])
+        item = podcast.items[0]
+        self.assertFalse('title_text' in item.__dict__)
+        self.assertEqual(item.title_text, self.full.items[0].title_text)
+        self.assertEqual(item.description_text, None)
+        podcast = Podcast.Podcast(self.basic_podcast, compact_items=True, fields=['title'],
+                                  item_fields=['guid'])
+        compact = pickle.loads(pickle.dumps(podcast.items[0]))
+        self.assertEqual(compact.to_dict(), {'guid': self.full.items[0].guid})
+
+    def test_unknown_field(self):
+        self.assertRaises(ValueError, Podcast.Podcast, self.basic_podcast, fields=['nope'])
+        self.assertRaises(ValueError, Podcast.Podcast, self.basic_podcast, item_fields=['nope'])
+
+
+class Test_Bytes_Input(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        self.basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(self.basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.full = Podcast.Podcast(self.basic_podcast)
+
+    def test_from_bytes(self):
+        for engine in ('bs4', 'lxml'):
+            podcast = Podcast.Podcast.from_bytes(self.basic_podcast.encode('utf-8'), engine=engine)
+            self.assertEqual(podcast.feed_content, None)
+            self.assertEqual(podcast.to_dict(), self.full.to_dict())
+            self.assertEqual(len(podcast.soup.findAll('item')), 0)
+
+    def test_encoding_declaration(self):
+        feed = self.basic_podcast.replace('basic title', u'caf\xe9 title')
+        feed = feed.replace('<?xml version="1.0" encoding="UTF-8"?>', '')
+        feed = '<?xml version="1.0" encoding="ISO-8859-1"?>' + feed
+        for engine in ('bs4', 'lxml'):
+            podcast = Podcast.Podcast.from_bytes(feed.encode('iso-8859-1'), engine=engine)
+            self.assertEqual(podcast.title, u'caf\xe9 title')
+
+    def test_memoryview(self):
+        data = memoryview(self.basic_podcast.encode('utf-8'))
+        for engine in ('bs4', 'lxml'):
+            podcast = Podcast.Podcast.from_bytes(data, engine=engine, keep_content=True)
+            self.assertIs(podcast.feed_content, data)
+            self.assertEqual(podcast.to_dict(), self.full.to_dict())
+
+    def test_from_path(self):
+        for engine in ('bs4', 'lxml'):
+            podcast = Podcast.Podcast.from_path(self.basic_podcast_path, engine=engine)
+            self.assertEqual(podcast.feed_content, None)
+            self.assertEqual(podcast.to_dict(), self.full.to_dict())
+            channel = Podcast.Podcast.from_path(self.basic_podcast_path, engine=engine,
+                                                channel_only=True)
+            self.assertEqual(channel.title, self.full.title)
+        podcast = Podcast.Podcast.from_path(self.basic_podcast_path, keep_content=True)
+        with open(self.basic_podcast_path, 'rb') as feed_file:
+            self.assertEqual(podcast.feed_content, feed_file.read())
+
+    def test_empty_file(self):
+        with tempfile.NamedTemporaryFile(suffix='.rss', delete=False) as feed_file:
+            path = feed_file.name
+        try:
+            podcast = Podcast.Podcast.from_path(path)
+            self.assertEqual(podcast.title, None)
+            self.assertEqual(podcast.items, [])
+        finally:
+            os.remove(path)
+
+
+class Test_Snapshots(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+
+    def test_freeze(self):
+        frozen = self.podcast.freeze()
+        self.assertTrue(isinstance(frozen, CompactPodcast))
+        self.assertEqual(frozen.to_dict(), self.podcast.to_dict())
+        self.assertEqual(frozen.published_datetime, self.podcast.published_datetime)
+        self.assertIs(frozen.freeze(), frozen)
+        item = self.podcast.items[0].freeze()
+        self.assertEqual(item, frozen.items[0])
+        self.assertIs(item.freeze(), item)
+
+    def test_pickle_podcast(self):
+        data = pickle.dumps(self.podcast, pickle.HIGHEST_PROTOCOL)
+        self.assertFalse(b'bs4' in data)
+        loaded = pickle.loads(data)
+        self.assertTrue(isinstance(loaded, CompactPodcast))
+        self.assertEqual(loaded, self.podcast.freeze())
+        self.assertEqual(loaded.to_dict(), self.podcast.to_dict())
+        self.assertEqual(pickle.loads(pickle.dumps(loaded)), loaded)
+
+    def test_pickle_item(self):
+        for podcast in (self.podcast, Podcast.Podcast(self.basic_podcast, lazy_items=True,
+                                                      engine="lxml")):
+            loaded = pickle.loads(pickle.dumps(podcast.items[1]))
+            self.assertEqual(loaded, self.podcast.items[1].freeze())
+            self.assertEqual(loaded.to_dict(), self.podcast.items[1].to_dict())
+
+    def test_pickle_options(self):
+        podcast = Podcast.Podcast(self.basic_podcast, pre_set_items=False, fields=['title'],
+                                  item_fields=['guid'])
+        loaded = pickle.loads(pickle.dumps(podcast))
+        self.assertEqual(len(loaded.items), len(self.podcast.items))
+        self.assertEqual(loaded.to_dict(), podcast.to_dict())
+        channel = pickle.loads(pickle.dumps(Podcast.Podcast.parse_channel(self.basic_podcast)))
+        self.assertEqual((channel.title, channel.items), (self.podcast.title, []))
+
+    def test_copy(self):
+        for engine in ('bs4', 'lxml'):
+            podcast = Podcast.Podcast(self.basic_podcast, engine=engine)
+            copied = copy.copy(podcast)
+            self.assertIs(type(copied), Podcast.Podcast)
+            self.assertIs(copied.items, podcast.items)
+            self.assertIs(type(copy.copy(podcast.items[0])), type(podcast.items[0]))
+            deep = copy.deepcopy(podcast)
+            self.assertIs(type(deep), Podcast.Podcast)
+            self.assertIs(type(deep.items[0]), type(podcast.items[0]))
+            self.assertFalse(deep.items[0] is podcast.items[0])
+            self.assertFalse(deep.tree is podcast.tree)
+            self.assertEqual(deep.to_dict(), podcast.to_dict())
+            item = copy.deepcopy(podcast.items[1])
+            self.assertIs(type(item), type(podcast.items[1]))
+            self.assertEqual(item.to_dict(), podcast.items[1].to_dict())
+
+
+class Test_Diff(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        # The items of basic_podcast share a guid, give them their own
+        parts = self.basic_podcast.split('another basic item guid')
+        self.basic_podcast = (parts[0] + 'another basic item guid' + parts[1] + 'third item guid' +
+                              parts[2] + 'fourth item guid' + parts[3])
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+
+    def test_unchanged(self):
+        diff = Podcast.Podcast(self.basic_podcast).diff(self.podcast)
+        self.assertFalse(diff)
+        self.assertEqual(diff.to_dict(), {'channel': {}, 'added': [], 'removed': [], 'modified': []})
+
+    def test_changes(self):
+        feed = self.basic_podcast.replace('basic title', 'new title')
+        feed = feed.replace('<title>basic item title</title>', '<title>new item title</title>')
+        current = Podcast.Podcast(feed).freeze()
+        current.items[2].guid = 'added item guid'
+        current.items[2].enclosure_url = 'http://example.com/added.mp3'
+        diff = current.diff(self.podcast)
+        self.assertTrue(diff)
+        self.assertEqual(diff.channel, {'title': ('basic title', 'new title')})
+        self.assertEqual([item.guid for item in diff.added], ['added item guid'])
+        self.assertEqual([item.guid for item in diff.removed], ['third item guid'])
+        self.assertEqual(len(diff.modified), 1)
+        change = diff.modified[0]
+        self.assertEqual(change.key, 'basic item guid')
+        self.assertEqual(change.changes, {'title': ('basic item title', 'new item title')})
+        self.assertEqual(change.previous.title, 'basic item title')
+        self.assertEqual(change.current.title, 'new item title')
+        json.dumps(diff.to_dict())
+
+    def test_enclosure_url_fallback(self):
+        feed = self.basic_podcast.replace(
+            '<guid isPermaLink="true">another basic item guid</guid>', '')
+        diff = Podcast.Podcast(feed).diff(self.podcast)
+        self.assertEqual((diff.added, diff.removed), ([], []))
+        self.assertEqual(len(diff.modified), 1)
+        self.assertEqual(diff.modified[0].key, 'https://github.com/jrigden/pyPodcastParser.mp3')
+        self.assertEqual(diff.modified[0].changes, {'guid': ('another basic item guid', None)})
+
+    def test_snapshots(self):
+        feed = self.basic_podcast.replace('basic title', 'new title')
+        current = Podcast.Podcast(feed, engine="lxml", lazy_items=True)
+        previous = pickle.loads(pickle.dumps(self.podcast))
+        for diff in (current.diff(previous), current.freeze().diff(self.podcast),
+                     current.freeze().diff(previous)):
+            self.assertEqual(diff.channel, {'title': ('basic title', 'new title')})
+            self.assertEqual((diff.added, diff.removed, diff.modified), ([], [], []))
+
+    def test_projection(self):
+        feed = self.basic_podcast.replace('basic title', 'new title')
+        feed = feed.replace('<title>basic item title</title>', '<title>new item title</title>')
+        current = Podcast.Podcast(feed, fields=['link'],
+                                  item_fields=['guid', 'enclosure_url', 'link'])
+        self.assertFalse(current.diff(self.podcast))
+
+    def test_projection_without_keys(self):
+        titles = Podcast.Podcast(self.basic_podcast, item_fields=['title'], compact_items=True)
+        self.assertRaises(ValueError, titles.diff, self.podcast)
+        self.assertRaises(ValueError, self.podcast.diff, titles)
+        self.assertRaises(ValueError, titles.freeze().diff, titles)
+        guids = Podcast.Podcast(self.basic_podcast, item_fields=['guid', 'title'])
+        self.assertRaises(ValueError, guids.diff, self.podcast)
+
+    def test_duplicate_keys(self):
+        first = Podcast.Podcast(self.basic_podcast, compact_items=True).freeze()
+        second = Podcast.Podcast(self.basic_podcast, compact_items=True).freeze()
+        first.items.append(first.items[0])
+        diff = first.diff(second)
+        self.assertEqual(diff.added, [first.items[0]])
+        self.assertEqual(second.diff(first).removed, [first.items[0]])
+
+
+class Test_Item_Lookup(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+
+    def test_get_item(self):
+        self.assertEqual(self.podcast._item_indexes, None)
+        self.assertIs(self.podcast.get_item('basic item guid'), self.podcast.items[0])
+        self.assertIs(self.podcast.get_item('another basic item guid'), self.podcast.items[1])
+        self.assertEqual(self.podcast.get_item('missing guid'), None)
+        self.assertEqual(self.podcast.get_item(None), None)
+
+    def test_get_by_enclosure(self):
+        self.assertIs(self.podcast.get_by_enclosure('https://github.com/jrigden/pyPodcastParser.mp3'),
+                      self.podcast.items[0])
+        self.assertEqual(self.podcast.get_by_enclosure('http://example.com/missing.mp3'), None)
+
+    def test_get_episode(self):
+        feed = self.basic_podcast.replace(
+            '<title>another basic item title</title>',
+            '<title>another basic item title</title><itunes:season>3</itunes:season>'
+            '<itunes:episode>12</itunes:episode>')
+        podcast = Podcast.Podcast(feed, pre_set_items=False)
+        self.assertIs(podcast.get_episode(3, 12), podcast.items[1])
+        self.assertEqual(podcast.get_episode(None, 12), None)
+        self.assertEqual(podcast.get_episode(3, 13), None)
+
+    def test_invalidation(self):
+        self.assertEqual(self.podcast.get_item('added guid'), None)
+        self.podcast.items.append(self.podcast.items[0].freeze())
+        self.podcast.items[-1].guid = 'added guid'
+        self.assertIs(self.podcast.get_item('added guid'), self.podcast.items[-1])
+        first = self.podcast.items[0]
+        self.podcast.set_items()
+        self.assertIs(self.podcast.get_item('basic item guid'), self.podcast.items[0])
+        self.assertFalse(self.podcast.get_item('basic item guid') is first)
+        self.assertEqual(self.podcast.get_item('added guid'), None)
+
+    def test_projection(self):
+        podcast = Podcast.Podcast(self.basic_podcast, item_fields=['title'])
+        self.assertRaises(ValueError, podcast.get_item, 'basic item guid')
+        self.assertRaises(ValueError, podcast.get_by_enclosure, 'http://example.com/mp3')
+        self.assertRaises(ValueError, podcast.freeze().get_episode, None, 42)
+        podcast = Podcast.Podcast(self.basic_podcast, item_fields=['guid'])
+        self.assertIs(podcast.get_item('basic item guid'), podcast.items[0])
+
+    def test_replaced_in_place(self):
+        self.assertIs(self.podcast.get_item('basic item guid'), self.podcast.items[0])
+        replacement = self.podcast.items[0].freeze()
+        self.podcast.items[0] = replacement
+        # Not noticed at the same length, a new list is
+        self.assertFalse(self.podcast.get_item('basic item guid') is replacement)
+        self.podcast.items = list(self.podcast.items)
+        self.assertIs(self.podcast.get_item('basic item guid'), replacement)
+
+    def test_snapshots(self):
+        for snapshot in (self.podcast.freeze(), pickle.loads(pickle.dumps(self.podcast))):
+            self.assertIs(snapshot.get_item('basic item guid'), snapshot.items[0])
+            self.assertEqual(snapshot.get_item('missing guid'), None)
+            self.assertEqual(pickle.loads(pickle.dumps(snapshot)), snapshot)
+
+
+class Test_Time_Queries(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+        # Items of the same time are taken to be listed newest first
+        dated = [(item.time_published, -position, item)
+                 for position, item in enumerate(self.podcast.items)
+                 if item.time_published is not None]
+        self.by_time = [item for time_published, position, item in sorted(dated)]
+
+    def test_items_between(self):
+        self.assertEqual(self.podcast.items_between(), self.by_time)
+        first, last = self.by_time[0], self.by_time[-1]
+        self.assertEqual(self.podcast.items_between(first.time_published, last.time_published),
+                         self.by_time[:-1])
+        self.assertEqual(self.podcast.items_between(last.published_datetime), [last])
+        self.assertEqual(self.podcast.items_between(end=first.time_published), [])
+        naive = last.published_datetime.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        self.assertEqual(self.podcast.items_between(end=naive), self.by_time[:-1])
+
+    def test_newest(self):
+        newest = self.by_time[::-1]
+        self.assertEqual(self.podcast.newest(2), newest[:2])
+        self.assertEqual(self.podcast.newest(100), newest)
+        self.assertEqual(self.podcast.newest(0), [])
+        self.podcast.items_between()
+        self.assertEqual(self.podcast.newest(2), newest[:2])
+        self.assertEqual(self.podcast.newest(100), newest)
+        self.assertEqual(self.podcast.newest(0), [])
+
+    def test_ties(self):
+        podcast = Podcast.Podcast(self.basic_podcast, compact_items=True)
+        for item in podcast.items:
+            item.time_published = 0
+        self.assertEqual(podcast.newest(2), podcast.items[:2])
+        podcast.items_between()
+        self.assertEqual(podcast.newest(2), podcast.items[:2])
+
+    def test_invalidation_and_snapshots(self):
+        snapshot = self.podcast.freeze()
+        self.assertEqual([item.guid for item in snapshot.items_between()],
+                         [item.guid for item in self.by_time])
+        late = snapshot.items[0].freeze()
+        late.time_published = self.by_time[-1].time_published + 1
+        snapshot.items.append(late)
+        self.assertIs(snapshot.newest(1)[0], late)
+        self.assertIs(snapshot.items_between()[-1], late)
+
+    def test_lazy_items(self):
+        podcast = Podcast.Podcast(self.basic_podcast, pre_set_items=False, lazy_items=True)
+        newest = podcast.newest(1)
+        self.assertEqual(newest[0].guid, self.by_time[-1].guid)
+        self.assertFalse(any('description_text' in item.__dict__ for item in podcast.items))
+
+
+class Test_Item_Index(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        self.basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(self.basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.podcast = Podcast.Podcast(self.basic_podcast)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'feed.rss')
+        with open(self.path, 'w') as feed_file:
+            feed_file.write(self.basic_podcast)
+
+    def tearDown(self):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def test_scan_items(self):
+        data = self.basic_podcast.encode('utf-8')
+        entries = list(scanner.scan_items(data))
+        self.assertEqual([entry[2:] for entry in entries],
+                         [(item.guid, item.published_date) for item in self.podcast.items])
+        for start, end, guid, published_date in entries:
+            self.assertTrue(data[start:end].startswith(b'<item>'))
+            self.assertTrue(data[start:end].endswith(b'</item>'))
+        self.assertEqual(list(scanner.scan_items(self.basic_podcast)), entries)
+
+    def test_scan_markup(self):
+        feed = (u'<rss><channel><!-- <item> --><item/><rss:item><guid><![CDATA[a&b]]> &amp;c</guid>'
+                u'<description><![CDATA[</item>]]></description></rss:item>'
+                u'<item><pubDate> today </pubDate></channel></rss>')
+        entries = list(scanner.scan_items(feed))
+        self.assertEqual([entry[2:] for entry in entries],
+                         [(None, None), (u'a&b &c', None), (None, u'today')])
+        self.assertEqual(feed[entries[1][0]:entries[1][1]][-11:], u'</rss:item>')
+        self.assertEqual(scanner.root_start_tag(u'<?xml version="1.0"?><!-- x --><rss a="1">'),
+                         (31, 42, u'rss'))
+        self.assertEqual(scanner.xml_encoding(b'<?xml version="1.0" encoding="ISO-8859-1"?>'),
+                         'iso-8859-1')
+        self.assertEqual(scanner.xml_encoding(b'<rss>'), 'utf-8')
+
+    def test_read_item(self):
+        for engine in ('bs4', 'lxml'):
+            for number, item in enumerate(self.podcast.items):
+                read = Podcast.Podcast.read_item(self.path, number, engine=engine)
+                self.assertEqual(read.to_dict(), item.to_dict())
+        self.assertEqual(Podcast.Podcast.read_item(self.path, -1).to_dict(),
+                         self.podcast.items[-1].to_dict())
+        self.assertEqual(Podcast.Podcast.read_item(self.path, guid='another basic item guid').title,
+                         self.podcast.items[1].title)
+        self.assertEqual(Podcast.Podcast.read_item(self.path, guid='missing guid'), None)
+
+    def test_encoding(self):
+        feed = self.basic_podcast.replace('basic item title', u'caf\xe9 item title')
+        feed = feed.replace('<?xml version="1.0" encoding="UTF-8"?>', '')
+        with open(self.path, 'wb') as feed_file:
+            feed_file.write(b'<?xml version="1.0" encoding="ISO-8859-1"?>' + feed.encode('iso-8859-1'))
+        item = Podcast.Podcast.read_item(self.path, 0, engine="lxml")
+        self.assertEqual(item.title, u'caf\xe9 item title')
+
+    def test_channel_namespaces(self):
+        namespace = 'xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"'
+        feed = self.basic_podcast.replace(' ' + namespace, '', 1)
+        feed = feed.replace('<channel>', '<channel %s>' % namespace, 1)
+        with open(self.path, 'w') as feed_file:
+            feed_file.write(feed)
+        self.assertEqual(scanner.item_ancestors(feed.encode('utf-8'), feed.index('<item>'))[0],
+                         ('<rss version="2.0"><channel %s>' % namespace).encode('utf-8'))
+        for engine in ('bs4', 'lxml'):
+            item = Podcast.Podcast.read_item(self.path, 0, engine=engine)
+            self.assertEqual(item.itunes_episode, 42)
+            self.assertEqual(item.itunes_duration, '1:05')
+            self.assertEqual(item.to_dict(), Podcast.Podcast(feed, engine=engine).items[0].to_dict())
+
+    def test_persistence(self):
+        self.assertEqual(ItemIndex.load(self.path), None)
+        index = ItemIndex.for_path(self.path)
+        self.assertEqual(len(index), len(self.podcast.items))
+        self.assertTrue(os.path.exists(self.path + ItemIndex.SUFFIX))
+        loaded = ItemIndex.load(self.path)
+        self.assertEqual(loaded.entries, index.entries)
+        self.assertEqual(loaded.start_tags, index.start_tags)
+        self.assertEqual(loaded.end_tags, index.end_tags)
+        self.assertEqual(loaded.find('another basic item guid'), 1)
+        with open(self.path, 'a') as feed_file:
+            feed_file.write('\n')
+        self.assertEqual(ItemIndex.load(self.path), None)
+        self.assertEqual(len(ItemIndex.for_path(self.path)), len(self.podcast.items))
+
+
+class Test_Parallel_Items(unittest.TestCase):
+    def setUp(self):
+        test_dir = os.path.dirname(__file__)
+        test_feeds_dir = os.path.join(test_dir, 'test_feeds')
+        basic_podcast_path = os.path.join(test_feeds_dir, 'basic_podcast.rss')
+        basic_podcast_file = open(basic_podcast_path, "r")
+        self.basic_podcast = basic_podcast_file.read()
+        self.data = self.basic_podcast.encode('utf-8')
+
+    def test_item_bounds(self):
+        bounds = list(scanner.item_bounds(self.data))
+        self.assertEqual(bounds, [entry[:2] for entry in scanner.scan_items(self.data)])
+        self.assertEqual(parallel.item_chunks(bounds, 1), bounds)
+        self.assertEqual(parallel.item_chunks(bounds, len(self.data)),
+                         [(bounds[0][0], bounds[-1][1])])
+        self.assertEqual(parallel.item_chunks(bounds, bounds[1][1] - bounds[0][0]),
+                         [(bounds[0][0], bounds[1][1]), (bounds[2][0], bounds[3][1])])
+
+    def test_in_process(self):
+        for engine in ('bs4', 'lxml'):
+            podcast = Podcast.Podcast.from_bytes(self.data, workers=1, engine=engine)
+            self.assertEqual(podcast.freeze(),
+                             Podcast.Podcast(self.data, engine=engine).freeze())
+            podcast = parallel.parse_podcast(self.data, 1, chunk_size=1, engine=engine)
+            self.assertEqual(podcast.freeze(),
+                             Podcast.Podcast(self.data, engine=engine).freeze())
+
+    def test_pool(self):
+        podcast = parallel.parse_podcast(self.data, 2, chunk_size=1, engine="lxml")
+        self.assertEqual([item.guid for item in podcast.items],
+                         [item.guid for item in Podcast.Podcast(self.data).items])
+        self.assertEqual(podcast.freeze(), Podcast.Podcast(self.data, engine="lxml").freeze())
+
+    def test_namespaces(self):
+        podcast = parallel.parse_podcast(self.data, 1, chunk_size=1, engine="lxml")
+        self.assertEqual(podcast.items[0].itunes_explicit, "no")
+        self.assertTrue(podcast.is_valid_podcast)
+
+    def test_channel_namespaces(self):
+        namespace = b'xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd"'
+        data = self.data.replace(b' ' + namespace, b'', 1)
+        data = data.replace(b'<channel>', b'<channel ' + namespace + b'>', 1)
+        for engine in ('bs4', 'lxml'):
+            serial = Podcast.Podcast(data, engine=engine)
+            self.assertEqual(serial.items[0].itunes_episode, 42)
+            for workers in (1, 2):
+                podcast = parallel.parse_podcast(data, workers, chunk_size=1, engine=engine)
+                self.assertEqual(podcast.items[0].itunes_episode, 42)
+                self.assertEqual(podcast.items[0].itunes_duration, '1:05')
+                self.assertEqual(podcast.freeze(), serial.freeze())
+
+    def test_options(self):
+        podcast = parallel.parse_podcast(self.data, 1, fields=['title'], item_fields=['guid'])
+        self.assertEqual(podcast.items[0].guid, 'basic item guid')
+        self.assertEqual(podcast.items[0].title, None)
+        known = [Podcast.Podcast(self.data).items[1].guid]
+        podcast = parallel.parse_podcast(self.data, 1, stop_at_guids=known)
+        self.assertEqual(podcast.freeze(), Podcast.Podcast(self.data, stop_at_guids=known).freeze())
+        self.assertEqual(len(podcast.items), 1)
+        stats = ParseStats()
+        parallel.parse_podcast(self.data, 1, chunk_size=1, stats=stats)
+        self.assertEqual(stats.item_count, 4)
+        self.assertEqual(stats.bytes_in, len(self.data))
+        self.assertEqual(stats.calls['Item.set_tags'], 4)
+        podcast = parallel.parse_podcast(self.data, 1, channel_only=True)
+        self.assertEqual(podcast.items, [])
+        self.assertEqual(podcast.title, Podcast.Podcast(self.data).title)
+        self.assertRaises(ValueError, parallel.parse_podcast, self.data, 1, pre_set_items=False)
+
+
+class Test_Benchmarks(unittest.TestCase):
+
+    def test_generate_feed(self):
+        feed = benchmark_feeds.generate_feed(3, description_size=100, seed=1)
+        self.assertEqual(feed, benchmark_feeds.generate_feed(3, description_size=100, seed=1))
+        podcast = Podcast.Podcast(feed)
+        self.assertTrue(podcast.is_valid_podcast)
+        self.assertEqual(len(podcast.items), 3)
+        self.assertEqual(podcast.items[0].guid, "episode-1-3")
+        self.assertEqual(podcast.items[0].itunes_episode, 3)
+        self.assertTrue(podcast.items[0].description_text)
+
+    def test_generate_feed_without_namespaces(self):
+        feed = benchmark_feeds.generate_feed(2, description_size=50, namespaces=())
+        self.assertNotIn("xmlns:", feed)
+        podcast = Podcast.Podcast(feed)
+        self.assertEqual(len(podcast.items), 2)
+        self.assertEqual(podcast.items[0].itunes_episode, None)
+
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            benchmark_run.main(["--items", "2", "--engines", "lxml", "--description-size", "50",
+                                "--repeat", "1", "--output", output])
+            with open(output) as results:
+                report = json.load(results)
+        self.assertEqual(report['settings']['repeat'], 1)
+        result, = report['results']
+        self.assertEqual((result['engine'], result['items']), ("lxml", 2))
+        expected = ['Podcast', 'get_items', 'to_dict'] + [phase for phase, methods in benchmark_run.PHASES]
+        self.assertEqual(sorted(result['timings']), sorted(expected))
+        for seconds in result['timings'].values():
+            self.assertGreaterEqual(seconds, 0)
+
+
 if __name__ == '__main__':
     unittest.main()